@@ -0,0 +1,104 @@
+# ═══════════════════════════════════════════════════════════════════
+# REGISTRO DE ACCESOS POR CLIENTE
+# ═══════════════════════════════════════════════════════════════════
+#
+# Cuenta cuántas veces se abre el dashboard de cada cliente (?cliente=)
+# en contadores por día de los últimos DIAS_ACCESOS días. Sirve para
+# precalentar los cachés de los clientes más solicitados al arrancar o
+# al publicarse un snapshot nuevo (secciones.calentar).
+#
+# Los contadores viven en memoria y se guardan en
+# snapshots/accesos/clientes.json (fuera del glob de versiones) como
+# mucho cada INTERVALO_GUARDADO segundos, así que sobreviven a un
+# reinicio o deploy.
+#
+#     python accesos.py          -> clientes más solicitados
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from snapshots import DIRECTORIO, escribir_atomico
+
+ARCHIVO = DIRECTORIO / "accesos" / "clientes.json"
+DIAS_ACCESOS = 7
+INTERVALO_GUARDADO = 60
+
+_candado = threading.Lock()
+_conteos = None          # {"AAAA-MM-DD": {cliente: visitas}}
+_guardado_en = 0.0
+
+
+def _cargar():
+    try:
+        with open(ARCHIVO, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _recortar(conteos, hoy):
+    """Quita los días fuera de la ventana."""
+    limite = (hoy - timedelta(days=DIAS_ACCESOS - 1)).isoformat()
+    for dia in [d for d in conteos if d < limite]:
+        del conteos[dia]
+
+
+def guardar():
+    """Escribe los contadores a disco (reemplazo atómico)."""
+    global _guardado_en
+    with _candado:
+        if _conteos is None:
+            return
+        contenido = json.dumps(_conteos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        _guardado_en = time.monotonic()
+    escribir_atomico(ARCHIVO, contenido)
+
+
+def registrar(cliente, hoy=None):
+    """Suma una visita a `cliente` en el contador de hoy."""
+    global _conteos
+    hoy = hoy or date.today()
+    with _candado:
+        if _conteos is None:
+            _conteos = _cargar()
+        _recortar(_conteos, hoy)
+        dia = _conteos.setdefault(hoy.isoformat(), {})
+        dia[cliente] = dia.get(cliente, 0) + 1
+        pendiente = time.monotonic() - _guardado_en >= INTERVALO_GUARDADO
+    if pendiente:
+        try:
+            guardar()
+        except OSError:
+            pass  # El registro de accesos nunca debe romper la página
+
+
+def mas_solicitados(n, hoy=None):
+    """Los `n` clientes con más visitas en la ventana, del más al menos solicitado."""
+    global _conteos
+    hoy = hoy or date.today()
+    with _candado:
+        if _conteos is None:
+            _conteos = _cargar()
+        _recortar(_conteos, hoy)
+        total = Counter()
+        for visitas in _conteos.values():
+            total.update(visitas)
+    return [cliente for cliente, _ in total.most_common(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clientes más solicitados")
+    parser.add_argument("-n", type=int, default=20)
+    args = parser.parse_args()
+    for posicion, cliente in enumerate(mas_solicitados(args.n), 1):
+        print(f"{posicion:>3}. {cliente}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,54 +6,116 @@
 # 1. Guarda tu archivo Excel como "AVANCE_DIARIO_REV.xlsx" en esta misma carpeta
 # 2. Abre la terminal en VS Code (Ctrl + `)
 # 3. Ejecuta: python actualizar_datos.py
-# 4. Listo, el archivo datos.py se actualiza automáticamente
+# 4. Listo, se publica un snapshot nuevo (snapshots/) y se actualiza datos.py
+#
+# Los dashboards que ya están corriendo detectan la nueva versión en su
+# siguiente rerun. Para regresar a la versión anterior:
+#     python snapshots.py rollback
+#
+# Las filas que no se pueden leer (texto en montos, sin cliente,
+# sucursales repetidas...) no se publican: quedan en el reporte
+# snapshots/cuarentena/<versión>.csv. Las de totales que no cuadran con
+# sus categorías sí se publican, con un aviso (snapshots/avisos/).
+#
+# También se guardan los cumplimientos ordenados por zona y asesor
+# (snapshots/ranking/), una partición por cliente (snapshots/particiones/)
+# para que el dashboard lea solo las sucursales del cliente que se abre
+# y la tendencia diaria de cada sucursal (snapshots/historia/).
+#
+# Después de publicar se generan las alertas contra la versión anterior
+# (snapshots/alertas/) y la lista de sucursales con números atípicos
+# (anomalias.py, snapshots/anomalias/); con MOTODRIVE_SMTP_HOST las dos
+# se envían en un solo correo.
+#
+# PRECÁLCULO: con --pipeline, al publicar también se generan los
+# artefactos derivados (métricas, comparación, Excel, libros, página)
+# con pipeline.py; solo se rehacen los que cambiaron.
+#
+# MODO VIGILANCIA:
+#     python actualizar_datos.py --watch
+#     python actualizar_datos.py --watch CARPETA_CON_EXCELS
+# Se queda corriendo y vuelve a cargar los datos cada vez que se guarda
+# el Excel (o aparece uno nuevo en la carpeta). Ctrl + C para salir.
 #
 # ═══════════════════════════════════════════════════════════════════
 
-import pandas as pd
+import argparse
+import os
+import time
+import zipfile
 from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
 
-print("=" * 60)
-print("🔄 ACTUALIZANDO DATOS DEL DASHBOARD")
-print("=" * 60)
+import alertas
+import anomalias
+import historia
+import particiones
+import ranking
+import validacion
+from metricas import a_centavos
+from modelo import construir_df
+from snapshots import COLUMNAS_DINERO, DATOS_PY, escribir_atomico, publicar_snapshot, version_publicada
 
 # Nombre del archivo Excel (puedes cambiarlo si tu archivo se llama diferente)
 ARCHIVO_EXCEL = "AVANCE_DIARIO_REV.xlsx"
 
-try:
-    # Leer el Excel
-    print(f"\n📂 Leyendo archivo: {ARCHIVO_EXCEL}")
-    df = pd.read_excel(ARCHIVO_EXCEL, sheet_name='Avance semanal', header=2)
-    
-    # Renombrar columnas
-    df.columns = ['COL0', 'COL1', 'COL2', 'CLIENT_NUM', 'clientName', 'sucursal', 
-                  'asesor', 'zona', 'ESTATUS', 'objRefacc', 'objBgo', 'objAcc', 
-                  'objTotal', 'resRefacc', 'pctRefacc', 'resBgo', 'pctBgo', 
-                  'resAcc', 'pctAcc', 'resTotal', 'pctTotal', 'pedidos']
-    
-    # Filtrar filas válidas
-    df = df[df['CLIENT_NUM'].notna() & df['CLIENT_NUM'].astype(str).str.startswith('C')].copy()
-    
-    # Convertir a números
-    for col in ['objRefacc', 'objBgo', 'objAcc', 'objTotal', 'resRefacc', 'resBgo', 'resAcc', 'resTotal', 'pedidos', 'zona']:
-        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    
-    print(f"✅ {len(df)} sucursales encontradas")
-    print(f"✅ {df['clientName'].nunique()} clientes únicos")
-    
-    # Generar el archivo datos.py
-    print(f"\n📝 Generando archivo datos.py...")
-    
+# Vigilancia: cada cuánto se revisa el archivo y cuánto tiempo debe quedar
+# sin cambios antes de procesarlo (Excel guarda en varios pasos)
+INTERVALO_REVISION = 1.0
+ESPERA_ESTABLE = 2.0
+
+
+def leer_hoja(archivo):
+    """Lee la hoja 'Avance semanal' y regresa las filas de clientes sin convertir.
+
+    Las columnas se reconocen por encabezado (validacion.mapear_encabezados).
+    """
+    df = pd.read_excel(archivo, sheet_name='Avance semanal', header=2)
+
+    nombres, avisos = validacion.mapear_encabezados(df.columns)
+    for aviso in avisos:
+        print(f"⚠️ {aviso}")
+    df.columns = nombres
+
+    # Filtrar filas de clientes (se descartan títulos y subtotales)
+    return df[df['CLIENT_NUM'].notna() & df['CLIENT_NUM'].astype(str).str.startswith('C')]
+
+
+def leer_excel(archivo):
+    """Filas de clientes validadas: (df con montos numéricos, cuarentena, avisos)."""
+    return validacion.validar(leer_hoja(archivo))
+
+
+def columnas_snapshot(df):
+    """Columnas que se guardan en el snapshot (montos en centavos)."""
+    columnas = {
+        'CLIENT_NUM': df['CLIENT_NUM'].astype(str).tolist(),
+        'clientName': df['clientName'].astype(str).tolist(),
+        'sucursal': df['sucursal'].astype(str).tolist(),
+        'asesor': df['asesor'].astype(str).tolist(),
+        'zona': df['zona'].astype(int).tolist(),
+        'ESTATUS': df['ESTATUS'].fillna('').astype(str).tolist(),
+    }
+    # Montos en centavos enteros: sumas y umbrales exactos
+    for col in COLUMNAS_DINERO:
+        columnas[col] = a_centavos(df[col]).tolist()
+    return columnas
+
+
+def generar_datos_py(df, clientes, generado, ruta=DATOS_PY):
+    """Escribe datos.py (formato original, se usa si no hay snapshots)."""
     lineas = []
     lineas.append("# ═══════════════════════════════════════════════════════════════════")
     lineas.append("# DATOS DEL DASHBOARD - GENERADO AUTOMÁTICAMENTE")
-    lineas.append(f"# Última actualización: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+    lineas.append(f"# Última actualización: {generado.strftime('%d/%m/%Y %H:%M')}")
     lineas.append(f"# Total sucursales: {len(df)}")
     lineas.append(f"# Total clientes: {df['clientName'].nunique()}")
     lineas.append("# ═══════════════════════════════════════════════════════════════════")
     lineas.append("")
     lineas.append("DATOS = [")
-    
+
     for _, row in df.iterrows():
         linea = "    {"
         linea += f'"clientName": "{row["clientName"]}", '
@@ -69,29 +131,211 @@ try:
         linea += f'"pedidos": {row["pedidos"]:.2f}'
         linea += "},"
         lineas.append(linea)
-    
+
     lineas.append("]")
     lineas.append("")
     lineas.append("# Lista de clientes únicos")
-    lineas.append(f"CLIENTES = {sorted(df['clientName'].unique().tolist())}")
-    
-    # Guardar archivo
-    with open("datos.py", "w", encoding="utf-8") as f:
-        f.write("\n".join(lineas))
-    
+    lineas.append(f"CLIENTES = {clientes}")
+
+    # Guardar archivo (reemplazo atómico, nunca queda a medio escribir)
+    escribir_atomico(ruta, "\n".join(lineas).encode("utf-8"))
+
+
+def actualizar(archivo=ARCHIVO_EXCEL, precalcular=False):
+    """Lee el Excel, publica el snapshot y regenera datos.py. Regresa la versión.
+
+    Con `precalcular` corre además pipeline.py sobre la versión publicada.
+    """
+    print("=" * 60)
+    print("🔄 ACTUALIZANDO DATOS DEL DASHBOARD")
+    print("=" * 60)
+
+    # Leer el Excel
+    print(f"\n📂 Leyendo archivo: {archivo}")
+    df, cuarentena, avisos = leer_excel(archivo)
+
+    print(f"✅ {len(df)} sucursales encontradas")
+    print(f"✅ {df['clientName'].nunique()} clientes únicos")
+    if not cuarentena.empty:
+        print(f"⚠️ {len(cuarentena)} filas en cuarentena (no se publican):")
+        for motivo, filas in validacion.resumen(cuarentena).items():
+            print(f"   - {motivo}: {filas}")
+    if not avisos.empty:
+        print(f"⚠️ {len(avisos)} filas con totales que no cuadran (sí se publican):")
+        for motivo, filas in validacion.resumen(avisos).items():
+            print(f"   - {motivo}: {filas}")
+
+    # Publicar snapshot versionado
+    print(f"\n📦 Publicando snapshot...")
+    generado = datetime.now()
+    columnas = columnas_snapshot(df)
+    clientes = sorted(df['clientName'].unique().tolist())
+    anterior = version_publicada()
+    version = publicar_snapshot(columnas, clientes, generado)
+    print(f"✅ Versión publicada: {version}")
+    if not cuarentena.empty:
+        print(f"📝 Reporte de cuarentena: {validacion.guardar_cuarentena(cuarentena, version)}")
+    if not avisos.empty:
+        ruta = validacion.guardar_cuarentena(avisos, version, validacion.DIRECTORIO_AVISOS)
+        print(f"📝 Reporte de avisos: {ruta}")
+
+    # Cumplimientos ordenados por zona y asesor para el comparativo del dashboard
+    try:
+        ranking.guardar(version, ranking.calcular(construir_df(columnas)))
+    except Exception as e:
+        print(f"⚠️ No se pudo calcular el ranking: {e}")
+
+    # Una partición por cliente: el dashboard lee solo la del cliente que se visita
+    try:
+        particiones.escribir(version, columnas)
+        print(f"✅ Particiones por cliente: {particiones.directorio_version(version)}")
+    except Exception as e:
+        # Sin particiones el dashboard usa el snapshot completo
+        print(f"⚠️ No se pudieron escribir las particiones: {e}")
+
+    # Tendencia diaria por sucursal (el dashboard solo la lee)
+    try:
+        print(f"✅ Historia: {historia.guardar(version, historia.calcular(version))}")
+    except Exception as e:
+        print(f"⚠️ No se pudo calcular la historia: {e}")
+
+    if anterior != version:
+        # Sucursales atípicas (contra la versión anterior si la hay)
+        print(f"\n🚨 Buscando anomalías...")
+        encontradas = None
+        try:
+            encontradas = anomalias.procesar(anterior, version, columnas)
+            print(f"✅ {len(encontradas)} anomalías")
+            if not encontradas.empty:
+                print(anomalias.resumen(encontradas))
+        except Exception as e:
+            print(f"⚠️ No se pudieron buscar las anomalías: {e}")
+
+        # Alertas contra lo que estaba publicado; el correo lleva también las anomalías
+        print(f"\n🔔 Buscando cruces de umbral...")
+        try:
+            nuevas = alertas.procesar(anterior, version, columnas, alertas.enviador_desde_entorno(), encontradas)
+            print(f"✅ {len(nuevas)} alertas")
+            if not nuevas.empty:
+                print(alertas.resumen(nuevas))
+        except Exception as e:
+            # Los datos ya están publicados; una falla de alertas no los detiene
+            print(f"⚠️ No se pudieron generar las alertas: {e}")
+
+    # Generar el archivo datos.py
+    print(f"\n📝 Generando archivo datos.py...")
+    generar_datos_py(df, clientes, generado)
     print(f"✅ Archivo datos.py generado correctamente")
-    
+
+    if precalcular:
+        import pipeline
+        print(f"\n🏭 Generando artefactos...")
+        try:
+            pipeline.imprimir_reporte(pipeline.ejecutar(version))
+        except Exception as e:
+            # Igual que las alertas: los datos ya están publicados
+            print(f"⚠️ No se pudo correr el pipeline: {e}")
+
     print("\n" + "=" * 60)
     print("🎉 ¡ACTUALIZACIÓN COMPLETADA!")
     print("=" * 60)
-    print("\nPróximos pasos:")
-    print("1. Ejecuta: streamlit run dashboard.py")
-    print("2. O sube los cambios a GitHub para actualizar en internet")
-    print("=" * 60)
+    return version
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MODO VIGILANCIA
+# ═══════════════════════════════════════════════════════════════════
+
+def _firma(ruta):
+    """(mtime, tamaño) del Excel a procesar, o None si no existe.
+
+    Si `ruta` es una carpeta se toma el .xlsx modificado más recientemente,
+    ignorando los archivos temporales de Excel (~$...).
+    """
+    ruta = Path(ruta)
+    if ruta.is_dir():
+        candidatos = [p for p in ruta.glob("*.xlsx") if not p.name.startswith("~$")]
+    else:
+        candidatos = [ruta]
+    mejor = None
+    for p in candidatos:
+        try:
+            st = os.stat(p)
+        except FileNotFoundError:
+            continue
+        firma = (st.st_mtime_ns, st.st_size, str(p))
+        if mejor is None or firma > mejor:
+            mejor = firma
+    return mejor
+
+
+def vigilar(ruta=ARCHIVO_EXCEL, intervalo=INTERVALO_REVISION, espera=ESPERA_ESTABLE, precalcular=False):
+    """Revisa `ruta` cada `intervalo` segundos y actualiza cuando cambia.
+
+    Un cambio se procesa solo después de `espera` segundos sin nuevas
+    modificaciones, para no leer un archivo que Excel sigue guardando.
+    """
+    print(f"👀 Vigilando {ruta} (Ctrl + C para salir)")
+    procesada = None
+    pendiente = None
+    visto_en = 0.0
+
+    while True:
+        firma = _firma(ruta)
+        ahora = time.monotonic()
+
+        if firma != pendiente:
+            # Cambio nuevo (o archivo todavía guardándose): reiniciar la espera
+            pendiente = firma
+            visto_en = ahora
+        elif firma is not None and firma != procesada and ahora - visto_en >= espera:
+            # Si falla no se reintenta hasta que el archivo vuelva a cambiar
+            procesada = firma
+            try:
+                actualizar(firma[2], precalcular)
+            except (zipfile.BadZipFile, PermissionError, EOFError) as e:
+                print(f"\n⏳ Archivo incompleto, se procesará en el próximo guardado ({e})")
+            except Exception as e:
+                print(f"\n❌ ERROR: {e}")
+
+        time.sleep(intervalo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Actualizar los datos del dashboard desde el Excel")
+    parser.add_argument("archivo", nargs="?", default=ARCHIVO_EXCEL,
+                        help="Excel a leer, o carpeta a vigilar con --watch")
+    parser.add_argument("--watch", action="store_true",
+                        help="Quedarse corriendo y actualizar cada vez que cambie el Excel")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_REVISION,
+                        help="Segundos entre revisiones en modo vigilancia")
+    parser.add_argument("--espera", type=float, default=ESPERA_ESTABLE,
+                        help="Segundos sin cambios antes de procesar un archivo")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Generar también los artefactos derivados (pipeline.py)")
+    args = parser.parse_args()
+
+    if args.watch:
+        try:
+            vigilar(args.archivo, args.intervalo, args.espera, args.pipeline)
+        except KeyboardInterrupt:
+            print("\n👋 Vigilancia detenida")
+        return
+
+    try:
+        actualizar(args.archivo, args.pipeline)
+        print("\nPróximos pasos:")
+        print("1. Ejecuta: streamlit run dashboard.py")
+        print("2. O sube los cambios a GitHub para actualizar en internet")
+        print("=" * 60)
+
+    except FileNotFoundError:
+        print(f"\n❌ ERROR: No se encontró el archivo '{args.archivo}'")
+        print(f"   Asegúrate de que el archivo esté en la misma carpeta que este script.")
+
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+
 
-except FileNotFoundError:
-    print(f"\n❌ ERROR: No se encontró el archivo '{ARCHIVO_EXCEL}'")
-    print(f"   Asegúrate de que el archivo esté en la misma carpeta que este script.")
-    
-except Exception as e:
-    print(f"\n❌ ERROR: {e}")
+if __name__ == "__main__":
+    main()
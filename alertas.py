@@ -0,0 +1,253 @@
+# ═══════════════════════════════════════════════════════════════════
+# ALERTAS DESPUÉS DE CADA ACTUALIZACIÓN
+# ═══════════════════════════════════════════════════════════════════
+#
+# Compara los totales por cliente del snapshot nuevo contra el que
+# estaba publicado antes y avisa qué clientes:
+#   - cruzaron el 70% o el 100% en REFACC, BGO o el total (hacia arriba
+#     o hacia abajo), con los mismos cortes del semáforo;
+#   - ganaron o perdieron el descuento del 35%.
+#
+# Todo sale de un groupby por snapshot y comparaciones vectorizadas en
+# enteros (metricas.cumple); no se vuelve a leer ningún Excel.
+#
+# La lista se guarda en snapshots/alertas/<versión>.json y .csv. Si
+# MOTODRIVE_SMTP_HOST está definido también se envía por correo; el
+# envío es cualquier función (asunto, cuerpo), así que se puede
+# cambiar por otro canal. Las sucursales atípicas de la misma
+# actualización (anomalias.py) van en el mismo JSON y el mismo correo.
+#
+# USO:
+#     python alertas.py                         -> publicada vs la anterior
+#     python alertas.py ANTERIOR NUEVA --enviar
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import os
+import smtplib
+from email.message import EmailMessage
+
+import numpy as np
+import pandas as pd
+
+import anomalias
+from metricas import agregados_clientes, califica_descuento, cumple, formato_pesos
+from modelo import construir_df
+from snapshots import DIRECTORIO, escribir_atomico, leer_snapshot, version_publicada, versiones
+
+DIRECTORIO_ALERTAS = DIRECTORIO / "alertas"
+
+# Cortes del semáforo que generan alerta (porcentaje del objetivo)
+UMBRALES = (70, 100)
+
+CATEGORIAS = {
+    'REFACC': ('resRefacc', 'objRefacc'),
+    'BGO': ('resBgo', 'objBgo'),
+    'TOTAL': ('resTotal', 'objTotal'),
+}
+
+COLUMNAS_ALERTA = ['cliente', 'categoria', 'umbral', 'direccion', 'pct_antes', 'pct_ahora', 'resultado', 'objetivo']
+
+
+def _nivel(res, obj):
+    """Cuántos UMBRALES alcanza cada cliente (0, 1 o 2), en enteros."""
+    nivel = np.zeros(len(res), dtype='int8')
+    for umbral in UMBRALES:
+        nivel += np.asarray(cumple(res, obj, umbral), dtype='int8')
+    return nivel
+
+
+def _pct(res, obj):
+    return np.where(obj > 0, res * 100 / np.where(obj > 0, obj, 1), 0).round(1)
+
+
+def detectar(agregados_antes, agregados_ahora):
+    """Alertas entre dos tablas de metricas.agregados_clientes.
+
+    Solo se comparan clientes presentes en ambos snapshots. Regresa un
+    DataFrame con COLUMNAS_ALERTA; `umbral` es 70/100 o 35 para el descuento.
+    """
+    comunes = agregados_ahora.index.intersection(agregados_antes.index)
+    antes = agregados_antes.loc[comunes]
+    ahora = agregados_ahora.loc[comunes]
+
+    partes = []
+    for categoria, (col_res, col_obj) in CATEGORIAS.items():
+        res_antes, obj_antes = antes[col_res].to_numpy(), antes[col_obj].to_numpy()
+        res_ahora, obj_ahora = ahora[col_res].to_numpy(), ahora[col_obj].to_numpy()
+        nivel_antes, nivel_ahora = _nivel(res_antes, obj_antes), _nivel(res_ahora, obj_ahora)
+        cambio = nivel_antes != nivel_ahora
+        if not cambio.any():
+            continue
+        sube = nivel_ahora[cambio] > nivel_antes[cambio]
+        # Umbral más alto cruzado: al subir el nuevo nivel, al bajar el que se perdió
+        nivel_cruzado = np.where(sube, nivel_ahora[cambio], nivel_antes[cambio])
+        partes.append(pd.DataFrame({
+            'cliente': comunes[cambio],
+            'categoria': categoria,
+            'umbral': np.asarray(UMBRALES)[nivel_cruzado - 1],
+            'direccion': np.where(sube, 'sube', 'baja'),
+            'pct_antes': _pct(res_antes, obj_antes)[cambio],
+            'pct_ahora': _pct(res_ahora, obj_ahora)[cambio],
+            'resultado': res_ahora[cambio],
+            'objetivo': obj_ahora[cambio],
+        }))
+
+    def _califica(a):
+        return np.asarray(califica_descuento(a['resRefacc'], a['objRefacc'], a['resBgo'], a['objBgo'],
+                                             a['resTotal'], a['objTotal']))
+
+    tenia, tiene = _califica(antes), _califica(ahora)
+    cambio = tenia != tiene
+    if cambio.any():
+        partes.append(pd.DataFrame({
+            'cliente': comunes[cambio],
+            'categoria': 'DESCUENTO',
+            'umbral': 35,
+            'direccion': np.where(tiene[cambio], 'sube', 'baja'),
+            'pct_antes': _pct(antes['resTotal'].to_numpy(), antes['objTotal'].to_numpy())[cambio],
+            'pct_ahora': _pct(ahora['resTotal'].to_numpy(), ahora['objTotal'].to_numpy())[cambio],
+            'resultado': ahora['resTotal'].to_numpy()[cambio],
+            'objetivo': ahora['objTotal'].to_numpy()[cambio],
+        }))
+
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_ALERTA)
+    return pd.concat(partes, ignore_index=True).sort_values(['cliente', 'categoria'], ignore_index=True)
+
+
+def alertas_entre(version_antes, version_ahora, columnas_ahora=None):
+    """Alertas entre dos versiones publicadas.
+
+    `columnas_ahora` evita releer el snapshot nuevo si ya está en memoria.
+    """
+    if columnas_ahora is None:
+        columnas_ahora = leer_snapshot(version_ahora)['columnas']
+    antes = agregados_clientes(construir_df(leer_snapshot(version_antes)['columnas']))
+    ahora = agregados_clientes(construir_df(columnas_ahora))
+    return detectar(antes, ahora)
+
+
+def guardar(alertas, version, directorio=DIRECTORIO_ALERTAS, atipicas=None):
+    """Escribe alertas/<versión>.json y .csv (montos en pesos). Regresa las rutas.
+
+    Con `atipicas` (anomalias.detectar) el JSON lleva también la lista 'anomalias'.
+    """
+    salida = alertas.copy()
+    salida['resultado'] = salida['resultado'] / 100
+    salida['objetivo'] = salida['objetivo'] / 100
+
+    ruta_json = directorio / f"{version}.json"
+    ruta_csv = directorio / f"{version}.csv"
+    contenido = {'version': version, 'alertas': salida.to_dict(orient='records')}
+    if atipicas is not None:
+        contenido['anomalias'] = anomalias.en_pesos(atipicas).to_dict(orient='records')
+    escribir_atomico(ruta_json, json.dumps(contenido, ensure_ascii=False, indent=1).encode("utf-8"))
+    escribir_atomico(ruta_csv, salida.to_csv(index=False).encode("utf-8-sig"))
+    return ruta_json, ruta_csv
+
+
+def resumen(alertas):
+    """Texto de una línea por alerta, para correo o consola."""
+    lineas = []
+    for a in alertas.itertuples(index=False):
+        flecha = "⬆️" if a.direccion == 'sube' else "⬇️"
+        if a.categoria == 'DESCUENTO':
+            texto = "ahora tiene el 35%" if a.direccion == 'sube' else "perdió el 35%"
+        else:
+            texto = f"{a.categoria} {a.pct_antes:.0f}% → {a.pct_ahora:.0f}% (cruzó {a.umbral}%)"
+        lineas.append(f"{flecha} {a.cliente}: {texto} · {formato_pesos(a.resultado)} / {formato_pesos(a.objetivo)}")
+    return "\n".join(lineas)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ENVÍO
+# ═══════════════════════════════════════════════════════════════════
+
+def enviador_smtp(host, puerto=25, remitente="dashboard@motodrive.local", destinatarios=(),
+                  usuario=None, contrasena=None, tls=False):
+    """Función (asunto, cuerpo) que envía por SMTP a `destinatarios`."""
+    def enviar(asunto, cuerpo):
+        mensaje = EmailMessage()
+        mensaje['Subject'] = asunto
+        mensaje['From'] = remitente
+        mensaje['To'] = ", ".join(destinatarios)
+        mensaje.set_content(cuerpo)
+        with smtplib.SMTP(host, puerto, timeout=30) as smtp:
+            if tls:
+                smtp.starttls()
+            if usuario:
+                smtp.login(usuario, contrasena)
+            smtp.send_message(mensaje)
+    return enviar
+
+
+def enviador_desde_entorno():
+    """Enviador SMTP configurado con MOTODRIVE_SMTP_*; None si no hay host."""
+    host = os.environ.get("MOTODRIVE_SMTP_HOST")
+    if not host:
+        return None
+    return enviador_smtp(
+        host,
+        int(os.environ.get("MOTODRIVE_SMTP_PUERTO", 25)),
+        os.environ.get("MOTODRIVE_SMTP_DE", "dashboard@motodrive.local"),
+        [d.strip() for d in os.environ.get("MOTODRIVE_SMTP_PARA", "").split(",") if d.strip()],
+        os.environ.get("MOTODRIVE_SMTP_USUARIO"),
+        os.environ.get("MOTODRIVE_SMTP_CONTRASENA"),
+        os.environ.get("MOTODRIVE_SMTP_TLS") == "1",
+    )
+
+
+def notificar(alertas, version, enviador, atipicas=None):
+    """Envía alertas y anomalías en un solo mensaje con `enviador(asunto, cuerpo)`; nada si no hay ninguna."""
+    atipicas = atipicas if atipicas is not None else pd.DataFrame(columns=anomalias.COLUMNAS_ANOMALIA)
+    if enviador is None or (alertas.empty and atipicas.empty):
+        return False
+    partes = [resumen(alertas)] if not alertas.empty else []
+    if not atipicas.empty:
+        partes.append("Sucursales atípicas:\n" + anomalias.resumen(atipicas))
+    enviador(f"MotoDrive: {len(alertas)} alertas, {len(atipicas)} anomalías ({version})", "\n\n".join(partes))
+    return True
+
+
+def procesar(version_antes, version_ahora, columnas_ahora=None, enviador=None, atipicas=None):
+    """Detecta, guarda y (opcionalmente) envía las alertas de una actualización.
+
+    Sin `version_antes` (primera publicación) no hay alertas, pero las
+    anomalías (`atipicas`) se guardan y se envían igual.
+    """
+    if version_antes is None:
+        alertas = pd.DataFrame(columns=COLUMNAS_ALERTA)
+    else:
+        alertas = alertas_entre(version_antes, version_ahora, columnas_ahora)
+    guardar(alertas, version_ahora, atipicas=atipicas)
+    notificar(alertas, version_ahora, enviador, atipicas)
+    return alertas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alertas de cruces de umbral entre dos snapshots")
+    parser.add_argument("anterior", nargs="?", help="Versión anterior (por defecto, la previa a la publicada)")
+    parser.add_argument("nueva", nargs="?", help="Versión nueva (por defecto, la publicada)")
+    parser.add_argument("--enviar", action="store_true", help="Enviar por SMTP (MOTODRIVE_SMTP_*)")
+    args = parser.parse_args()
+
+    nueva = args.nueva or version_publicada()
+    anterior = args.anterior
+    if anterior is None:
+        previas = [v for v in versiones() if nueva and v < nueva]
+        anterior = previas[-1] if previas else None
+    if anterior is None or nueva is None:
+        print("❌ ERROR: Se necesitan dos snapshots para comparar")
+        raise SystemExit(1)
+
+    alertas = procesar(anterior, nueva, enviador=enviador_desde_entorno() if args.enviar else None)
+    print(f"🔔 {len(alertas)} alertas ({anterior} → {nueva})")
+    if not alertas.empty:
+        print(resumen(alertas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# ═══════════════════════════════════════════════════════════════════
+# ANOMALÍAS EN LOS RESULTADOS POR SUCURSAL
+# ═══════════════════════════════════════════════════════════════════
+#
+# Después de cada actualización se buscan sucursales con números raros,
+# todas a la vez (operaciones por columna, sin ciclos por sucursal):
+#
+#   cumplimiento_atipico  resultado / objetivo muy lejos del resto
+#                         (en escala log: 1% contra una mediana de 50%)
+#   pedidos_sin_resultado muchos pedidos para el resultado capturado
+#   resultado_bajo        el resultado bajó contra el snapshot anterior
+#                         (es acumulado: no debería bajar)
+#   salto_atipico         subida contra el snapshot anterior muy por
+#                         encima de la de las demás sucursales
+#
+# "Muy lejos" es un z robusto: 0.6745 * (x - mediana) / MAD, con la
+# mediana y la MAD de todas las sucursales; no lo mueven unos cuantos
+# valores extremos como a la media y la desviación estándar. Además del
+# z se pide una distancia mínima a la mediana (DIFERENCIA_LOG,
+# SALTO_MINIMO), un objetivo no trivial y un grupo de al menos
+# MINIMO_GRUPO sucursales: una distribución normal no marca nada.
+#
+# La lista se guarda en snapshots/anomalias/<versión>.json y .csv, va
+# en el JSON y en el correo de alertas de la misma actualización
+# (alertas.procesar) y se ve en el dashboard interno. Si una versión
+# no la tiene se calcula la primera vez que se pide.
+#
+# USO:
+#     python anomalias.py                         -> publicada vs la anterior
+#     python anomalias.py ANTERIOR NUEVA --enviar
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from comparacion import comparar
+from metricas import CENTAVOS, formato_pesos
+from modelo import construir_df
+from snapshots import DIRECTORIO, escribir_atomico, leer_snapshot, version_publicada, versiones
+
+DIRECTORIO_ANOMALIAS = DIRECTORIO / "anomalias"
+
+# |z robusto| a partir del cual una sucursal se marca
+UMBRAL_Z = 3.5
+
+# Además del z, distancia mínima a la mediana: unas 30 veces (10 ** 1.5)
+# en cumplimiento y en pedidos / resultado (log10), y un salto de al
+# menos 25% del objetivo en una sola actualización
+DIFERENCIA_LOG = 1.5
+SALTO_MINIMO = 0.25
+
+# Solo se comparan sucursales con objetivo de al menos $20,000 (centavos)
+# y solo si hay al menos MINIMO_GRUPO para sacar mediana y MAD
+OBJETIVO_MINIMO = 2_000_000
+MINIMO_GRUPO = 30
+
+# Bajas menores a esto (centavos) son redondeos, no anomalías
+TOLERANCIA_BAJA = 100
+
+COLUMNAS_ANOMALIA = ['cliente', 'sucursal', 'tipo', 'puntaje', 'detalle', 'resultado', 'objetivo', 'pedidos']
+
+
+def z_robusto(valores):
+    """0.6745 * (x - mediana) / MAD; NaN se ignora. Si la MAD es 0 se usa la desviación media."""
+    if np.isnan(valores).all():
+        return np.zeros(len(valores))
+    mediana = np.nanmedian(valores)
+    desviacion = np.abs(valores - mediana)
+    mad = np.nanmedian(desviacion)
+    if not mad > 0:
+        # Más de la mitad de valores iguales: escala con la desviación media (1.2533 = sqrt(pi/2))
+        mad = np.nanmean(desviacion) * 1.2533 * 0.6745
+    if not mad > 0:
+        return np.zeros(len(valores))
+    return 0.6745 * (valores - mediana) / mad
+
+
+def _log(valores, validos):
+    return np.log10(valores, out=np.full(len(valores), np.nan), where=validos)
+
+
+def atipicos(valores, validos, diferencia):
+    """(filas marcadas, z): |z robusto| > UMBRAL_Z y a `diferencia` o más de la mediana.
+
+    Solo cuentan las filas `validos`; con menos de MINIMO_GRUPO no se marca ninguna.
+    """
+    if np.count_nonzero(validos) < MINIMO_GRUPO:
+        return np.zeros(len(valores), dtype=bool), np.zeros(len(valores))
+    x = np.where(validos, valores, np.nan)
+    z = z_robusto(x)
+    lejos = np.abs(x - np.nanmedian(x)) >= diferencia
+    return validos & (np.abs(z) > UMBRAL_Z) & lejos, z
+
+
+def detectar(df, df_anterior=None):
+    """Anomalías de `df` (y contra `df_anterior` si se da). DataFrame con COLUMNAS_ANOMALIA."""
+    res = df['resTotal'].to_numpy()
+    obj = df['objTotal'].to_numpy()
+    ped = df['pedidos'].to_numpy()
+    # (tipo, filas marcadas, puntaje, texto de una fila): el texto solo se arma para las marcadas
+    reglas = []
+
+    objetivo = obj >= OBJETIVO_MINIMO
+
+    # Cumplimiento en escala log, solo donde hay objetivo y resultado
+    con_datos = objetivo & (res > 0)
+    cumplimiento = np.divide(res, obj, out=np.zeros(len(df)), where=obj > 0)
+    marcadas, z = atipicos(_log(cumplimiento, con_datos), con_datos, DIFERENCIA_LOG)
+    reglas.append(('cumplimiento_atipico', marcadas, np.abs(z),
+                   lambda i: f"{cumplimiento[i] * 100:.1f}% de cumplimiento"))
+
+    # Pedidos contra resultado (en pesos, log10(1 + x) para aceptar resultado 0)
+    razon = np.log10(1 + ped / CENTAVOS) - np.log10(1 + res / CENTAVOS)
+    marcadas, z = atipicos(razon, objetivo & (ped > 0), DIFERENCIA_LOG)
+    reglas.append(('pedidos_sin_resultado', marcadas & (z > 0), z,
+                   lambda i: f"pedidos {formato_pesos(ped[i])} vs resultado {formato_pesos(res[i])}"))
+
+    if df_anterior is not None:
+        cambios = comparar(df, df_anterior)
+        cambio = cambios['resTotal'].to_numpy()
+        existente = ~cambios['nueva'].to_numpy()
+        baja = existente & (cambio < -TOLERANCIA_BAJA)
+        relativo = np.divide(cambio, obj, out=np.zeros(len(df)), where=obj > 0)
+        reglas.append(('resultado_bajo', baja, np.abs(relativo) * 100,
+                       lambda i: f"bajó {formato_pesos(-cambio[i])} contra el snapshot anterior"))
+        marcadas, z = atipicos(relativo, existente & objetivo & (cambio > 0), SALTO_MINIMO)
+        reglas.append(('salto_atipico', marcadas & (z > 0), z,
+                       lambda i: f"subió {formato_pesos(cambio[i])} contra el snapshot anterior"))
+
+    partes = []
+    for tipo, mascara, puntaje, detalle in reglas:
+        filas = np.flatnonzero(mascara)
+        if len(filas) == 0:
+            continue
+        partes.append(pd.DataFrame({
+            'cliente': df['clientName'].iloc[filas].astype(str).to_numpy(),
+            'sucursal': df['sucursal'].iloc[filas].astype(str).to_numpy(),
+            'tipo': tipo,
+            'puntaje': np.round(puntaje[filas], 1),
+            'detalle': [detalle(i) for i in filas],
+            'resultado': res[filas],
+            'objetivo': obj[filas],
+            'pedidos': ped[filas],
+        }))
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_ANOMALIA)
+    return pd.concat(partes, ignore_index=True).sort_values(['tipo', 'puntaje'], ascending=[True, False],
+                                                            ignore_index=True)
+
+
+def anomalias_entre(version_antes, version_ahora, columnas_ahora=None):
+    """Anomalías de `version_ahora` (contra `version_antes` si no es None)."""
+    if columnas_ahora is None:
+        columnas_ahora = leer_snapshot(version_ahora)['columnas']
+    antes = construir_df(leer_snapshot(version_antes)['columnas']) if version_antes else None
+    return detectar(construir_df(columnas_ahora), antes)
+
+
+def version_previa(version):
+    """Versión guardada inmediatamente antes de `version`, o None."""
+    previas = [v for v in versiones() if v < version]
+    return previas[-1] if previas else None
+
+
+def en_pesos(anomalias):
+    salida = anomalias.copy()
+    for col in ['resultado', 'objetivo', 'pedidos']:
+        salida[col] = salida[col] / CENTAVOS
+    return salida
+
+
+def guardar(anomalias, version, directorio=DIRECTORIO_ANOMALIAS):
+    """Escribe anomalias/<versión>.json y .csv (montos en pesos). Regresa las rutas."""
+    salida = en_pesos(anomalias)
+
+    ruta_json = directorio / f"{version}.json"
+    ruta_csv = directorio / f"{version}.csv"
+    contenido = {'version': version, 'anomalias': salida.to_dict(orient='records')}
+    escribir_atomico(ruta_json, json.dumps(contenido, ensure_ascii=False, indent=1).encode("utf-8"))
+    escribir_atomico(ruta_csv, salida.to_csv(index=False).encode("utf-8-sig"))
+    return ruta_json, ruta_csv
+
+
+def cargar(version, directorio=DIRECTORIO_ANOMALIAS):
+    """Anomalías de `version` en pesos: las guardadas o, si no hay, calculadas contra la previa y guardadas.
+
+    Con version=None (datos.py) se calculan en memoria, sin guardar.
+    """
+    if version is None:
+        return en_pesos(anomalias_entre(None, None))
+    try:
+        with open(directorio / f"{version}.json", encoding="utf-8") as f:
+            return pd.DataFrame(json.load(f)['anomalias'], columns=COLUMNAS_ANOMALIA)
+    except (OSError, ValueError, KeyError):
+        pass
+    anomalias = anomalias_entre(version_previa(version), version)
+    try:
+        guardar(anomalias, version, directorio)
+    except OSError:
+        pass  # Sin permisos de escritura: se usa en memoria
+    return en_pesos(anomalias)
+
+
+def resumen(anomalias):
+    """Texto de una línea por anomalía, para correo o consola."""
+    return "\n".join(f"🚨 {a.cliente} / {a.sucursal}: {a.tipo} ({a.detalle})"
+                     for a in anomalias.itertuples(index=False))
+
+
+def procesar(version_antes, version_ahora, columnas_ahora=None):
+    """Detecta y guarda las anomalías de una actualización (el envío va con alertas.procesar)."""
+    anomalias = anomalias_entre(version_antes, version_ahora, columnas_ahora)
+    guardar(anomalias, version_ahora)
+    return anomalias
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sucursales con resultados atípicos")
+    parser.add_argument("anterior", nargs="?", help="Versión anterior (por defecto, la previa a la publicada)")
+    parser.add_argument("nueva", nargs="?", help="Versión nueva (por defecto, la publicada)")
+    parser.add_argument("--enviar", action="store_true", help="Enviar por SMTP (MOTODRIVE_SMTP_*)")
+    args = parser.parse_args()
+
+    nueva = args.nueva or version_publicada()
+    if nueva is None:
+        print("❌ ERROR: No hay snapshots publicados")
+        raise SystemExit(1)
+    anterior = args.anterior or version_previa(nueva)
+
+    anomalias = procesar(anterior, nueva)
+    if args.enviar:
+        # alertas importa este módulo: se importa aquí para no hacer un ciclo
+        import alertas
+        alertas.notificar(pd.DataFrame(columns=alertas.COLUMNAS_ALERTA), nueva, alertas.enviador_desde_entorno(),
+                          anomalias)
+    print(f"🚨 {len(anomalias)} anomalías en {nueva}" + (f" (contra {anterior})" if anterior else ""))
+    if not anomalias.empty:
+        print(resumen(anomalias))
+
+
+if __name__ == "__main__":
+    main()
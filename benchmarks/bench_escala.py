@@ -0,0 +1,209 @@
+# ═══════════════════════════════════════════════════════════════════
+# BENCHMARK DE ESCALA
+# ═══════════════════════════════════════════════════════════════════
+#
+# Mide tiempo y pico de memoria de cada etapa con libros sintéticos de
+# distintos tamaños:
+#   ingesta_excel        -> actualizar_datos.leer_hoja
+#   validacion           -> validacion.validar
+#   publicar_snapshot    -> columnas_snapshot + snapshots.publicar_snapshot
+#   generar_datos_py     -> actualizar_datos.generar_datos_py
+#   escribir_particiones -> particiones.escribir (una partición por cliente)
+#   carga                -> leer_snapshot + construir_df (lo que hace el dashboard)
+#   anomalias            -> anomalias.detectar (contra el mismo snapshot)
+#   filtro_cliente       -> df[df['clientName'] == cliente] (referencia: recorre todo)
+#   vista_cliente        -> modelo.sucursales_cliente (lo que usa el dashboard)
+#   particion_cliente    -> particiones.cargar_cliente, sin LRU (primera visita)
+#   metricas             -> calcular_metricas
+#   tabla                -> tabla_sucursales
+#   generar_pdf          -> reporte_pdf.generar_pdf
+# Las etapas por cliente reportan el promedio por cliente.
+#
+# El resultado es JSON (incluye el commit) para comparar entre versiones:
+#     python benchmarks/bench_escala.py --filas 1000 10000 -o base.json
+#     python benchmarks/bench_escala.py --comparar base.json nuevo.json
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+# Los snapshots del benchmark no deben tocar los publicados
+_TMP = Path(tempfile.mkdtemp(prefix="bench_motodrive_"))
+atexit.register(shutil.rmtree, _TMP, ignore_errors=True)
+os.environ["MOTODRIVE_SNAPSHOTS"] = str(_TMP / "snapshots")
+
+import pandas as pd  # noqa: E402
+
+import particiones  # noqa: E402
+from actualizar_datos import columnas_snapshot, generar_datos_py, leer_hoja  # noqa: E402
+from anomalias import detectar  # noqa: E402
+from generar_excel import generar_excel  # noqa: E402
+from metricas import calcular_metricas, tabla_sucursales  # noqa: E402
+from modelo import construir_df, sucursales_cliente  # noqa: E402
+from reporte_pdf import generar_pdf  # noqa: E402
+from snapshots import PUNTERO, leer_snapshot, publicar_snapshot  # noqa: E402
+from validacion import validar  # noqa: E402
+
+TAMANOS = [1_000, 10_000, 100_000, 1_000_000]
+CLIENTES_MUESTRA = 50
+CLIENTES_PDF = 3
+
+
+def medir(funcion, repeticiones=1, memoria=True):
+    """(resultado, mejor tiempo en s, pico de memoria en MB o None)."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    pico = None
+    if memoria:
+        # Pasada aparte: tracemalloc hace más lento el código
+        tracemalloc.start()
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return resultado, mejor, pico
+
+
+def _por_cliente(funcion, clientes):
+    def correr():
+        return [funcion(c) for c in clientes]
+    return correr
+
+
+def bench_tamano(filas, carpeta, repeticiones, memoria):
+    ruta = Path(carpeta) / f"avance_{filas}.xlsx"
+    if not ruta.exists():
+        print(f"📝 Generando {ruta.name}...", file=sys.stderr)
+        generar_excel(ruta, filas)
+
+    resultados = []
+
+    def registrar(etapa, funcion, veces=1, reps=repeticiones):
+        resultado, segundos, pico = medir(funcion, reps, memoria)
+        resultados.append({
+            'filas': filas, 'etapa': etapa,
+            'segundos': segundos / veces, 'pico_mb': pico, 'operaciones': veces,
+        })
+        print(f"  {filas:>9,} {etapa:<20} {segundos / veces * 1000:>10.2f} ms"
+              + (f" {pico:>9.1f} MB" if pico is not None else ""), file=sys.stderr)
+        return resultado
+
+    # Etapas sobre todo el libro: una sola repetición en tamaños grandes
+    reps_grandes = 1 if filas >= 100_000 else repeticiones
+    df_hoja = registrar('ingesta_excel', lambda: leer_hoja(ruta), reps=reps_grandes)
+    df_excel, _, _ = registrar('validacion', lambda: validar(df_hoja), reps=reps_grandes)
+    clientes = sorted(df_excel['clientName'].unique().tolist())
+    def publicar():
+        # Sin ACTUAL cada repetición escribe de verdad (con el mismo hash no se publicaría nada)
+        PUNTERO.unlink(missing_ok=True)
+        return publicar_snapshot(columnas_snapshot(df_excel), clientes, datetime.now())
+
+    version = registrar('publicar_snapshot', publicar, reps=reps_grandes)
+    registrar(
+        'generar_datos_py',
+        lambda: generar_datos_py(df_excel, clientes, datetime.now(), _TMP / "datos.py"),
+        reps=reps_grandes,
+    )
+    columnas = leer_snapshot(version)['columnas']
+    registrar('escribir_particiones', lambda: particiones.escribir(version, columnas), reps=reps_grandes)
+    df = registrar('carga', lambda: construir_df(leer_snapshot(version)['columnas']), reps=reps_grandes)
+    registrar('anomalias', lambda: detectar(df, df), reps=reps_grandes)
+
+    # Etapas por cliente (lo que cuesta cada visita al dashboard)
+    paso = max(1, len(clientes) // CLIENTES_MUESTRA)
+    muestra = clientes[::paso][:CLIENTES_MUESTRA]
+    filtrar = lambda c: df[df['clientName'] == c]  # noqa: E731
+    registrar('filtro_cliente', _por_cliente(filtrar, muestra), len(muestra))
+    registrar('vista_cliente', _por_cliente(lambda c: sucursales_cliente(df, c), muestra), len(muestra))
+
+    def leer_particion(c):
+        particiones._abiertas.clear()  # Cada visita lee su .npz, no el LRU
+        return particiones.cargar_cliente(version, c)
+
+    registrar('particion_cliente', _por_cliente(leer_particion, muestra), len(muestra))
+    por_cliente = {c: filtrar(c) for c in muestra}
+    registrar('metricas', _por_cliente(lambda c: calcular_metricas(por_cliente[c]), muestra), len(muestra))
+    registrar('tabla', _por_cliente(lambda c: tabla_sucursales(por_cliente[c]), muestra), len(muestra))
+    metricas = {c: calcular_metricas(por_cliente[c]) for c in muestra[:CLIENTES_PDF]}
+    registrar(
+        'generar_pdf',
+        _por_cliente(lambda c: generar_pdf(c, por_cliente[c], metricas[c]), muestra[:CLIENTES_PDF]),
+        len(metricas), reps=1,
+    )
+    return resultados
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(base, nuevo):
+    """Imprime la razón nuevo/base por (filas, etapa)."""
+    with open(base) as f:
+        a = {(r['filas'], r['etapa']): r for r in json.load(f)['resultados']}
+    with open(nuevo) as f:
+        b = {(r['filas'], r['etapa']): r for r in json.load(f)['resultados']}
+    print(f"{'Filas':>10} {'Etapa':<20}{'Base (ms)':>12}{'Nuevo (ms)':>12}{'Razón':>8}")
+    for clave in sorted(a.keys() & b.keys()):
+        ta, tb = a[clave]['segundos'] * 1000, b[clave]['segundos'] * 1000
+        razon = tb / ta if ta else float('nan')
+        print(f"{clave[0]:>10,} {clave[1]:<20}{ta:>12.2f}{tb:>12.2f}{razon:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escala del pipeline y el dashboard")
+    parser.add_argument("--filas", nargs="+", type=int, default=TAMANOS)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir pico de memoria")
+    parser.add_argument("--carpeta", default=str(_TMP),
+                        help="Dónde guardar/reutilizar los Excel generados")
+    parser.add_argument("-o", "--salida", help="Archivo JSON de resultados (por defecto, stdout)")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NUEVO"))
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+
+    resultados = []
+    for filas in args.filas:
+        resultados += bench_tamano(filas, args.carpeta, args.repeticiones, not args.sin_memoria)
+
+    reporte = {
+        'commit': _commit(),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'resultados': resultados,
+    }
+    texto = json.dumps(reporte, indent=2)
+    if args.salida:
+        Path(args.salida).write_text(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
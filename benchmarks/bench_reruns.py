@@ -0,0 +1,93 @@
+# ═══════════════════════════════════════════════════════════════════
+# BENCHMARK DE RERUNS DEL DASHBOARD
+# ═══════════════════════════════════════════════════════════════════
+#
+# Compara lo que cuesta un clic en "📄 Generar PDF":
+#   pagina_completa -> rerun de todo dashboard.py (como era antes de
+#                      usar st.fragment: gráficas, barras, tabla y PDF)
+#   fragmento_pdf   -> solo la sección del PDF (lo que se ejecuta ahora)
+#   pagina_sin_pdf  -> el resto de la página, que ya no se repite
+#
+# Usa streamlit.testing (AppTest) sobre el snapshot publicado.
+#     python benchmarks/bench_reruns.py
+#     python benchmarks/bench_reruns.py --cliente "VYAYAM MOTORS" -n 5
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+# Solo la sección del PDF, con los mismos datos que recibe en la página
+SCRIPT_FRAGMENTO = '''
+import sys
+sys.path.insert(0, {raiz!r})
+import streamlit as st
+from metricas import calcular_metricas
+from modelo import cargar_df
+import secciones
+
+@st.cache_resource
+def datos():
+    return cargar_df()
+
+df, _ = datos()
+df_cliente = df[df['clientName'] == {cliente!r}]
+secciones.seccion_pdf({cliente!r}, df_cliente, calcular_metricas(df_cliente), None)
+'''
+
+
+def _tiempo(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def _clic_pdf(at):
+    next(b for b in at.button if b.label == "📄 Generar PDF").click().run()
+
+
+def medir(cliente, repeticiones):
+    pagina = AppTest.from_file(str(RAIZ / "dashboard.py"), default_timeout=120)
+    pagina.query_params["cliente"] = cliente
+    pagina.run()
+    fragmento = AppTest.from_string(SCRIPT_FRAGMENTO.format(raiz=str(RAIZ), cliente=cliente),
+                                    default_timeout=120)
+    fragmento.run()
+
+    return {
+        'cliente': cliente,
+        'pagina_completa_ms': _tiempo(lambda: _clic_pdf(pagina), repeticiones) * 1000,
+        'fragmento_pdf_ms': _tiempo(lambda: _clic_pdf(fragmento), repeticiones) * 1000,
+        'pagina_sin_pdf_ms': _tiempo(pagina.run, repeticiones) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de rerun al generar el PDF: página completa vs fragmento")
+    parser.add_argument("--cliente", default=None, help="Cliente a medir (por defecto, el primero)")
+    parser.add_argument("-n", "--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    cliente = args.cliente
+    if cliente is None:
+        from modelo import cargar_df
+        cliente = cargar_df()[1][0]
+
+    resultado = medir(cliente, args.repeticiones)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
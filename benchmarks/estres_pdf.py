@@ -0,0 +1,88 @@
+# ═══════════════════════════════════════════════════════════════════
+# PRUEBA DE ESTRÉS: PDFs EN PARALELO
+# ═══════════════════════════════════════════════════════════════════
+#
+# Genera los PDFs de varios clientes primero uno por uno (referencia) y
+# luego con 1, 2, 4, 8... hilos a la vez, como lo haría Streamlit con
+# varias sesiones. Cada PDF en paralelo debe ser idéntico byte por byte
+# a su referencia; si alguno difiere el script termina con código 1.
+# También reporta PDFs por segundo para ver cómo escala con los hilos.
+#
+#     python benchmarks/estres_pdf.py
+#     python benchmarks/estres_pdf.py --hilos 1 4 16 --clientes 40 --rondas 3
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metricas import calcular_metricas  # noqa: E402
+from modelo import cargar_df  # noqa: E402
+from reporte_pdf import generar_pdf  # noqa: E402
+
+# Fecha fija: con ella el PDF es determinista
+FECHA = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def preparar(n_clientes):
+    df, clientes = cargar_df()
+    paso = max(1, len(clientes) // n_clientes)
+    trabajos = []
+    for cliente in clientes[::paso][:n_clientes]:
+        df_cliente = df[df['clientName'] == cliente]
+        trabajos.append((cliente, df_cliente, calcular_metricas(df_cliente)))
+    return trabajos
+
+
+def generar(trabajo):
+    cliente, df_cliente, metricas = trabajo
+    return generar_pdf(cliente, df_cliente, metricas, FECHA)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generación concurrente de PDFs")
+    parser.add_argument("--hilos", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--clientes", type=int, default=24)
+    parser.add_argument("--rondas", type=int, default=2, help="Veces que se genera cada PDF por prueba")
+    args = parser.parse_args()
+
+    trabajos = preparar(args.clientes)
+    referencia = [generar(t) for t in trabajos]
+
+    resultados = []
+    fallas = 0
+    for hilos in args.hilos:
+        tareas = list(range(len(trabajos))) * args.rondas
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            salidas = list(pool.map(lambda i: (i, generar(trabajos[i])), tareas))
+        segundos = time.perf_counter() - inicio
+
+        distintos = sum(1 for i, pdf in salidas if pdf != referencia[i])
+        fallas += distintos
+        resultados.append({
+            'hilos': hilos,
+            'pdfs': len(salidas),
+            'segundos': round(segundos, 3),
+            'pdfs_por_segundo': round(len(salidas) / segundos, 2),
+            'distintos_a_referencia': distintos,
+        })
+        print(f"{hilos:>3} hilos: {len(salidas) / segundos:6.2f} PDF/s, "
+              f"{distintos} distintos", file=sys.stderr)
+
+    print(json.dumps(resultados, indent=2))
+    if fallas:
+        print(f"❌ {fallas} PDFs no coinciden con su referencia", file=sys.stderr)
+        raise SystemExit(1)
+    print("✅ Todos los PDFs coinciden con su referencia", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
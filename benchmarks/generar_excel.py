@@ -0,0 +1,78 @@
+# ═══════════════════════════════════════════════════════════════════
+# GENERADOR DE EXCEL SINTÉTICO "Avance semanal"
+# ═══════════════════════════════════════════════════════════════════
+#
+# Escribe un libro con el mismo formato que AVANCE_DIARIO_REV.xlsx:
+# hoja 'Avance semanal', 22 columnas y encabezados en la fila 3.
+# Incluye filas de subtotal por asesor (sin número de cliente), igual
+# que el archivo real, para que el filtro de la ingesta trabaje.
+#
+# USO:
+#     python benchmarks/generar_excel.py 10000 -o avance_10k.xlsx
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import sys
+from pathlib import Path
+
+from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modelo import datos_sinteticos  # noqa: E402
+
+ENCABEZADOS = ['', '', '', 'No. Cliente', 'Cliente', 'Sucursal', 'Asesor', 'Zona', 'Estatus',
+               'Obj Refacc', 'Obj BGO', 'Obj Acc', 'Obj Total',
+               'Res Refacc', '% Refacc', 'Res BGO', '% BGO', 'Res Acc', '% Acc',
+               'Res Total', '% Total', 'Pedidos']
+
+# Una fila de subtotal cada tantas sucursales
+CADA_SUBTOTAL = 40
+
+
+def _pct(res, obj):
+    return round(res / obj, 4) if obj else 0
+
+
+def generar_excel(ruta, filas, semilla=0):
+    """Escribe el libro en modo write-only (memoria constante)."""
+    c = datos_sinteticos(filas, semilla)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Avance semanal')
+    ws.append(['AVANCE SEMANAL OBJETIVOS BAJAJ'])
+    ws.append(['Datos sintéticos', f'{filas} sucursales'])
+    ws.append(ENCABEZADOS)
+
+    for i in range(filas):
+        if i and i % CADA_SUBTOTAL == 0:
+            ws.append(['', '', '', None, f'SUBTOTAL {c["asesor"][i - 1]}'])
+        obj_r, obj_b, obj_a, obj_t = (c[k][i] / 100 for k in ('objRefacc', 'objBgo', 'objAcc', 'objTotal'))
+        res_r, res_b, res_a, res_t = (c[k][i] / 100 for k in ('resRefacc', 'resBgo', 'resAcc', 'resTotal'))
+        ws.append([
+            i + 1, '', '', c['CLIENT_NUM'][i], c['clientName'][i], c['sucursal'][i],
+            c['asesor'][i], c['zona'][i], c['ESTATUS'][i],
+            obj_r, obj_b, obj_a, obj_t,
+            res_r, _pct(res_r, obj_r), res_b, _pct(res_b, obj_b), res_a, _pct(res_a, obj_a),
+            res_t, _pct(res_t, obj_t), c['pedidos'][i] / 100,
+        ])
+
+    wb.save(ruta)
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generar un Excel 'Avance semanal' sintético")
+    parser.add_argument("filas", type=int, help="Número de sucursales")
+    parser.add_argument("-o", "--salida", help="Archivo de salida (por defecto avance_<filas>.xlsx)")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    ruta = args.salida or f"avance_{args.filas}.xlsx"
+    generar_excel(ruta, args.filas, args.semilla)
+    print(f"✅ {ruta} ({args.filas:,} sucursales)")
+
+
+if __name__ == "__main__":
+    main()
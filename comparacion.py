@@ -0,0 +1,139 @@
+# ═══════════════════════════════════════════════════════════════════
+# COMPARACIÓN ENTRE SNAPSHOTS (SEMANA ANTERIOR)
+# ═══════════════════════════════════════════════════════════════════
+#
+# Une dos snapshots por (cliente, sucursal) y calcula el cambio de
+# cada columna obj*/res*/pedidos en una sola operación vectorizada.
+#
+# La llave de cada sucursal es un hash uint64 de (cliente, sucursal),
+# calculado una vez por snapshot. La unión es un lookup en un índice
+# hash (pd.Index.get_indexer), así que el costo crece linealmente con
+# el número de sucursales y se puede repetir sobre meses de snapshots.
+#
+# huellas_clientes da un hash por cliente de todas sus sucursales y
+# montos: si no cambia entre dos versiones, sus números son los mismos
+# (lo usa el dashboard para no refrescar sesiones sin cambios).
+#
+# USO:
+#     python comparacion.py                    -> publicado vs semana anterior
+#     python comparacion.py VERSION_A VERSION_B -o cambios.csv
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from modelo import cargar_df
+from snapshots import COLUMNAS_DINERO, version_publicada, versiones
+
+DIAS_COMPARACION = 7
+
+
+def fecha_version(version):
+    """Fecha de un snapshot a partir de su nombre (AAAAMMDD-HHMMSS-hash)."""
+    return datetime.strptime(version[:15], "%Y%m%d-%H%M%S")
+
+
+def snapshot_anterior(version, dias=DIAS_COMPARACION):
+    """Versión con la que se compara `version`.
+
+    La más reciente con al menos `dias` de antigüedad; None mientras no
+    haya ninguna tan vieja (la de hace unos minutos no es "la semana
+    anterior").
+    """
+    if version is None:
+        return None
+    limite = fecha_version(version) - timedelta(days=dias)
+    candidatas = [v for v in versiones() if v < version and fecha_version(v) <= limite]
+    return candidatas[-1] if candidatas else None
+
+
+def llaves(df):
+    """Llave uint64 por sucursal: hash de (clientName, sucursal)."""
+    return pd.util.hash_pandas_object(df[['clientName', 'sucursal']], index=False).to_numpy()
+
+
+def huellas_clientes(df):
+    """Huella uint64 por cliente (Series indexada por nombre) de sus sucursales y montos.
+
+    Requiere el df ordenado por cliente (modelo.construir_df): suma, con
+    desbordamiento, el hash de cada renglón de cada bloque de cliente.
+    """
+    if df.empty:
+        return pd.Series(dtype='uint64')
+    filas = pd.util.hash_pandas_object(df[['sucursal'] + COLUMNAS_DINERO], index=False).to_numpy()
+    codigos = df['clientName'].cat.codes.to_numpy()
+    inicios = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]])
+    return pd.Series(np.add.reduceat(filas, inicios),
+                     index=df['clientName'].cat.categories[codigos[inicios]], dtype='uint64')
+
+
+def comparar(df_actual, df_anterior, llaves_actual=None, llaves_anterior=None):
+    """Cambio de cada columna de dinero, alineado a los renglones de `df_actual`.
+
+    Regresa un DataFrame con el mismo índice que `df_actual`, una columna
+    por cada COLUMNAS_DINERO (actual - anterior, en centavos) y 'nueva'
+    (True si la sucursal no existía en el snapshot anterior; su cambio es
+    su valor completo).
+    """
+    if llaves_actual is None:
+        llaves_actual = llaves(df_actual)
+    if llaves_anterior is None:
+        llaves_anterior = llaves(df_anterior)
+
+    anterior = df_anterior[COLUMNAS_DINERO].to_numpy()
+    indice = pd.Index(llaves_anterior)
+    if not indice.is_unique:
+        # Sucursal repetida en el Excel: se suman sus renglones
+        agrupado = pd.DataFrame(anterior).groupby(llaves_anterior).sum()
+        anterior, indice = agrupado.to_numpy(), agrupado.index
+
+    posiciones = indice.get_indexer(llaves_actual)
+    nueva = posiciones < 0
+    if len(anterior):
+        valores_anteriores = anterior[np.where(nueva, 0, posiciones)]
+        valores_anteriores[nueva] = 0
+    else:
+        valores_anteriores = np.zeros((len(posiciones), len(COLUMNAS_DINERO)), dtype='int64')
+
+    cambios = pd.DataFrame(
+        df_actual[COLUMNAS_DINERO].to_numpy() - valores_anteriores,
+        columns=COLUMNAS_DINERO, index=df_actual.index,
+    )
+    cambios['nueva'] = nueva
+    return cambios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cambios por sucursal entre dos snapshots")
+    parser.add_argument("actual", nargs="?", help="Versión actual (por defecto, la publicada)")
+    parser.add_argument("anterior", nargs="?", help="Versión anterior (por defecto, la de hace una semana)")
+    parser.add_argument("-o", "--salida", help="Guardar cambios en CSV (montos en pesos)")
+    args = parser.parse_args()
+
+    actual = args.actual or version_publicada()
+    anterior = args.anterior or snapshot_anterior(actual)
+    if anterior is None:
+        print("❌ ERROR: No hay un snapshot anterior para comparar")
+        raise SystemExit(1)
+
+    df_actual, _ = cargar_df(actual)
+    df_anterior, _ = cargar_df(anterior)
+    cambios = comparar(df_actual, df_anterior)
+
+    print(f"📊 {actual} vs {anterior}")
+    print(f"   {int(cambios['nueva'].sum())} sucursales nuevas")
+    print(f"   Cambio en resultado total: ${cambios['resTotal'].sum() / 100:,.0f}")
+
+    if args.salida:
+        salida = pd.concat([df_actual[['clientName', 'sucursal']], cambios[COLUMNAS_DINERO] / 100,
+                            cambios[['nueva']]], axis=1)
+        salida.to_csv(args.salida, index=False, encoding='utf-8-sig')
+        print(f"📝 {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
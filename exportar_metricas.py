@@ -0,0 +1,100 @@
+# ═══════════════════════════════════════════════════════════════════
+# MÉTRICAS DE TODOS LOS CLIENTES SIN ABRIR EL DASHBOARD
+# ═══════════════════════════════════════════════════════════════════
+#
+# Calcula lo mismo que muestra el dashboard (objetivo, resultado,
+# cumplimiento y descuento) para todos los clientes y todas las
+# sucursales del snapshot publicado:
+#   - clientes:   un solo groupby (metricas.agregados_clientes) y
+#                 porcentajes/descuento vectorizados sobre los totales
+#   - sucursales: operaciones por columna sobre el DataFrame completo
+#
+# Escribe clientes.<ext> y sucursales.<ext> (montos en pesos).
+#
+# USO:
+#     python exportar_metricas.py
+#     python exportar_metricas.py --formato parquet --salida reportes/
+#     python exportar_metricas.py --version 20260105-093000-abcdef123456
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from metricas import (CENTAVOS, DESCUENTO_BASE, DESCUENTO_MAXIMO, agregados_clientes, califica_descuento,
+                      porcentajes)
+from modelo import cargar_df
+from snapshots import COLUMNAS_DINERO, version_publicada
+
+FORMATOS = ['csv', 'json', 'parquet']
+
+
+def _agregar_metricas(tabla):
+    """Agrega pct_* y descuento a una tabla con las columnas de dinero en centavos."""
+    tabla['pct_refacc'] = porcentajes(tabla['resRefacc'], tabla['objRefacc'])
+    tabla['pct_bgo'] = porcentajes(tabla['resBgo'], tabla['objBgo'])
+    tabla['pct_total'] = porcentajes(tabla['resTotal'], tabla['objTotal'])
+    tiene_35 = califica_descuento(tabla['resRefacc'], tabla['objRefacc'], tabla['resBgo'], tabla['objBgo'],
+                                  tabla['resTotal'], tabla['objTotal'])
+    tabla['descuento'] = np.where(tiene_35, DESCUENTO_MAXIMO, DESCUENTO_BASE)
+    return tabla
+
+
+def metricas_clientes(df):
+    """Una fila por cliente con totales (centavos), porcentajes y descuento."""
+    tabla = agregados_clientes(df)
+    tabla.insert(0, 'sucursales', df.groupby('clientName', observed=True, sort=True).size())
+    return _agregar_metricas(tabla).reset_index()
+
+
+def metricas_sucursales(df):
+    """Una fila por sucursal, con las mismas métricas calculadas por sucursal."""
+    tabla = df[['CLIENT_NUM', 'clientName', 'sucursal', 'asesor', 'zona'] + COLUMNAS_DINERO]
+    return _agregar_metricas(tabla.copy())
+
+
+def _en_pesos(tabla):
+    tabla = tabla.copy()
+    for col in COLUMNAS_DINERO:
+        tabla[col] = tabla[col] / CENTAVOS
+    return tabla
+
+
+def escribir(tabla, ruta, formato):
+    if formato == 'csv':
+        tabla.to_csv(ruta, index=False, encoding='utf-8-sig')
+    elif formato == 'json':
+        tabla.to_json(ruta, orient='records', force_ascii=False, indent=1)
+    else:
+        tabla.to_parquet(ruta, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Métricas de todos los clientes y sucursales")
+    parser.add_argument("--formato", choices=FORMATOS, default='csv')
+    parser.add_argument("--salida", default='.', help="Carpeta de salida")
+    parser.add_argument("--version", help="Snapshot a usar (por defecto, el publicado)")
+    args = parser.parse_args()
+
+    if args.formato == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("❌ ERROR: Para Parquet instala pyarrow (pip install pyarrow)")
+            raise SystemExit(1)
+
+    version = args.version or version_publicada()
+    df, _ = cargar_df(version)
+    salida = Path(args.salida)
+    salida.mkdir(parents=True, exist_ok=True)
+
+    for nombre, tabla in [('clientes', metricas_clientes(df)), ('sucursales', metricas_sucursales(df))]:
+        ruta = salida / f"{nombre}.{args.formato}"
+        escribir(_en_pesos(tabla), ruta, args.formato)
+        print(f"✅ {ruta} ({len(tabla):,} filas)")
+
+
+if __name__ == "__main__":
+    main()
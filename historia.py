@@ -0,0 +1,128 @@
+# ═══════════════════════════════════════════════════════════════════
+# HISTORIA DIARIA POR SUCURSAL (TENDENCIAS)
+# ═══════════════════════════════════════════════════════════════════
+#
+# Serie de resTotal de cada sucursal en los últimos DIAS_HISTORIA días,
+# tomada de los snapshots guardados (el último de cada día). Los
+# snapshots se alinean con las llaves hash de comparacion.py.
+#
+# La serie se reduce a lo más PUNTOS_TENDENCIA puntos por sucursal con
+# cubetas fijas de días, quedándose con el último valor de cada cubeta
+# (resTotal es acumulado del periodo, así que el último valor conserva
+# la forma de la curva). La reducción es una sola indexación de la
+# matriz sucursales x días, no un ciclo por sucursal.
+#
+# El resultado se guarda en snapshots/historia/<versión>.npz (pesos,
+# float32) y se calcula una sola vez por versión, al publicar
+# (actualizar_datos.py; también es una etapa de pipeline.py). El
+# dashboard solo lo lee: sin archivo no hay tendencias.
+#
+# USO:
+#     python historia.py                  -> historia del snapshot publicado
+#     python historia.py VERSION
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+from datetime import timedelta
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from comparacion import fecha_version, llaves
+from metricas import CENTAVOS
+from modelo import construir_df
+from snapshots import DIRECTORIO, escribir_atomico, leer_snapshot, version_publicada, versiones
+
+DIRECTORIO_HISTORIA = DIRECTORIO / "historia"
+DIAS_HISTORIA = 90
+PUNTOS_TENDENCIA = 30
+
+
+def versiones_diarias(version, dias=DIAS_HISTORIA):
+    """Último snapshot de cada día en la ventana que termina en `version`, del más antiguo al más reciente."""
+    if version is None:
+        return []
+    limite = (fecha_version(version) - timedelta(days=dias - 1)).date()
+    por_dia = {}
+    for v in versiones():
+        if v > version:
+            break
+        dia = fecha_version(v).date()
+        if dia >= limite:
+            por_dia[dia] = v
+    return list(por_dia.values())
+
+
+def reducir(series, puntos=PUNTOS_TENDENCIA):
+    """Columnas de `series` (sucursales x días) reducidas a `puntos` cubetas: último día de cada una."""
+    dias = series.shape[1]
+    if dias <= puntos:
+        return series
+    cortes = np.linspace(0, dias, puntos + 1).astype(int)[1:] - 1
+    return series[:, cortes]
+
+
+def calcular(version, dias=DIAS_HISTORIA, puntos=PUNTOS_TENDENCIA):
+    """{'fechas': días (AAAA-MM-DD), 'series': resTotal en pesos por sucursal}.
+
+    Las filas de 'series' siguen el orden de construir_df de `version`;
+    NaN donde la sucursal no existía ese día.
+    """
+    diarias = versiones_diarias(version, dias)
+    if not diarias:
+        return {'fechas': np.array([], dtype='U10'), 'series': np.zeros((0, 0), dtype='float32')}
+
+    actual = llaves(construir_df(leer_snapshot(version)['columnas']))
+    series = np.full((len(actual), len(diarias)), np.nan, dtype='float32')
+    for j, v in enumerate(diarias):
+        df = construir_df(leer_snapshot(v)['columnas'])
+        resultado = pd.Series(df['resTotal'].to_numpy(), index=llaves(df))
+        if not resultado.index.is_unique:
+            resultado = resultado.groupby(level=0).sum()
+        series[:, j] = resultado.reindex(actual).to_numpy(dtype='float64') / CENTAVOS
+
+    elegidas = reducir(np.arange(len(diarias))[None, :], puntos)[0]
+    fechas = np.array([fecha_version(diarias[j]).strftime('%Y-%m-%d') for j in elegidas], dtype='U10')
+    return {'fechas': fechas, 'series': reducir(series, puntos)}
+
+
+def ruta_historia(version):
+    return DIRECTORIO_HISTORIA / f"{version}.npz"
+
+
+def guardar(version, historia):
+    buffer = BytesIO()
+    np.savez_compressed(buffer, **historia)
+    escribir_atomico(ruta_historia(version), buffer.getvalue())
+    return ruta_historia(version)
+
+
+def leer(version):
+    """Historia guardada de `version`, o None si no hay (no se calcula aquí)."""
+    if version is None:
+        return None
+    try:
+        with np.load(ruta_historia(version)) as datos:
+            return {'fechas': datos['fechas'], 'series': datos['series']}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historia diaria de resTotal por sucursal")
+    parser.add_argument("version", nargs="?", help="Versión (por defecto, la publicada)")
+    args = parser.parse_args()
+
+    version = args.version or version_publicada()
+    if version is None:
+        print("❌ ERROR: No hay snapshots publicados")
+        raise SystemExit(1)
+    historia = calcular(version)
+    ruta = guardar(version, historia)
+    print(f"✅ {ruta}: {historia['series'].shape[0]} sucursales x {len(historia['fechas'])} puntos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# ═══════════════════════════════════════════════════════════════════
+# CONTABILIDAD DE MEMORIA (PROCESO Y SESIONES)
+# ═══════════════════════════════════════════════════════════════════
+#
+# Para dimensionar réplicas con números reales:
+#   - proceso:  RSS actual y pico del proceso de Streamlit
+#   - sesiones: bytes que cada sesión retiene en st.session_state
+#               (PDFs generados, valores de widgets...)
+#
+# Cada sesión se registra al final de su rerun (registrar_sesion); las
+# que no vuelven a registrarse en EXPIRA_SESION segundos se consideran
+# cerradas.
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+EXPIRA_SESION = 15 * 60
+
+# session_id -> (último registro, bytes retenidos)
+_sesiones = {}
+_candado = threading.Lock()
+
+
+def tamano(objeto):
+    """Bytes aproximados de un objeto, incluyendo su contenido."""
+    if isinstance(objeto, (bytes, bytearray, memoryview)):
+        return len(objeto)
+    if isinstance(objeto, (pd.DataFrame, pd.Series)):
+        uso = objeto.memory_usage(deep=True)
+        return int(uso.sum() if isinstance(objeto, pd.DataFrame) else uso)
+    if isinstance(objeto, np.ndarray):
+        return objeto.nbytes
+    if isinstance(objeto, dict):
+        return sys.getsizeof(objeto) + sum(tamano(k) + tamano(v) for k, v in objeto.items())
+    if isinstance(objeto, (list, tuple, set, frozenset)):
+        return sys.getsizeof(objeto) + sum(tamano(v) for v in objeto)
+    return sys.getsizeof(objeto)
+
+
+def memoria_proceso():
+    """(RSS actual, pico de RSS) del proceso en bytes; None si no se puede leer."""
+    pico = None
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        pico *= 1 if sys.platform == 'darwin' else 1024  # Linux reporta KB
+    try:
+        with open('/proc/self/statm') as f:
+            actual = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        actual = None
+    return actual, pico
+
+
+def registrar_sesion(session_id, estado):
+    """Registra los bytes que retiene una sesión (`estado` = st.session_state)."""
+    retenidos = sum(tamano(valor) for _, valor in estado.items())
+    with _candado:
+        _sesiones[session_id] = (time.monotonic(), retenidos)
+    return retenidos
+
+
+def sesiones_activas():
+    """{session_id: bytes} de las sesiones registradas recientemente."""
+    limite = time.monotonic() - EXPIRA_SESION
+    with _candado:
+        for session_id in [s for s, (visto, _) in _sesiones.items() if visto < limite]:
+            del _sesiones[session_id]
+        return {s: retenidos for s, (_, retenidos) in _sesiones.items()}
+
+
+def reporte():
+    """Resumen en bytes: proceso y sesiones activas."""
+    actual, pico = memoria_proceso()
+    sesiones = sesiones_activas()
+    por_sesion = list(sesiones.values())
+    return {
+        'proceso_rss': actual,
+        'proceso_pico': pico,
+        'sesiones': len(sesiones),
+        'sesiones_total': sum(por_sesion),
+        'sesion_maxima': max(por_sesion, default=0),
+        'sesion_promedio': sum(por_sesion) // len(por_sesion) if por_sesion else 0,
+    }
@@ -0,0 +1,147 @@
+# ═══════════════════════════════════════════════════════════════════
+# MÉTRICAS DE CUMPLIMIENTO
+# ═══════════════════════════════════════════════════════════════════
+#
+# Los montos se manejan en centavos enteros (int64). Las sumas son
+# exactas y las decisiones de umbral (100% para el descuento del 35%,
+# 70% y 50% del semáforo) se comparan en enteros:
+#     res * 100 >= obj * umbral
+# Los porcentajes en float solo se usan para mostrar.
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import numpy as np
+import pandas as pd
+
+from snapshots import COLUMNAS_DINERO
+
+CENTAVOS = 100
+
+# Colores
+ROJO = "#dc2626"
+VERDE = "#22c55e"
+AMARILLO = "#eab308"
+NARANJA = "#f97316"
+AZUL = "#3b82f6"
+
+DESCUENTO_MAXIMO = 35
+DESCUENTO_BASE = 20
+
+
+def color_semaforo(porcentaje):
+    if porcentaje >= 100: return VERDE
+    if porcentaje >= 70: return AMARILLO
+    if porcentaje >= 50: return NARANJA
+    return "#ef4444"
+
+
+def a_centavos(valores):
+    """Convierte pesos (float o texto numérico) a centavos int64."""
+    pesos = pd.to_numeric(pd.Series(valores), errors='coerce').fillna(0)
+    return (pesos * CENTAVOS).round().astype('int64')
+
+
+def pesos(centavos):
+    """Centavos -> pesos (float), para gráficas."""
+    return centavos / CENTAVOS
+
+
+def formato_pesos(centavos):
+    return f"${centavos / CENTAVOS:,.0f}"
+
+
+def formato_cambio(centavos):
+    """Cambio en pesos con signo: +$1,234 / -$1,234."""
+    signo = "-" if centavos < 0 else "+"
+    return f"{signo}${abs(centavos) / CENTAVOS:,.0f}"
+
+
+def porcentaje(res, obj):
+    """Porcentaje de cumplimiento para mostrar; 0 si no hay objetivo.
+
+    El numerador se multiplica antes de dividir para que los cortes exactos
+    (p. ej. res == obj) den exactamente 100.0.
+    """
+    return (res * 100 / obj) if obj > 0 else 0
+
+
+def porcentajes(res, obj):
+    """porcentaje() sobre arreglos/Series: mismo cálculo, 0 donde no hay objetivo."""
+    res, obj = np.asarray(res), np.asarray(obj)
+    return np.divide(res * 100, obj, out=np.zeros(len(obj)), where=obj > 0)
+
+
+def cumple(res, obj, umbral=100):
+    """True si res alcanza `umbral`% de obj, comparando en enteros.
+
+    Funciona con escalares o con Series/arrays (operadores &, no `and`).
+    """
+    return (obj > 0) & (res * 100 >= obj * umbral)
+
+
+def califica_descuento(res_refacc, obj_refacc, res_bgo, obj_bgo, res_total, obj_total):
+    """35% solo si se cubre el 100% de cada categoría y del total."""
+    return (cumple(res_total, obj_total)
+            & cumple(res_refacc, obj_refacc)
+            & cumple(res_bgo, obj_bgo))
+
+
+def metricas_desde_totales(totales):
+    """Porcentajes y descuento a partir de los totales en centavos.
+
+    `totales` tiene las llaves obj_*/res_*/pedidos que regresa calcular_metricas.
+    """
+    m = dict(totales)
+    m['pct_refacc'] = porcentaje(m['res_refacc'], m['obj_refacc'])
+    m['pct_bgo'] = porcentaje(m['res_bgo'], m['obj_bgo'])
+    m['pct_total'] = porcentaje(m['res_total'], m['obj_total'])
+
+    if califica_descuento(m['res_refacc'], m['obj_refacc'], m['res_bgo'], m['obj_bgo'],
+                          m['res_total'], m['obj_total']):
+        m['descuento'] = DESCUENTO_MAXIMO
+    else:
+        m['descuento'] = DESCUENTO_BASE
+    return m
+
+
+def calcular_metricas(df_cliente):
+    """Totales, porcentajes y descuento de un conjunto de sucursales."""
+    sumas = df_cliente[COLUMNAS_DINERO].sum()
+    return metricas_desde_totales({
+        'obj_refacc': int(sumas['objRefacc']), 'obj_bgo': int(sumas['objBgo']),
+        'obj_acc': int(sumas['objAcc']), 'obj_total': int(sumas['objTotal']),
+        'res_refacc': int(sumas['resRefacc']), 'res_bgo': int(sumas['resBgo']),
+        'res_acc': int(sumas['resAcc']), 'res_total': int(sumas['resTotal']),
+        'pedidos': int(sumas['pedidos']),
+    })
+
+
+def agregados_clientes(df):
+    """Sumas en centavos por cliente (un renglón por cliente) en un solo groupby."""
+    return df.groupby('clientName', observed=True, sort=True)[COLUMNAS_DINERO].sum()
+
+
+def tabla_sucursales(df_cliente, cambios=None, tendencia=None):
+    """Tabla 'Detalle por Sucursal' con montos formateados.
+
+    Con `cambios` (comparacion.comparar, alineado a df_cliente) se agrega
+    el cambio del resultado total contra el snapshot anterior. Con
+    `tendencia` (historia.py, una fila por sucursal) se agrega la lista de
+    puntos de resTotal para una gráfica de línea por renglón.
+    """
+    # Sin .copy(): con copy-on-write solo se copian las columnas que se reemplazan
+    df_tabla = df_cliente[['sucursal', 'objRefacc', 'resRefacc', 'objBgo', 'resBgo', 'objTotal', 'resTotal']]
+    pct_cumpl = (df_tabla['resTotal'] * 100 / df_tabla['objTotal']).where(df_tabla['objTotal'] > 0, 0)
+    df_tabla['% Cumpl.'] = pct_cumpl.round(0).astype(int).astype(str) + '%'
+
+    # Formatear columnas como pesos
+    for col in ['objRefacc', 'resRefacc', 'objBgo', 'resBgo', 'objTotal', 'resTotal']:
+        df_tabla[col] = df_tabla[col].apply(formato_pesos)
+
+    df_tabla.columns = ['Sucursal', 'Obj Refacc', 'Res Refacc', 'Obj BGO', 'Res BGO', 'Obj Total', 'Res Total', '% Cumpl.']
+    if cambios is not None:
+        cambio = cambios['resTotal'].apply(formato_cambio)
+        df_tabla['Cambio vs semana anterior'] = cambio.where(~cambios['nueva'], 'Nueva')
+    if tendencia is not None:
+        df_tabla['Tendencia'] = [fila[~np.isnan(fila)].round().tolist() for fila in tendencia.astype('float64')]
+    return df_tabla
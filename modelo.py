@@ -0,0 +1,166 @@
+# ═══════════════════════════════════════════════════════════════════
+# MODELO EN MEMORIA
+# ═══════════════════════════════════════════════════════════════════
+#
+# Esquema explícito que se aplica al cargar un snapshot:
+#   - Dimensiones (cliente, sucursal, asesor, ...) como category
+#   - Montos en centavos int64 (ver metricas.py)
+#   - zona reducida a int8
+#   - Filas ordenadas por cliente (orden estable): las sucursales de un
+#     cliente quedan contiguas y sucursales_cliente las regresa como una
+#     vista (iloc sobre un rango), sin copiar ni recorrer todo el df
+#
+# Reporte de memoria (antes/después, 454 filas y sintéticos):
+#     python modelo.py
+#     python modelo.py 454 100000 1000000
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from snapshots import COLUMNAS_DINERO, leer_snapshot, version_publicada
+
+DIMENSIONES = ['CLIENT_NUM', 'clientName', 'sucursal', 'asesor', 'ESTATUS']
+
+ESQUEMA = {
+    **{col: 'category' for col in DIMENSIONES},
+    'zona': 'int8',
+    **{col: 'int64' for col in COLUMNAS_DINERO},
+}
+
+# Valor para columnas que no existían en snapshots anteriores
+_DEFAULTS = {'CLIENT_NUM': '', 'ESTATUS': '', 'zona': 1}
+
+
+def construir_df(columnas):
+    """DataFrame tipado a partir de las columnas de un snapshot."""
+    n = len(columnas['clientName'])
+    series = {}
+    for col, tipo in ESQUEMA.items():
+        valores = columnas.get(col)
+        if valores is None:
+            valores = [_DEFAULTS.get(col, 0)] * n
+        series[col] = pd.Series(valores, dtype=tipo)
+    df = pd.DataFrame(series)
+    # Las categorías quedan en orden alfabético: ordenar por código agrupa a cada cliente
+    orden = np.argsort(df['clientName'].cat.codes.to_numpy(), kind='stable')
+    return df.take(orden).reset_index(drop=True)
+
+
+def sucursales_cliente(df, cliente):
+    """Sucursales de `cliente` como vista de `df` (de construir_df), sin copiar.
+
+    Búsqueda binaria sobre los códigos ordenados: O(log n) por visita en
+    lugar de comparar todas las filas. Con copy-on-write cualquier
+    modificación de la vista copia solo lo modificado, nunca el df compartido.
+    """
+    nombres = df['clientName'].array
+    try:
+        codigo = nombres.categories.get_loc(cliente)
+    except KeyError:
+        return df.iloc[0:0]
+    # Mismo dtype que los códigos (int16/int32) para que numpy no los convierta
+    limites = np.array([codigo, codigo + 1], dtype=nombres.codes.dtype)
+    inicio, fin = nombres.codes.searchsorted(limites)
+    return df.iloc[inicio:fin]
+
+
+def cargar_df(version=None):
+    """Snapshot publicado (o `version`) como DataFrame tipado + lista de clientes."""
+    snapshot = leer_snapshot(version if version is not None else version_publicada())
+    return construir_df(snapshot['columnas']), snapshot['clientes']
+
+
+# ═══════════════════════════════════════════════════════════════════
+# DATOS SINTÉTICOS Y REPORTE DE MEMORIA
+# ═══════════════════════════════════════════════════════════════════
+
+ASESORES = ['LIDIA', 'ERICK', 'ITZEL', 'ADRIAN', 'MARIANA', 'JORGE', 'KARLA', 'LUIS']
+
+
+def datos_sinteticos(n, semilla=0):
+    """Columnas de snapshot con `n` sucursales y proporciones parecidas a las reales.
+
+    ~1.8 sucursales por cliente, sucursales únicas, montos en centavos.
+    """
+    rng = np.random.default_rng(semilla)
+    n_clientes = max(1, int(n / 1.83))
+    cliente = np.sort(rng.integers(0, n_clientes, n))
+
+    obj_refacc = rng.integers(10, 300, n) * 100_000
+    obj_bgo = rng.integers(2, 40, n) * 100_000
+    obj_acc = rng.integers(0, 10, n) * 100_000
+    avance = rng.beta(2, 2, (3, n)) * 1.4
+    res_refacc = (obj_refacc * avance[0]).astype('int64')
+    res_bgo = (obj_bgo * avance[1]).astype('int64')
+    res_acc = (obj_acc * avance[2]).astype('int64')
+
+    return {
+        'CLIENT_NUM': [f'C{c:06d}' for c in cliente],
+        'clientName': [f'CLIENTE {c:06d}' for c in cliente],
+        'sucursal': [f'BAJAJ SUCURSAL {i:07d}' for i in range(n)],
+        'asesor': [ASESORES[c % len(ASESORES)] for c in cliente],
+        'zona': (cliente % 3 + 1).tolist(),
+        'ESTATUS': rng.choice(['ACTIVO', 'NUEVO', 'BAJA'], n, p=[0.9, 0.08, 0.02]).tolist(),
+        'objRefacc': obj_refacc.tolist(),
+        'objBgo': obj_bgo.tolist(),
+        'objAcc': obj_acc.tolist(),
+        'objTotal': (obj_refacc + obj_bgo + obj_acc).tolist(),
+        'resRefacc': res_refacc.tolist(),
+        'resBgo': res_bgo.tolist(),
+        'resAcc': res_acc.tolist(),
+        'resTotal': (res_refacc + res_bgo + res_acc).tolist(),
+        'pedidos': (res_refacc * rng.uniform(0, 2, n)).astype('int64').tolist(),
+    }
+
+
+def df_sin_esquema(columnas):
+    """Cómo se cargaba antes: pd.DataFrame(DATOS) con montos en pesos float."""
+    columnas = dict(columnas)
+    for col in COLUMNAS_DINERO:
+        if col in columnas:
+            columnas[col] = [v / 100 for v in columnas[col]]
+    return pd.DataFrame(columnas)
+
+
+def reporte_memoria(tamanos):
+    """Lista de dicts con bytes antes/después para cada tamaño."""
+    filas = []
+    for n in tamanos:
+        if n is None:
+            columnas = leer_snapshot(version_publicada())['columnas']
+            etiqueta = 'snapshot publicado'
+        else:
+            columnas = datos_sinteticos(n)
+            etiqueta = 'sintético'
+        antes = df_sin_esquema(columnas).memory_usage(deep=True).sum()
+        despues = construir_df(columnas).memory_usage(deep=True).sum()
+        filas.append({
+            'datos': etiqueta,
+            'filas': len(columnas['clientName']),
+            'antes_bytes': int(antes),
+            'despues_bytes': int(despues),
+            'ahorro_pct': round((1 - despues / antes) * 100, 1),
+        })
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporte de memoria del modelo tipado")
+    parser.add_argument("filas", nargs="*", type=int,
+                        help="Tamaños sintéticos (por defecto 100000 y 1000000)")
+    args = parser.parse_args()
+
+    tamanos = [None] + (args.filas or [100_000, 1_000_000])
+    print(f"{'Datos':<20}{'Filas':>10}{'Antes (MB)':>14}{'Después (MB)':>15}{'Ahorro':>9}")
+    for fila in reporte_memoria(tamanos):
+        print(f"{fila['datos']:<20}{fila['filas']:>10,}"
+              f"{fila['antes_bytes'] / 1e6:>14.2f}{fila['despues_bytes'] / 1e6:>15.2f}"
+              f"{fila['ahorro_pct']:>8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
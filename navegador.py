@@ -0,0 +1,272 @@
+# ═══════════════════════════════════════════════════════════════════
+# CAMBIO DE CLIENTE EN EL NAVEGADOR (VISTA INTERNA)
+# ═══════════════════════════════════════════════════════════════════
+#
+# Para revisar muchos clientes seguidos sin una vuelta al servidor por
+# cada uno: los totales por cliente y las sucursales de toda la versión
+# se mandan UNA vez al navegador y una página HTML/JS (st.iframe)
+# dibuja encabezado, KPIs, avance por categoría, gráficas y tabla del
+# cliente elegido.
+#
+# Los datos van en columnas (una lista por campo, montos en centavos
+# enteros), comprimidos con gzip y en base64; el navegador los abre con
+# DecompressionStream. El descuento se decide aquí (califica_descuento,
+# en enteros); los porcentajes y colores se calculan igual que en
+# metricas.py solo para mostrar.
+#
+# Las secciones del servidor (comparativo, semana anterior, tendencias,
+# descargas, simulador) siguen en la vista normal del selector.
+#
+# USO:
+#     python navegador.py                       -> navegador.html del snapshot publicado
+#     python navegador.py --version VERSION -o vista.html
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import base64
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+
+from comparacion import fecha_version
+from metricas import AZUL, ROJO, VERDE, DESCUENTO_BASE, DESCUENTO_MAXIMO, califica_descuento, color_semaforo
+from modelo import construir_df
+from snapshots import COLUMNAS_DINERO, leer_snapshot, version_publicada
+
+COLUMNAS_SUCURSAL = ['objRefacc', 'resRefacc', 'objBgo', 'resBgo', 'objTotal', 'resTotal']
+
+# Colores del iframe (no hereda el tema de Streamlit)
+FONDOS = {
+    'light': {'fondo': '#ffffff', 'texto': '#0f172a', 'suave': '#64748b', 'borde': '#e2e8f0'},
+    'dark': {'fondo': '#0e1117', 'texto': '#fafafa', 'suave': '#94a3b8', 'borde': '#334155'},
+}
+
+
+def datos(df, version=None):
+    """Totales por cliente y sucursales de `df` en columnas (montos en centavos).
+
+    Las sucursales de cada cliente son contiguas en construir_df: el
+    cliente i tiene las filas inicio[i]:inicio[i + 1].
+    """
+    codigos = df['clientName'].cat.codes.to_numpy()
+    inicios = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]]) if len(df) else np.array([], dtype=int)
+    sumas = {col: np.add.reduceat(df[col].to_numpy(), inicios) if len(df) else np.array([], dtype='int64')
+             for col in COLUMNAS_DINERO}
+    descuento = np.where(
+        califica_descuento(sumas['resRefacc'], sumas['objRefacc'], sumas['resBgo'], sumas['objBgo'],
+                           sumas['resTotal'], sumas['objTotal']),
+        DESCUENTO_MAXIMO, DESCUENTO_BASE,
+    )
+    sucursales = {'sucursal': df['sucursal'].astype(str).tolist()}
+    sucursales.update({col: df[col].tolist() for col in COLUMNAS_SUCURSAL})
+    return {
+        'fecha': f"{fecha_version(version):%d/%m/%Y %H:%M}" if version else None,
+        'clientes': df['clientName'].iloc[inicios].astype(str).tolist(),
+        'inicio': inicios.tolist() + [len(df)],
+        'descuento': descuento.tolist(),
+        'totales': {col: valores.tolist() for col, valores in sumas.items()},
+        'sucursales': sucursales,
+    }
+
+
+def comprimir(contenido):
+    """JSON compacto -> gzip -> base64 (texto para incrustar en la página)."""
+    crudo = json.dumps(contenido, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.b64encode(gzip.compress(crudo, compresslevel=9)).decode("ascii")
+
+
+def _json_script(valor):
+    # Dentro de <script>: que ningún texto cierre la etiqueta
+    return json.dumps(valor, ensure_ascii=False).replace("</", "<\\/")
+
+
+def pagina(comprimidos, tema=None, inicial=None):
+    """Página HTML completa; `comprimidos` es la salida de comprimir(datos(...))."""
+    colores = {
+        'rojo': ROJO, 'verde': VERDE, 'azul': AZUL,
+        # Mismos cortes que metricas.color_semaforo
+        'semaforo': [[corte, color_semaforo(corte)] for corte in (100, 70, 50)],
+        'semaforo_bajo': color_semaforo(0),
+        'descuento_maximo': DESCUENTO_MAXIMO,
+        **FONDOS.get(tema or 'light', FONDOS['light']),
+    }
+    return (PLANTILLA
+            .replace("__DATOS__", comprimidos)
+            .replace("__COLORES__", _json_script(colores))
+            .replace("__INICIAL__", _json_script(inicial)))
+
+
+PLANTILLA = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8">
+<style>
+body{font-family:"Source Sans Pro",sans-serif;margin:0;padding:4px}
+.barra{display:flex;gap:8px;align-items:center;margin-bottom:12px}
+.barra select{flex:1;padding:6px;font-size:15px}
+.barra button{padding:6px 12px;font-size:15px;cursor:pointer}
+.fila{display:flex;gap:16px;margin-bottom:16px}
+.kpi{flex:1}.kpi p{margin:0}.kpi .valor{font-size:32px}
+.tarjeta{flex:1;border-radius:15px;padding:20px}
+table{border-collapse:collapse;width:100%;font-size:14px}
+td,th{padding:4px 8px;text-align:right;white-space:nowrap}
+td:first-child,th:first-child{text-align:left}
+.barras{display:flex;align-items:flex-end;gap:24px;height:260px;padding:0 16px}
+.grupo{flex:1;display:flex;flex-direction:column;align-items:center;height:100%}
+.par{flex:1;display:flex;align-items:flex-end;gap:6px;width:100%}
+.col{flex:1;display:flex;flex-direction:column;justify-content:flex-end;align-items:center;height:100%;font-size:12px}
+.dona{width:220px;height:220px;border-radius:50%;margin:auto;display:flex;align-items:center;justify-content:center}
+.hueco{width:62%;height:62%;border-radius:50%;display:flex;align-items:center;justify-content:center;font-size:36px}
+</style></head>
+<body>
+<div class="barra">
+  <button id="previo" title="Cliente anterior (←)">◀</button>
+  <select id="selector"></select>
+  <button id="siguiente" title="Cliente siguiente (→)">▶</button>
+</div>
+<div id="vista">Cargando datos...</div>
+<script>
+const COLORES = __COLORES__;
+const INICIAL = __INICIAL__;
+const DATOS = "__DATOS__";
+
+async function abrir(texto) {
+  const bytes = Uint8Array.from(atob(texto), c => c.charCodeAt(0));
+  const flujo = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+  return JSON.parse(await new Response(flujo).text());
+}
+
+const pesos = c => "$" + Math.round(c / 100).toLocaleString("en-US");
+const porcentaje = (res, obj) => obj > 0 ? res * 100 / obj : 0;
+function semaforo(pct) {
+  for (const [corte, color] of COLORES.semaforo) if (pct >= corte) return color;
+  return COLORES.semaforo_bajo;
+}
+function escapar(texto) {
+  const div = document.createElement("div");
+  div.textContent = texto;
+  return div.innerHTML;
+}
+
+function avance(nombre, res, obj) {
+  const pct = porcentaje(res, obj), color = semaforo(pct);
+  return `<div style="margin-bottom:15px">
+    <div style="display:flex;justify-content:space-between">
+      <span><b>${nombre}</b></span>
+      <span style="color:${COLORES.suave}">${pesos(res)} / ${pesos(obj)}</span>
+      <span style="color:${color};font-weight:700">${pct.toFixed(0)}%</span>
+    </div>
+    <div style="background:#e2e8f0;border-radius:10px;height:25px;overflow:hidden">
+      <div style="background:${color};width:${Math.min(pct, 100)}%;height:100%;border-radius:10px"></div>
+    </div></div>`;
+}
+
+function barras(t) {
+  const maximo = Math.max(t.objRefacc, t.objBgo, t.resRefacc, t.resBgo, 1);
+  const columna = (valor, color) => `<div class="col">${pesos(valor)}
+    <div style="background:${color};width:100%;height:${valor * 85 / maximo}%"></div></div>`;
+  const grupo = (nombre, obj, res) => `<div class="grupo"><div class="par">
+    ${columna(obj, COLORES.azul)}${columna(res, semaforo(porcentaje(res, obj)))}</div><b>${nombre}</b></div>`;
+  return `<h4>Objetivo vs Resultado</h4><div class="barras">
+    ${grupo("REFACC", t.objRefacc, t.resRefacc)}${grupo("BGO", t.objBgo, t.resBgo)}</div>`;
+}
+
+function dona(t) {
+  const pct = porcentaje(t.resTotal, t.objTotal), relleno = Math.min(pct, 100);
+  return `<h4>Cumplimiento Global</h4>
+    <div class="dona" style="background:conic-gradient(${COLORES.verde} 0 ${relleno}%, #e2e8f0 ${relleno}% 100%)">
+    <div class="hueco" style="background:${COLORES.fondo}">${pct.toFixed(0)}%</div></div>`;
+}
+
+function tabla(s, inicio, fin) {
+  const filas = [];
+  for (let i = inicio; i < fin; i++) {
+    filas.push(`<tr style="border-top:1px solid ${COLORES.borde}"><td>${escapar(s.sucursal[i])}</td>
+      <td>${pesos(s.objRefacc[i])}</td><td>${pesos(s.resRefacc[i])}</td>
+      <td>${pesos(s.objBgo[i])}</td><td>${pesos(s.resBgo[i])}</td>
+      <td>${pesos(s.objTotal[i])}</td><td>${pesos(s.resTotal[i])}</td>
+      <td>${porcentaje(s.resTotal[i], s.objTotal[i]).toFixed(0)}%</td></tr>`);
+  }
+  return `<h3>📋 Detalle por Sucursal</h3><table><tr><th>Sucursal</th><th>Obj Refacc</th><th>Res Refacc</th>
+    <th>Obj BGO</th><th>Res BGO</th><th>Obj Total</th><th>Res Total</th><th>% Cumpl.</th></tr>${filas.join("")}</table>`;
+}
+
+function mostrar(datos, i) {
+  const t = {};
+  for (const col in datos.totales) t[col] = datos.totales[col][i];
+  const inicio = datos.inicio[i], fin = datos.inicio[i + 1];
+  const descuento = datos.descuento[i];
+  const colorDesc = descuento === COLORES.descuento_maximo ? COLORES.verde : COLORES.azul;
+  const kpi = (titulo, valor) => `<div class="kpi"><p>${titulo}</p><p class="valor">${valor}</p></div>`;
+  document.getElementById("vista").innerHTML = `
+    <div class="fila">
+      <div class="tarjeta" style="flex:3;background:linear-gradient(90deg, ${COLORES.rojo}, #991b1b)">
+        <h1 style="color:white;margin:0">🏍️ MOTODRIVE - Dashboard de Objetivos</h1>
+        <p style="color:rgba(255,255,255,0.8);margin:5px 0 0 0">Cliente: <b>${escapar(datos.clientes[i])}</b> | ${fin - inicio} sucursales</p>
+      </div>
+      <div class="tarjeta" style="background:#1e293b;text-align:center;border:2px solid ${colorDesc}">
+        <p style="color:#94a3b8;margin:0;font-size:14px">Descuento</p>
+        <p style="color:${colorDesc};margin:0;font-size:48px;font-weight:800">${descuento}%</p>
+      </div>
+    </div>
+    <div class="fila">
+      ${kpi("🎯 Objetivo", pesos(t.objTotal))}${kpi("💰 Resultado", pesos(t.resTotal))}
+      ${kpi("📊 Cumplimiento", porcentaje(t.resTotal, t.objTotal).toFixed(0) + "%")}${kpi("📦 Pedidos", pesos(t.pedidos))}
+    </div>
+    ${datos.fecha ? `<p style="color:${COLORES.suave}">Datos del ${datos.fecha}</p>` : ""}
+    <h3>📊 Avance por Categoría</h3>
+    ${avance("REFACCIONES", t.resRefacc, t.objRefacc)}${avance("BGO", t.resBgo, t.objBgo)}
+    <h3>📈 Visualizaciones</h3>
+    <div class="fila"><div style="flex:1">${barras(t)}</div><div style="flex:1">${dona(t)}</div></div>
+    ${tabla(datos.sucursales, inicio, fin)}`;
+}
+
+(async () => {
+  document.body.style.background = COLORES.fondo;
+  document.body.style.color = COLORES.texto;
+  const datos = await abrir(DATOS);
+  const selector = document.getElementById("selector");
+  selector.append(...datos.clientes.map((nombre, i) => new Option(nombre, i)));
+  selector.value = Math.max(0, datos.clientes.indexOf(INICIAL));
+  const ir = i => {
+    if (i < 0 || i >= datos.clientes.length) return;
+    selector.value = i;
+    mostrar(datos, i);
+  };
+  selector.onchange = () => ir(Number(selector.value));
+  document.getElementById("previo").onclick = () => ir(Number(selector.value) - 1);
+  document.getElementById("siguiente").onclick = () => ir(Number(selector.value) + 1);
+  document.addEventListener("keydown", e => {
+    if (e.target === selector) return;  // El select ya maneja sus flechas
+    if (e.key === "ArrowLeft") ir(Number(selector.value) - 1);
+    if (e.key === "ArrowRight") ir(Number(selector.value) + 1);
+  });
+  if (datos.clientes.length) ir(Number(selector.value));
+  else document.getElementById("vista").textContent = "Sin clientes en esta versión.";
+})();
+</script>
+</body></html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Página para cambiar de cliente en el navegador")
+    parser.add_argument("--version", help="Snapshot a usar (por defecto, el publicado)")
+    parser.add_argument("-o", "--salida", default="navegador.html", help="Archivo HTML de salida")
+    parser.add_argument("--tema", choices=sorted(FONDOS), default="light")
+    args = parser.parse_args()
+
+    version = args.version or version_publicada()
+    if version is None:
+        print("❌ ERROR: No hay snapshots publicados")
+        raise SystemExit(1)
+    contenido = datos(construir_df(leer_snapshot(version)['columnas']), version)
+    comprimidos = comprimir(contenido)
+    Path(args.salida).write_text(pagina(comprimidos, args.tema), encoding="utf-8")
+    print(f"✅ {args.salida}: {len(contenido['clientes'])} clientes, "
+          f"{len(contenido['sucursales']['sucursal'])} sucursales, {len(comprimidos) / 1024:,.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
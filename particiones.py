@@ -0,0 +1,213 @@
+# ═══════════════════════════════════════════════════════════════════
+# PARTICIONES POR CLIENTE
+# ═══════════════════════════════════════════════════════════════════
+#
+# Al publicar un snapshot se escribe además un archivo por cliente en
+# snapshots/particiones/<versión>/ (numpy .npz comprimido, columnas ya
+# tipadas) y un manifiesto.json con, por cliente: archivo, número de
+# sucursales, posición en el snapshot completo y huella
+# (comparacion.huellas_clientes). La carpeta se arma aparte y aparece
+# completa de una vez (os.replace).
+#
+# La página de un cliente solo necesita sus filas: cargar_cliente lee
+# únicamente su partición y guarda las últimas PARTICIONES_ABIERTAS en
+# un LRU. Así la memoria y el arranque del dashboard no crecen con el
+# número de clientes. Si una versión no tiene manifiesto (snapshots
+# anteriores a este cambio) el dashboard carga el snapshot completo.
+#
+# Las filas de cada partición conservan su índice del snapshot
+# completo (construir_df), así que historia.py y cualquier otro arreglo
+# por sucursal se indexan igual en los dos modos.
+#
+# USO:
+#     python particiones.py               -> particiona el snapshot publicado
+#     python particiones.py VERSION
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from comparacion import huellas_clientes
+from modelo import ESQUEMA, construir_df
+from snapshots import DIRECTORIO, leer_snapshot, version_publicada
+
+DIRECTORIO_PARTICIONES = DIRECTORIO / "particiones"
+MANIFIESTO = "manifiesto.json"
+_CATEGORIAS = "__categorias"
+PARTICIONES_ABIERTAS = 256
+
+_candado = threading.Lock()
+_abiertas = OrderedDict()      # (versión, cliente) -> DataFrame
+_manifiestos = OrderedDict()   # versión -> manifiesto
+
+
+def directorio_version(version):
+    return DIRECTORIO_PARTICIONES / version
+
+
+def _fsync_directorio(carpeta):
+    """fsync de una carpeta (sus entradas); en Windows no se puede abrir una carpeta y se omite."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(carpeta, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def escribir(version, columnas=None):
+    """Escribe las particiones y el manifiesto de `version`. Regresa el manifiesto.
+
+    Todo se escribe en una carpeta temporal (sin un fsync por archivo: con
+    decenas de miles de clientes eso domina la ingesta), se hace un solo
+    fsync de la carpeta y se cambia por la definitiva con os.replace: los
+    lectores ven la versión completa o ninguna.
+    """
+    if columnas is None:
+        columnas = leer_snapshot(version)['columnas']
+    df = construir_df(columnas)
+    huellas = huellas_clientes(df)
+
+    codigos = df['clientName'].cat.codes.to_numpy()
+    inicios = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]]) if len(df) else np.array([], dtype=int)
+    fines = np.r_[inicios[1:], len(df)]
+
+    # Arreglos numpy de todo el snapshot una sola vez; cada cliente es una rebanada
+    numericas = {col: df[col].to_numpy() for col, tipo in ESQUEMA.items() if tipo != 'category'}
+    categoricas = {col: (df[col].cat.codes.to_numpy(),
+                         np.asarray(df[col].cat.categories.astype(object), dtype=str))
+                   for col, tipo in ESQUEMA.items() if tipo == 'category'}
+    nombres = categoricas['clientName'][1][codigos[inicios]] if len(df) else []
+
+    DIRECTORIO_PARTICIONES.mkdir(parents=True, exist_ok=True)
+    temporal = Path(tempfile.mkdtemp(dir=DIRECTORIO_PARTICIONES, prefix=f".{version}.", suffix=".tmp"))
+    try:
+        clientes = {}
+        for numero, (inicio, fin) in enumerate(zip(inicios.tolist(), fines.tolist())):
+            cliente = str(nombres[numero])
+            archivo = f"{numero:06d}.npz"
+            arreglos = {col: valores[inicio:fin] for col, valores in numericas.items()}
+            for col, (codigos_col, categorias) in categoricas.items():
+                # Códigos + categorías del bloque: compacto y conserva los vacíos (código -1)
+                bloque = codigos_col[inicio:fin]
+                usadas = np.unique(bloque[bloque >= 0])
+                arreglos[col] = np.where(bloque >= 0, np.searchsorted(usadas, bloque), -1).astype('int32')
+                arreglos[f'{col}{_CATEGORIAS}'] = categorias[usadas]
+            np.savez_compressed(temporal / archivo, **arreglos)
+            clientes[cliente] = {'archivo': archivo, 'sucursales': fin - inicio, 'inicio': inicio,
+                                 'huella': str(huellas[cliente])}
+
+        manifiesto = {'version': version, 'sucursales': len(df), 'clientes': clientes}
+        (temporal / MANIFIESTO).write_text(json.dumps(manifiesto, ensure_ascii=False), encoding="utf-8")
+        _fsync_directorio(temporal)
+
+        carpeta = directorio_version(version)
+        anterior = None
+        if carpeta.exists():
+            # Se vuelve a escribir la misma versión: la vieja se aparta y se borra después del cambio
+            anterior = carpeta.with_name(f".{version}.{os.getpid()}.viejo")
+            os.replace(carpeta, anterior)
+        os.replace(temporal, carpeta)
+        _fsync_directorio(DIRECTORIO_PARTICIONES)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    if anterior is not None:
+        shutil.rmtree(anterior, ignore_errors=True)
+    with _candado:
+        # Lo que se haya abierto de la versión reescrita ya no vale
+        _manifiestos.pop(version, None)
+        for llave in [llave for llave in _abiertas if llave[0] == version]:
+            del _abiertas[llave]
+    return manifiesto
+
+
+def _lru(cache, llave, maximo, cargar):
+    with _candado:
+        if llave in cache:
+            cache.move_to_end(llave)
+            return cache[llave]
+    valor = cargar()
+    if valor is None:
+        return None  # No se recuerda: la versión se puede particionar después
+    with _candado:
+        cache[llave] = valor
+        while len(cache) > maximo:
+            cache.popitem(last=False)
+    return valor
+
+
+def _leer_manifiesto(version):
+    try:
+        with open(directorio_version(version) / MANIFIESTO, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def manifiesto(version):
+    """Manifiesto de `version`, o None si no está particionada."""
+    if version is None:
+        return None
+    return _lru(_manifiestos, version, 4, lambda: _leer_manifiesto(version))
+
+
+def _leer_cliente(version, cliente):
+    entrada = manifiesto(version)['clientes'].get(cliente)
+    if entrada is None:
+        return construir_df({col: [] for col in ESQUEMA})
+    columnas = {}
+    with np.load(directorio_version(version) / entrada['archivo']) as datos:
+        for col, tipo in ESQUEMA.items():
+            if tipo == 'category':
+                columnas[col] = pd.Categorical.from_codes(datos[col], datos[f'{col}{_CATEGORIAS}'])
+            else:
+                columnas[col] = datos[col]
+    df = construir_df(columnas)
+    df.index = pd.RangeIndex(entrada['inicio'], entrada['inicio'] + len(df))
+    return df
+
+
+def cargar_cliente(version, cliente):
+    """Sucursales de `cliente` leídas solo de su partición (LRU de PARTICIONES_ABIERTAS).
+
+    El DataFrame es compartido: de solo lectura, como las vistas de modelo.sucursales_cliente.
+    """
+    return _lru(_abiertas, (version, cliente), PARTICIONES_ABIERTAS, lambda: _leer_cliente(version, cliente))
+
+
+def en_memoria():
+    """Particiones abiertas en el LRU."""
+    with _candado:
+        return list(_abiertas.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escribir una partición por cliente de un snapshot")
+    parser.add_argument("version", nargs="?", help="Versión (por defecto, la publicada)")
+    args = parser.parse_args()
+
+    version = args.version or version_publicada()
+    if version is None:
+        print("❌ ERROR: No hay snapshots publicados")
+        raise SystemExit(1)
+    inicio = time.perf_counter()
+    resultado = escribir(version)
+    print(f"✅ {len(resultado['clientes'])} particiones en {directorio_version(version)} "
+          f"({time.perf_counter() - inicio:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+# ═══════════════════════════════════════════════════════════════════
+# PRECÁLCULO DESPUÉS DE CADA ACTUALIZACIÓN (PIPELINE)
+# ═══════════════════════════════════════════════════════════════════
+#
+# Genera los artefactos derivados de un snapshot en snapshots/artefactos/:
+#
+#   metricas ──────┐
+#   comparacion ───┼──> pagina (index.html)
+#   libros_zona ───┘
+#   excel_cartera
+#   historia (tendencias por sucursal, fuera de artefactos/)
+#
+# Cada etapa declara sus entradas (snapshots, archivos de otras etapas y
+# el código que la genera) y sus salidas. Las dependencias salen de ahí:
+# una etapa corre cuando ya terminaron las que producen sus entradas.
+#
+# Antes de correr una etapa se calcula el sha256 de sus entradas; si es
+# igual al de la corrida anterior y sus salidas existen, se omite. Las
+# etapas independientes corren en paralelo (un proceso por núcleo).
+#
+# Cada corrida deja artefactos/reporte_pipeline.json con el estado y el
+# tiempo de cada etapa.
+#
+# USO:
+#     python pipeline.py                      -> snapshot publicado
+#     python pipeline.py --version 20260105-093000-abcdef123456
+#     python pipeline.py --forzar --procesos 2
+#     python actualizar_datos.py --pipeline   -> al publicar
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import historia
+from comparacion import comparar, fecha_version, snapshot_anterior
+from snapshots import COLUMNAS_DINERO, DIRECTORIO, escribir_atomico, ruta_snapshot, version_publicada
+
+DIRECTORIO_ARTEFACTOS = DIRECTORIO / "artefactos"
+CODIGO = Path(__file__).resolve().parent
+
+ESTADO = ".pipeline.json"
+REPORTE = "reporte_pipeline.json"
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ETAPAS
+# ═══════════════════════════════════════════════════════════════════
+# Cada etapa es una función de nivel módulo (se ejecuta en otro proceso)
+# que recibe (version, anterior, salida) y escribe sus salidas.
+
+def etapa_metricas(version, anterior, salida):
+    """clientes.csv y sucursales.csv (exportar_metricas, montos en pesos)."""
+    from exportar_metricas import _en_pesos, metricas_clientes, metricas_sucursales
+    from modelo import cargar_df
+    df, _ = cargar_df(version)
+    for nombre, tabla in [('clientes', metricas_clientes(df)), ('sucursales', metricas_sucursales(df))]:
+        contenido = _en_pesos(tabla).to_csv(index=False).encode('utf-8-sig')
+        escribir_atomico(salida / f"{nombre}.csv", contenido)
+
+
+def etapa_comparacion(version, anterior, salida):
+    """cambios.csv: cambio por sucursal contra la semana anterior (vacío si no hay)."""
+    from modelo import cargar_df
+    df, _ = cargar_df(version)
+    columnas = ['clientName', 'sucursal'] + COLUMNAS_DINERO + ['nueva']
+    if anterior is None:
+        tabla = pd.DataFrame(columns=columnas)
+    else:
+        df_anterior, _ = cargar_df(anterior)
+        cambios = comparar(df, df_anterior)
+        tabla = pd.concat([df[['clientName', 'sucursal']], cambios[COLUMNAS_DINERO] / 100, cambios[['nueva']]],
+                          axis=1)
+    escribir_atomico(salida / "cambios.csv", tabla.to_csv(index=False).encode('utf-8-sig'))
+
+
+def etapa_excel_cartera(version, anterior, salida):
+    """Cartera.xlsx con la cartera completa."""
+    from modelo import cargar_df
+    from reporte_excel import generar_excel_cartera
+    df, _ = cargar_df(version)
+    escribir_atomico(salida / "Cartera.xlsx", generar_excel_cartera(df))
+
+
+def etapa_libros_zona(version, anterior, salida):
+    """libros/Zona_<n>.pdf, fechados con el snapshot para que salgan idénticos."""
+    from modelo import cargar_df
+    from reporte_pdf import generar_libro
+    df, _ = cargar_df(version)
+    fecha = fecha_version(version)
+    carpeta = salida / "libros"
+    generados = set()
+    for zona, df_zona in df.groupby('zona', sort=True):
+        ruta = carpeta / f"Zona_{zona}.pdf"
+        escribir_atomico(ruta, generar_libro(f"Zona {zona}", df_zona, fecha))
+        generados.add(ruta)
+    for ruta in set(carpeta.glob("Zona_*.pdf")) - generados:
+        ruta.unlink()  # Zona que ya no existe
+
+
+def etapa_historia(version, anterior, salida):
+    """historia/<versión>.npz con la tendencia de cada sucursal."""
+    historia.guardar(version, historia.calcular(version))
+
+
+def etapa_pagina(version, anterior, salida):
+    """index.html estático: cumplimiento y cambio semanal por cliente, con ligas a los libros."""
+    clientes = pd.read_csv(salida / "clientes.csv", encoding='utf-8-sig')
+    cambios = pd.read_csv(salida / "cambios.csv", encoding='utf-8-sig')
+    cambio = cambios.groupby('clientName')['resTotal'].sum() if not cambios.empty else pd.Series(dtype=float)
+
+    filas = []
+    for c in clientes.itertuples(index=False):
+        delta = cambio.get(c.clientName)
+        texto = "—" if delta is None else f"{delta:+,.0f}"
+        filas.append(f"<tr><td>{html.escape(str(c.clientName))}</td><td>{c.sucursales}</td>"
+                     f"<td>${c.objTotal:,.0f}</td><td>${c.resTotal:,.0f}</td><td>{c.pct_total:.0f}%</td>"
+                     f"<td>{texto}</td><td>{c.descuento}%</td></tr>")
+    libros = sorted(p.name for p in (salida / "libros").glob("*.pdf"))
+    ligas = " · ".join(f'<a href="libros/{nombre}">{nombre[:-4].replace("_", " ")}</a>' for nombre in libros)
+
+    pagina = f"""<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>MotoDrive - Objetivos</title>
+<style>body{{font-family:sans-serif;margin:2em}}table{{border-collapse:collapse}}
+td,th{{border:1px solid #ddd;padding:4px 8px}}td:nth-child(n+2){{text-align:right}}</style></head>
+<body><h1>MotoDrive - Objetivos</h1>
+<p>Datos del {fecha_version(version):%d/%m/%Y %H:%M} · {len(clientes)} clientes</p>
+<p>Libros por zona: {ligas}</p>
+<table><tr><th>Cliente</th><th>Sucursales</th><th>Objetivo</th><th>Resultado</th><th>% Cumpl.</th>
+<th>Cambio vs semana anterior</th><th>Descuento</th></tr>
+{chr(10).join(filas)}
+</table></body></html>
+"""
+    escribir_atomico(salida / "index.html", pagina.encode('utf-8'))
+
+
+def etapas(version, anterior, salida):
+    """{nombre: (función, entradas, salidas)}; rutas absolutas."""
+    snapshot = ruta_snapshot(version)
+    snapshots = [snapshot] + ([ruta_snapshot(anterior)] if anterior else [])
+    codigo = [CODIGO / "metricas.py", CODIGO / "modelo.py"]
+    diarias = [ruta_snapshot(v) for v in historia.versiones_diarias(version)]
+    return {
+        'metricas': (etapa_metricas, [snapshot, CODIGO / "exportar_metricas.py"] + codigo,
+                     [salida / "clientes.csv", salida / "sucursales.csv"]),
+        'comparacion': (etapa_comparacion, snapshots + [CODIGO / "comparacion.py"] + codigo,
+                        [salida / "cambios.csv"]),
+        'excel_cartera': (etapa_excel_cartera, [snapshot, CODIGO / "reporte_excel.py"] + codigo,
+                          [salida / "Cartera.xlsx"]),
+        'libros_zona': (etapa_libros_zona, [snapshot, CODIGO / "reporte_pdf.py"] + codigo,
+                        [salida / "libros"]),
+        'historia': (etapa_historia, diarias + [CODIGO / "historia.py", CODIGO / "comparacion.py"] + codigo,
+                     [historia.ruta_historia(version)]),
+        'pagina': (etapa_pagina, [salida / "clientes.csv", salida / "cambios.csv", salida / "libros",
+                                  CODIGO / "pipeline.py"],
+                   [salida / "index.html"]),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════
+# EJECUCIÓN
+# ═══════════════════════════════════════════════════════════════════
+
+def _hash_archivo(ruta, h):
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+
+
+def huella(rutas):
+    """sha256 del contenido de `rutas` (las carpetas, por nombre y contenido de sus archivos)."""
+    h = hashlib.sha256()
+    for ruta in rutas:
+        h.update(str(ruta.name).encode() + b"\0")
+        if ruta.is_dir():
+            for archivo in sorted(p for p in ruta.rglob("*") if p.is_file()):
+                h.update(str(archivo.relative_to(ruta)).encode() + b"\0")
+                _hash_archivo(archivo, h)
+        elif ruta.exists():
+            _hash_archivo(ruta, h)
+        else:
+            h.update(b"\0faltante\0")
+    return h.hexdigest()
+
+
+def dependencias(definicion):
+    """{etapa: etapas que producen alguna de sus entradas}."""
+    productor = {salida: nombre for nombre, (_, _, salidas) in definicion.items() for salida in salidas}
+    return {nombre: {productor[e] for e in entradas if e in productor and productor[e] != nombre}
+            for nombre, (_, entradas, _) in definicion.items()}
+
+
+def _correr(funcion, version, anterior, salida):
+    inicio = time.perf_counter()
+    funcion(version, anterior, salida)
+    return time.perf_counter() - inicio
+
+
+def _leer_estado(salida):
+    try:
+        return json.loads((salida / ESTADO).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def ejecutar(version=None, salida=DIRECTORIO_ARTEFACTOS, procesos=None, forzar=False, solo=None):
+    """Corre las etapas pendientes de `version` y regresa el reporte de la corrida.
+
+    `solo` limita la corrida a esas etapas; lo que produzcan las demás se
+    toma como esté en disco. Una etapa que falla bloquea a las que
+    dependen de ella.
+    """
+    version = version or version_publicada()
+    if version is None:
+        raise FileNotFoundError("No hay snapshots publicados")
+    anterior = snapshot_anterior(version)
+    salida = Path(salida)
+    salida.mkdir(parents=True, exist_ok=True)
+
+    definicion = etapas(version, anterior, salida)
+    if solo:
+        definicion = {nombre: d for nombre, d in definicion.items() if nombre in solo}
+    requiere = dependencias(definicion)
+    estado = _leer_estado(salida)
+
+    inicio = time.perf_counter()
+    resultados = {}
+    pendientes = set(definicion)
+    corriendo = {}
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as ejecutor:
+        while pendientes or corriendo:
+            antes = len(pendientes)
+            for nombre in sorted(pendientes):
+                if not requiere[nombre] <= set(resultados):
+                    continue
+                pendientes.discard(nombre)
+                funcion, entradas, salidas = definicion[nombre]
+                fallidas = [r for r in requiere[nombre] if resultados[r]['estado'] in ('error', 'bloqueada')]
+                if fallidas:
+                    resultados[nombre] = {'estado': 'bloqueada', 'segundos': 0.0, 'por': fallidas}
+                    continue
+                actual = huella(entradas)
+                if not forzar and estado.get(nombre) == actual and all(s.exists() for s in salidas):
+                    resultados[nombre] = {'estado': 'omitida', 'segundos': 0.0, 'huella': actual}
+                    continue
+                corriendo[ejecutor.submit(_correr, funcion, version, anterior, salida)] = (nombre, actual)
+
+            if not corriendo:
+                if pendientes and len(pendientes) == antes:
+                    raise ValueError(f"Dependencias circulares: {', '.join(sorted(pendientes))}")
+                continue
+            listos, _ = wait(corriendo, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                nombre, actual = corriendo.pop(futuro)
+                try:
+                    resultados[nombre] = {'estado': 'ok', 'segundos': round(futuro.result(), 3), 'huella': actual}
+                    estado[nombre] = actual
+                except Exception as e:
+                    resultados[nombre] = {'estado': 'error', 'segundos': 0.0, 'error': f"{type(e).__name__}: {e}"}
+                    estado.pop(nombre, None)
+
+    escribir_atomico(salida / ESTADO, json.dumps(estado, indent=1).encode("utf-8"))
+    reporte = {
+        'version': version,
+        'anterior': anterior,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'segundos': round(time.perf_counter() - inicio, 3),
+        'etapas': {nombre: resultados[nombre] for nombre in definicion},
+    }
+    escribir_atomico(salida / REPORTE, json.dumps(reporte, ensure_ascii=False, indent=1).encode("utf-8"))
+    return reporte
+
+
+def imprimir_reporte(reporte):
+    iconos = {'ok': '✅', 'omitida': '⏭️', 'error': '❌', 'bloqueada': '⛔'}
+    print(f"🏭 Pipeline {reporte['version']} ({reporte['segundos']:.1f}s)")
+    for nombre, r in reporte['etapas'].items():
+        detalle = r.get('error') or (f"por {', '.join(r['por'])}" if 'por' in r else "")
+        print(f"   {iconos[r['estado']]} {nombre:<15} {r['estado']:<10} {r['segundos']:>7.2f}s  {detalle}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera los artefactos derivados de un snapshot")
+    parser.add_argument("--version", help="Snapshot a usar (por defecto, el publicado)")
+    parser.add_argument("--salida", default=DIRECTORIO_ARTEFACTOS, help="Carpeta de artefactos")
+    parser.add_argument("--procesos", type=int, help="Procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument("--forzar", action="store_true", help="Correr todas las etapas aunque no hayan cambiado")
+    parser.add_argument("--etapas", help="Solo estas etapas, separadas por coma")
+    args = parser.parse_args()
+
+    try:
+        reporte = ejecutar(args.version, args.salida, args.procesos, args.forzar,
+                           args.etapas.split(",") if args.etapas else None)
+    except FileNotFoundError as e:
+        print(f"❌ ERROR: {e}")
+        raise SystemExit(1)
+    imprimir_reporte(reporte)
+    if any(r['estado'] in ('error', 'bloqueada') for r in reporte['etapas'].values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# ═══════════════════════════════════════════════════════════════════
+# RANKING CONTRA CLIENTES SIMILARES (ZONA Y ASESOR)
+# ═══════════════════════════════════════════════════════════════════
+#
+# "Estás en el top 20% de la zona 1": al publicar un snapshot se guarda,
+# para cada zona y cada asesor, la lista ORDENADA del cumplimiento
+# (total, REFACC, BGO) de sus clientes. Solo números: ningún nombre.
+#
+# Cada cliente pertenece a la zona / asesor donde tiene más sucursales
+# (empate: el menor). En la página se calcula el cumplimiento del
+# cliente y su lugar con una búsqueda binaria (bisect) sobre la lista
+# de su grupo: O(log n) sin tocar a los demás clientes.
+#
+# Se guarda en snapshots/ranking/<versión>.json; si una versión no lo
+# tiene se calcula la primera vez que se pide.
+#
+# USO:
+#     python ranking.py                       -> snapshot publicado
+#     python ranking.py "VYAYAM MOTORS"       -> lugar de un cliente
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import json
+import math
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+from metricas import agregados_clientes, calcular_metricas, porcentajes
+from modelo import cargar_df, sucursales_cliente
+from snapshots import DIRECTORIO, escribir_atomico, version_publicada
+
+DIRECTORIO_RANKING = DIRECTORIO / "ranking"
+
+GRUPOS = ['zona', 'asesor']
+
+# indicador -> (resultado, objetivo)
+INDICADORES = {
+    'pct_total': ('resTotal', 'objTotal'),
+    'pct_refacc': ('resRefacc', 'objRefacc'),
+    'pct_bgo': ('resBgo', 'objBgo'),
+}
+
+# Los porcentajes se redondean igual al guardar y al buscar
+DECIMALES = 6
+
+
+def grupos_clientes(df, columna):
+    """Series cliente -> valor de `columna` donde tiene más sucursales (empate: el menor)."""
+    conteo = df.groupby(['clientName', columna], observed=True).size().reset_index(name='n')
+    conteo = conteo.sort_values(['clientName', 'n', columna], ascending=[True, False, True], kind='stable')
+    return conteo.drop_duplicates('clientName').set_index('clientName')[columna]
+
+
+def calcular(df):
+    """{grupo: {valor: {indicador: [porcentajes ordenados]}}} para todo el snapshot."""
+    agregados = agregados_clientes(df)
+    pct = pd.DataFrame({indicador: porcentajes(agregados[res], agregados[obj]).round(DECIMALES)
+                        for indicador, (res, obj) in INDICADORES.items()}, index=agregados.index)
+    ranking = {}
+    for grupo in GRUPOS:
+        asignado = grupos_clientes(df, grupo).reindex(pct.index)
+        ranking[grupo] = {
+            str(valor): {indicador: sorted(filas[indicador].tolist()) for indicador in INDICADORES}
+            for valor, filas in pct.groupby(asignado.to_numpy(), sort=True)
+        }
+    return ranking
+
+
+def ruta_ranking(version):
+    return DIRECTORIO_RANKING / f"{version}.json"
+
+
+def guardar(version, ranking):
+    escribir_atomico(ruta_ranking(version), json.dumps(ranking, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return ruta_ranking(version)
+
+
+def cargar(version, df=None):
+    """Ranking de `version`: el guardado o, si no hay, calculado (con `df` o el snapshot) y guardado."""
+    if version is not None:
+        try:
+            with open(ruta_ranking(version), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    if df is None:
+        df, _ = cargar_df(version)
+    ranking = calcular(df)
+    if version is not None:
+        try:
+            guardar(version, ranking)
+        except OSError:
+            pass  # Sin permisos de escritura: se usa en memoria
+    return ranking
+
+
+def lugar(ordenados, valor):
+    """(lugar, total, top %) de `valor` en la lista ordenada; empates comparten el mejor lugar."""
+    total = len(ordenados)
+    mejores = total - bisect_right(ordenados, float(np.round(valor, DECIMALES)))
+    posicion = mejores + 1
+    return posicion, total, math.ceil(posicion * 100 / total)
+
+
+def ranking_cliente(ranking, df_cliente, metricas):
+    """Lugar del cliente en su zona y con su asesor: {grupo: {'valor', indicador: (lugar, total, top)}}."""
+    resultado = {}
+    if df_cliente.empty:
+        return resultado
+    for grupo in GRUPOS:
+        asignado = grupos_clientes(df_cliente, grupo)
+        if asignado.empty:
+            continue  # Sin asesor / zona capturados
+        valor = str(asignado.iloc[0])
+        listas = ranking.get(grupo, {}).get(valor)
+        if not listas:
+            continue
+        resultado[grupo] = {'valor': valor}
+        for indicador in INDICADORES:
+            resultado[grupo][indicador] = lugar(listas[indicador], metricas[indicador])
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ranking de cumplimiento por zona y asesor")
+    parser.add_argument("cliente", nargs="?", help="Mostrar el lugar de este cliente")
+    parser.add_argument("--version", help="Snapshot a usar (por defecto, el publicado)")
+    args = parser.parse_args()
+
+    version = args.version or version_publicada()
+    df, clientes = cargar_df(version)
+    ranking = calcular(df)
+    if version is not None:
+        print(f"✅ {guardar(version, ranking)}")
+
+    if args.cliente:
+        if args.cliente not in clientes:
+            print(f"❌ ERROR: No existe el cliente '{args.cliente}'")
+            raise SystemExit(1)
+        df_cliente = sucursales_cliente(df, args.cliente)
+        for grupo, lugares in ranking_cliente(ranking, df_cliente, calcular_metricas(df_cliente)).items():
+            posicion, total, top = lugares['pct_total']
+            print(f"🏅 {grupo} {lugares['valor']}: lugar {posicion} de {total} (top {top}%)")
+
+
+if __name__ == "__main__":
+    main()
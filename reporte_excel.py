@@ -0,0 +1,198 @@
+# ═══════════════════════════════════════════════════════════════════
+# EXPORTACIÓN A EXCEL (CLIENTE Y CARTERA COMPLETA)
+# ═══════════════════════════════════════════════════════════════════
+#
+# Los libros se escriben con openpyxl en modo write-only: cada fila se
+# serializa al momento y no se guarda en memoria, así que la cartera
+# completa (cientos de miles de sucursales) usa memoria constante. Los
+# datos se convierten a listas por bloques de FILAS_POR_BLOQUE.
+#
+# Los montos van como números en pesos con formato de moneda (no como
+# texto ya formateado), para que se puedan sumar y filtrar en Excel.
+# Se reutiliza una celda con estilo por columna en lugar de crear una
+# celda nueva por valor.
+#
+# USO:
+#     python reporte_excel.py                       -> cartera completa
+#     python reporte_excel.py "VYAYAM MOTORS" -o vyayam.xlsx
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from metricas import (CENTAVOS, DESCUENTO_BASE, DESCUENTO_MAXIMO, agregados_clientes, calcular_metricas,
+                      califica_descuento)
+from modelo import cargar_df, sucursales_cliente
+
+FORMATO_MONEDA = '"$"#,##0.00'
+FORMATO_PORCENTAJE = '0%'
+FILAS_POR_BLOQUE = 10_000
+
+# (encabezado, columna del df o (res, obj) para un porcentaje, formato)
+COLUMNAS_SUCURSAL = [
+    ('No. Cliente', 'CLIENT_NUM', None),
+    ('Cliente', 'clientName', None),
+    ('Sucursal', 'sucursal', None),
+    ('Asesor', 'asesor', None),
+    ('Zona', 'zona', None),
+    ('Obj Refacc', 'objRefacc', FORMATO_MONEDA),
+    ('Res Refacc', 'resRefacc', FORMATO_MONEDA),
+    ('% Refacc', ('resRefacc', 'objRefacc'), FORMATO_PORCENTAJE),
+    ('Obj BGO', 'objBgo', FORMATO_MONEDA),
+    ('Res BGO', 'resBgo', FORMATO_MONEDA),
+    ('% BGO', ('resBgo', 'objBgo'), FORMATO_PORCENTAJE),
+    ('Obj Acc', 'objAcc', FORMATO_MONEDA),
+    ('Res Acc', 'resAcc', FORMATO_MONEDA),
+    ('Obj Total', 'objTotal', FORMATO_MONEDA),
+    ('Res Total', 'resTotal', FORMATO_MONEDA),
+    ('% Cumpl.', ('resTotal', 'objTotal'), FORMATO_PORCENTAJE),
+    ('Pedidos', 'pedidos', FORMATO_MONEDA),
+]
+
+COLUMNAS_CLIENTE = [
+    ('Cliente', 'clientName', None),
+    ('Sucursales', 'sucursales', None),
+    ('Obj Refacc', 'objRefacc', FORMATO_MONEDA),
+    ('Res Refacc', 'resRefacc', FORMATO_MONEDA),
+    ('% Refacc', ('resRefacc', 'objRefacc'), FORMATO_PORCENTAJE),
+    ('Obj BGO', 'objBgo', FORMATO_MONEDA),
+    ('Res BGO', 'resBgo', FORMATO_MONEDA),
+    ('% BGO', ('resBgo', 'objBgo'), FORMATO_PORCENTAJE),
+    ('Obj Total', 'objTotal', FORMATO_MONEDA),
+    ('Res Total', 'resTotal', FORMATO_MONEDA),
+    ('% Cumpl.', ('resTotal', 'objTotal'), FORMATO_PORCENTAJE),
+    ('Pedidos', 'pedidos', FORMATO_MONEDA),
+    ('Descuento', 'descuento', None),
+]
+
+
+def _valores(df, fuente, formato):
+    """Arreglo de una columna de salida: pesos, fracción de cumplimiento o tal cual."""
+    if isinstance(fuente, tuple):
+        res, obj = df[fuente[0]].to_numpy(), df[fuente[1]].to_numpy()
+        return np.divide(res, obj, out=np.zeros(len(df)), where=obj > 0)
+    valores = df[fuente].to_numpy()
+    if formato == FORMATO_MONEDA:
+        return valores / CENTAVOS
+    return valores
+
+
+def _escribir_tabla(ws, df, columnas):
+    """Encabezado + una fila por renglón de `df`, en bloques."""
+    negritas = Font(bold=True)
+    encabezado = []
+    for titulo, _, _ in columnas:
+        celda = WriteOnlyCell(ws, titulo)
+        celda.font = negritas
+        encabezado.append(celda)
+    ws.append(encabezado)
+
+    # Una celda con estilo por columna; se le cambia el valor en cada fila
+    plantillas = []
+    for _, _, formato in columnas:
+        if formato is None:
+            plantillas.append(None)
+        else:
+            celda = WriteOnlyCell(ws)
+            celda.number_format = formato
+            plantillas.append(celda)
+
+    for inicio in range(0, len(df), FILAS_POR_BLOQUE):
+        bloque = df.iloc[inicio:inicio + FILAS_POR_BLOQUE]
+        datos = [_valores(bloque, fuente, formato).tolist() for _, fuente, formato in columnas]
+        for fila in zip(*datos):
+            salida = []
+            for valor, plantilla in zip(fila, plantillas):
+                if plantilla is None:
+                    salida.append(valor)
+                else:
+                    plantilla.value = valor
+                    salida.append(plantilla)
+            ws.append(salida)
+
+
+def _guardar(wb, destino):
+    """Guarda en `destino` (ruta) o regresa los bytes si es None."""
+    if destino is not None:
+        wb.save(destino)
+        return destino
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def generar_excel_cliente(cliente, df_cliente, metricas, destino=None, fecha=None):
+    """Libro de un cliente: detalle por sucursal con fila de totales."""
+    fecha = fecha or datetime.now()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sucursales')
+    ws.append([f'MOTODRIVE - {cliente}'])
+    ws.append([f'Generado: {fecha:%d/%m/%Y %H:%M}', f"Descuento: {metricas['descuento']}%"])
+    ws.append([])
+    _escribir_tabla(ws, df_cliente, COLUMNAS_SUCURSAL)
+
+    totales = []
+    for titulo, fuente, formato in COLUMNAS_SUCURSAL:
+        if formato == FORMATO_MONEDA:
+            celda = WriteOnlyCell(ws, int(df_cliente[fuente].sum()) / CENTAVOS)
+        elif formato == FORMATO_PORCENTAJE:
+            res, obj = (int(df_cliente[c].sum()) for c in fuente)
+            celda = WriteOnlyCell(ws, res / obj if obj > 0 else 0)
+        else:
+            celda = WriteOnlyCell(ws, 'TOTAL' if titulo == 'Sucursal' else None)
+        celda.font = Font(bold=True)
+        if formato:
+            celda.number_format = formato
+        totales.append(celda)
+    ws.append(totales)
+    return _guardar(wb, destino)
+
+
+def generar_excel_cartera(df, agregados=None, destino=None):
+    """Libro de toda la cartera: hoja 'Clientes' (totales) y 'Sucursales' (detalle).
+
+    `agregados` (metricas.agregados_clientes) se reutiliza si ya está calculado.
+    """
+    if agregados is None:
+        agregados = agregados_clientes(df)
+    clientes = agregados.reset_index()
+    clientes['sucursales'] = df.groupby('clientName', observed=True, sort=True).size().to_numpy()
+    tiene_35 = califica_descuento(clientes['resRefacc'], clientes['objRefacc'], clientes['resBgo'],
+                                  clientes['objBgo'], clientes['resTotal'], clientes['objTotal'])
+    clientes['descuento'] = np.where(tiene_35, f'{DESCUENTO_MAXIMO}%', f'{DESCUENTO_BASE}%')
+
+    wb = Workbook(write_only=True)
+    _escribir_tabla(wb.create_sheet('Clientes'), clientes, COLUMNAS_CLIENTE)
+    _escribir_tabla(wb.create_sheet('Sucursales'), df, COLUMNAS_SUCURSAL)
+    return _guardar(wb, destino)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportar el detalle por sucursal a Excel")
+    parser.add_argument("cliente", nargs="?", help="Cliente a exportar (por defecto, toda la cartera)")
+    parser.add_argument("-o", "--salida", help="Archivo de salida")
+    args = parser.parse_args()
+
+    df, clientes = cargar_df()
+    if args.cliente:
+        if args.cliente not in clientes:
+            print(f"❌ ERROR: No existe el cliente '{args.cliente}'")
+            raise SystemExit(1)
+        df_cliente = sucursales_cliente(df, args.cliente)
+        salida = args.salida or f"Detalle_{args.cliente.replace(' ', '_')}.xlsx"
+        generar_excel_cliente(args.cliente, df_cliente, calcular_metricas(df_cliente), salida)
+    else:
+        salida = args.salida or f"Cartera_{datetime.now():%Y%m%d}.xlsx"
+        generar_excel_cartera(df, destino=salida)
+    print(f"✅ {salida}")
+
+
+if __name__ == "__main__":
+    main()
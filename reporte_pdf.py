@@ -0,0 +1,382 @@
+# ═══════════════════════════════════════════════════════════════════
+# REPORTE PDF POR CLIENTE Y LIBRO POR ASESOR / ZONA
+# ═══════════════════════════════════════════════════════════════════
+#
+# generar_pdf arma el reporte de un cliente; generar_libro junta en un
+# solo PDF a todos los clientes de un asesor o zona. Los dos usan las
+# mismas secciones y un mismo documento (fuentes e imágenes repetidas
+# se guardan una vez). Las tablas paginan y repiten su encabezado en
+# cada página; la nota va debajo de la tabla, no en una posición fija.
+#
+# Streamlit atiende cada sesión en su propio hilo, así que aquí no se usa
+# matplotlib.pyplot (estado global compartido): cada gráfica es una
+# Figure propia con su FigureCanvasAgg y se guarda en un BytesIO.
+# Varias sesiones pueden generar PDFs al mismo tiempo sin bloquearse.
+#
+#     python reporte_pdf.py --asesor LIDIA
+#     python reporte_pdf.py --zona 1 --graficas -o zona1.pdf
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+from datetime import datetime
+from io import BytesIO
+
+from fpdf import FPDF
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+
+from metricas import agregados_clientes, color_semaforo, formato_pesos, metricas_desde_totales, pesos, porcentaje
+from modelo import cargar_df
+
+NOTA = ('Nota: Para obtener el descuento del 35% es necesario cubrir el 100% del objetivo de cada categoria, '
+        'incluyendo manejo de Excellon al 100%.')
+
+
+def _png(fig):
+    """Renderiza una Figure a PNG en memoria."""
+    FigureCanvasAgg(fig)
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight', facecolor='white')
+    buffer.seek(0)
+    return buffer
+
+
+def grafica_barras(metricas):
+    """Objetivo vs Resultado por categoría, como PNG en BytesIO."""
+    fig = Figure(figsize=(5, 3.5))
+    ax1 = fig.add_subplot()
+    categorias = ['REFACC', 'BGO']
+    objetivos = [pesos(metricas['obj_refacc']), pesos(metricas['obj_bgo'])]
+    resultados = [pesos(metricas['res_refacc']), pesos(metricas['res_bgo'])]
+    
+    x = range(len(categorias))
+    width = 0.35
+    
+    ax1.bar([i - width/2 for i in x], objetivos, width, label='Objetivo', color='#3b82f6')
+    ax1.bar([i + width/2 for i in x], resultados, width, label='Resultado', 
+            color=[color_semaforo(metricas['pct_refacc']), color_semaforo(metricas['pct_bgo'])])
+    
+    ax1.set_ylabel('Pesos')
+    ax1.set_title('Objetivo vs Resultado')
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(categorias)
+    ax1.legend()
+    ax1.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    
+    fig.tight_layout()
+    return _png(fig)
+
+
+def grafica_dona(metricas):
+    """Cumplimiento global, como PNG en BytesIO."""
+    fig = Figure(figsize=(5, 3.5))
+    ax2 = fig.add_subplot()
+    alcanzado = pesos(metricas['res_total'])
+    pendiente = pesos(max(0, metricas['obj_total'] - metricas['res_total']))
+    
+    sizes = [alcanzado, pendiente]
+    colors_pie = ['#22c55e', '#e2e8f0']
+    
+    ax2.pie(sizes, colors=colors_pie, autopct='%1.0f%%',
+            startangle=90, pctdistance=0.85,
+            wedgeprops=dict(width=0.4))
+    
+    ax2.text(0, 0, f'{metricas["pct_total"]:.0f}%', ha='center', va='center', fontsize=20, fontweight='bold')
+    ax2.set_title('Cumplimiento Global')
+    ax2.legend(['Alcanzado', 'Pendiente'], loc='lower center', bbox_to_anchor=(0.5, -0.1))
+    
+    fig.tight_layout()
+    return _png(fig)
+
+
+def _pagina_resumen(pdf, cliente, df_cliente, metricas, fecha, graficas=True):
+    """Encabezado, KPIs, barras de avance y gráficas de un cliente (página nueva)."""
+    pdf.add_page()
+    
+    # ═══ HEADER ═══
+    pdf.set_fill_color(220, 38, 38)  # Rojo
+    pdf.rect(10, 10, 190, 30, 'F')
+    
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font('Helvetica', 'B', 20)
+    pdf.set_xy(15, 15)
+    pdf.cell(0, 10, 'MOTODRIVE - Dashboard de Objetivos', ln=True)
+    
+    pdf.set_font('Helvetica', '', 12)
+    pdf.set_xy(15, 28)
+    pdf.cell(0, 10, f'Cliente: {cliente} | {len(df_cliente)} sucursales | {fecha.strftime("%B %Y").title()}')
+    
+    # ═══ DESCUENTO ═══
+    pdf.set_fill_color(30, 41, 59)
+    pdf.rect(160, 10, 40, 30, 'F')
+    pdf.set_text_color(148, 163, 184)
+    pdf.set_font('Helvetica', '', 8)
+    pdf.set_xy(160, 14)
+    pdf.cell(40, 5, 'Descuento', align='C')
+    
+    if metricas['descuento'] == 35:
+        pdf.set_text_color(34, 197, 94)  # Verde
+    else:
+        pdf.set_text_color(59, 130, 246)  # Azul
+    pdf.set_font('Helvetica', 'B', 24)
+    pdf.set_xy(160, 22)
+    pdf.cell(40, 12, f"{metricas['descuento']}%", align='C')
+    
+    # ═══ KPIs ═══
+    pdf.set_y(50)
+    pdf.set_text_color(0, 0, 0)
+    
+    kpi_width = 45
+    start_x = 12
+    
+    kpis = [
+        ('Objetivo', formato_pesos(metricas['obj_total']), (59, 130, 246)),
+        ('Resultado', formato_pesos(metricas['res_total']), (34, 197, 94) if metricas['pct_total'] >= 100 else (234, 179, 8)),
+        ('Cumplimiento', f"{metricas['pct_total']:.0f}%", (34, 197, 94) if metricas['pct_total'] >= 100 else (234, 179, 8)),
+        ('Pedidos', formato_pesos(metricas['pedidos']), (139, 92, 246))
+    ]
+    
+    for i, (label, value, color) in enumerate(kpis):
+        x = start_x + (i * 48)
+        
+        pdf.set_fill_color(241, 245, 249)
+        pdf.rect(x, 50, kpi_width, 25, 'F')
+        
+        pdf.set_text_color(100, 116, 139)
+        pdf.set_font('Helvetica', '', 9)
+        pdf.set_xy(x, 52)
+        pdf.cell(kpi_width, 5, label, align='C')
+        
+        pdf.set_text_color(*color)
+        pdf.set_font('Helvetica', 'B', 14)
+        pdf.set_xy(x, 60)
+        pdf.cell(kpi_width, 10, value, align='C')
+    
+    # ═══ BARRAS DE AVANCE ═══
+    pdf.set_y(85)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font('Helvetica', 'B', 12)
+    pdf.cell(0, 10, 'Avance por Categoria', ln=True)
+    
+    barras = [
+        ('REFACCIONES', metricas['pct_refacc'], metricas['res_refacc'], metricas['obj_refacc']),
+        ('BGO', metricas['pct_bgo'], metricas['res_bgo'], metricas['obj_bgo'])
+    ]
+    
+    for nombre, pct, res, obj in barras:
+        pdf.set_font('Helvetica', 'B', 10)
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(40, 6, nombre)
+        
+        pdf.set_font('Helvetica', '', 9)
+        pdf.set_text_color(100, 116, 139)
+        pdf.cell(80, 6, f'{formato_pesos(res)} / {formato_pesos(obj)}')
+        
+        if pct >= 100:
+            r, g, b = 34, 197, 94
+        elif pct >= 70:
+            r, g, b = 234, 179, 8
+        elif pct >= 50:
+            r, g, b = 249, 115, 22
+        else:
+            r, g, b = 239, 68, 68
+        
+        pdf.set_text_color(r, g, b)
+        pdf.set_font('Helvetica', 'B', 10)
+        pdf.cell(30, 6, f'{pct:.0f}%', align='R', ln=True)
+        
+        pdf.set_fill_color(226, 232, 240)
+        pdf.rect(12, pdf.get_y(), 186, 6, 'F')
+        
+        pdf.set_fill_color(r, g, b)
+        barra_ancho = min(pct, 100) / 100 * 186
+        pdf.rect(12, pdf.get_y(), barra_ancho, 6, 'F')
+        
+        pdf.set_y(pdf.get_y() + 10)
+    
+    # ═══ GRÁFICAS CON MATPLOTLIB ═══
+    if not graficas:
+        return
+    pdf.set_y(pdf.get_y() + 5)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font('Helvetica', 'B', 12)
+    pdf.cell(0, 10, 'Visualizaciones', ln=True)
+    
+    # Insertar gráficas (PNG en memoria)
+    y_graficas = pdf.get_y()
+    pdf.image(grafica_barras(metricas), x=10, y=y_graficas, w=95)
+    pdf.image(grafica_dona(metricas), x=105, y=y_graficas, w=95)
+
+
+def _encabezado_tabla(pdf, encabezados, anchos):
+    pdf.set_fill_color(30, 41, 59)
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font('Helvetica', 'B', 8)
+    for encabezado, ancho in zip(encabezados, anchos):
+        pdf.cell(ancho, 7, encabezado, border=1, align='C', fill=True)
+    pdf.ln()
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font('Helvetica', '', 7)
+
+
+def _tabla(pdf, encabezados, anchos, alineacion, columnas, alto=5):
+    """Tabla de una línea por fila que repite el encabezado en cada página.
+
+    `columnas` son listas de textos ya formateados, una por columna. Se
+    dibuja con pdf.cell (sin partir líneas); pdf.table calcula el alto de
+    cada celda dos veces y es ~15 veces más lento en tablas grandes.
+    """
+    _encabezado_tabla(pdf, encabezados, anchos)
+    for fila in zip(*columnas):
+        if pdf.will_page_break(alto):
+            pdf.add_page()
+            _encabezado_tabla(pdf, encabezados, anchos)
+        for texto, ancho, alinear in zip(fila, anchos, alineacion):
+            pdf.cell(ancho, alto, texto, border=1, align=alinear)
+        pdf.ln()
+
+
+def _tabla_sucursales(pdf, df_cliente, nueva_pagina=True):
+    if nueva_pagina:
+        pdf.add_page()
+    else:
+        pdf.set_y(pdf.get_y() + 5)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font('Helvetica', 'B', 12)
+    pdf.cell(0, 10, 'Detalle por Sucursal', ln=True)
+
+    montos = ['objRefacc', 'resRefacc', 'objBgo', 'resBgo', 'objTotal', 'resTotal']
+    columnas = [[str(s)[:28] for s in df_cliente['sucursal'].tolist()]]
+    columnas += [[formato_pesos(v) for v in df_cliente[col].tolist()] for col in montos]
+    columnas.append([f'{porcentaje(res, obj):.0f}%' for res, obj in
+                     zip(df_cliente['resTotal'].tolist(), df_cliente['objTotal'].tolist())])
+    _tabla(pdf,
+           ['Sucursal', 'Obj Refacc', 'Res Refacc', 'Obj BGO', 'Res BGO', 'Obj Total', 'Res Total', '% Cumpl'],
+           [46, 23, 23, 20, 20, 23, 23, 12],
+           ['L'] + ['R'] * 6 + ['C'],
+           columnas)
+
+
+def _nota(pdf):
+    """Nota del 35% debajo de lo último que se dibujó (o en una página nueva)."""
+    if pdf.will_page_break(25):
+        pdf.add_page()
+    y = pdf.get_y() + 5
+    pdf.set_fill_color(241, 245, 249)
+    pdf.rect(10, y, 190, 20, 'F')
+    pdf.set_text_color(100, 116, 139)
+    pdf.set_font('Helvetica', '', 9)
+    pdf.set_xy(15, y + 5)
+    pdf.multi_cell(180, 5, NOTA)
+    pdf.set_y(y + 20)
+
+
+def _seccion_cliente(pdf, cliente, df_cliente, metricas, fecha, graficas=True):
+    _pagina_resumen(pdf, cliente, df_cliente, metricas, fecha, graficas)
+    # Sin gráficas la tabla cabe debajo del resumen
+    _tabla_sucursales(pdf, df_cliente, nueva_pagina=graficas)
+    _nota(pdf)
+
+
+def _nuevo_pdf(fecha):
+    pdf = FPDF()
+    pdf.set_creation_date(fecha)
+    pdf.set_auto_page_break(auto=True, margin=15)
+    return pdf
+
+
+def generar_pdf(cliente, df_cliente, metricas, fecha=None):
+    """Genera un PDF profesional del dashboard
+
+    `fecha` fija la fecha del encabezado y de los metadatos (por defecto,
+    ahora); con la misma fecha el PDF sale idéntico byte por byte.
+    """
+    fecha = fecha or datetime.now()
+    pdf = _nuevo_pdf(fecha)
+    _seccion_cliente(pdf, cliente, df_cliente, metricas, fecha)
+    return bytes(pdf.output())
+
+
+# ═══════════════════════════════════════════════════════════════════
+# LIBRO POR ASESOR / ZONA
+# ═══════════════════════════════════════════════════════════════════
+
+def generar_libro(titulo, df, fecha=None, graficas=False):
+    """Un solo PDF con todos los clientes de `df` (p. ej. los de un asesor).
+
+    Empieza con un índice de clientes y luego la sección de cada uno, con
+    marcadores para navegar. Los clientes se recorren con un groupby (sin
+    filtrar el df una vez por cliente). Sin `graficas` no se usa matplotlib
+    y el tiempo crece solo con el número de filas.
+    """
+    fecha = fecha or datetime.now()
+    pdf = _nuevo_pdf(fecha)
+    grupos = df.groupby('clientName', observed=True, sort=True)
+    agregados = agregados_clientes(df)
+
+    # ═══ PORTADA E ÍNDICE ═══
+    pdf.add_page()
+    pdf.set_fill_color(220, 38, 38)
+    pdf.rect(10, 10, 190, 30, 'F')
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font('Helvetica', 'B', 20)
+    pdf.set_xy(15, 15)
+    pdf.cell(0, 10, 'MOTODRIVE - Libro de Objetivos', ln=True)
+    pdf.set_font('Helvetica', '', 12)
+    pdf.set_xy(15, 28)
+    pdf.cell(0, 10, f'{titulo} | {len(agregados)} clientes | {len(df)} sucursales | {fecha.strftime("%B %Y").title()}')
+    pdf.set_y(50)
+
+    resumen = [metricas_desde_totales({
+        'obj_refacc': fila.objRefacc, 'obj_bgo': fila.objBgo, 'obj_acc': fila.objAcc, 'obj_total': fila.objTotal,
+        'res_refacc': fila.resRefacc, 'res_bgo': fila.resBgo, 'res_acc': fila.resAcc, 'res_total': fila.resTotal,
+        'pedidos': fila.pedidos,
+    }) for fila in agregados.itertuples()]
+    _tabla(pdf,
+           ['Cliente', 'Sucursales', 'Objetivo', 'Resultado', '% Cumpl', 'Descuento'],
+           [70, 20, 30, 30, 20, 20],
+           ['L', 'C', 'R', 'R', 'C', 'C'],
+           [[str(c)[:45] for c in agregados.index],
+            [str(n) for n in grupos.size().tolist()],
+            [formato_pesos(m['obj_total']) for m in resumen],
+            [formato_pesos(m['res_total']) for m in resumen],
+            [f"{m['pct_total']:.0f}%" for m in resumen],
+            [f"{m['descuento']}%" for m in resumen]])
+
+    # ═══ UNA SECCIÓN POR CLIENTE ═══
+    for (cliente, df_cliente), metricas in zip(grupos, resumen):
+        pdf.start_section(str(cliente))
+        _seccion_cliente(pdf, cliente, df_cliente, metricas, fecha, graficas)
+
+    return bytes(pdf.output())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Libro PDF con todos los clientes de un asesor o zona")
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--asesor", help="Nombre del asesor (LIDIA, ERICK, ...)")
+    grupo.add_argument("--zona", type=int, help="Número de zona")
+    parser.add_argument("--graficas", action="store_true", help="Incluir las gráficas de cada cliente (más lento)")
+    parser.add_argument("-o", "--salida", help="Archivo de salida")
+    args = parser.parse_args()
+
+    df, _ = cargar_df()
+    if args.asesor:
+        df_libro, titulo = df[df['asesor'] == args.asesor], f"Asesor: {args.asesor}"
+    else:
+        df_libro, titulo = df[df['zona'] == args.zona], f"Zona {args.zona}"
+    if df_libro.empty:
+        print(f"❌ ERROR: No hay sucursales para {titulo}")
+        raise SystemExit(1)
+
+    fecha = datetime.now()
+    salida = args.salida or f"Libro_{titulo.split(' ')[-1]}_{fecha:%Y%m%d}.pdf"
+    with open(salida, "wb") as f:
+        f.write(generar_libro(titulo, df_libro, fecha, args.graficas))
+    print(f"✅ {salida} ({df_libro['clientName'].nunique()} clientes)")
+
+
+if __name__ == "__main__":
+    main()
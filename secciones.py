@@ -0,0 +1,702 @@
+# ═══════════════════════════════════════════════════════════════════
+# SECCIONES DEL DASHBOARD
+# ═══════════════════════════════════════════════════════════════════
+#
+# Cada sección es una función que recibe explícitamente los datos que
+# usa (cliente, métricas, sucursales), así el script principal es solo
+# el "grafo" de qué depende de qué.
+#
+# Las figuras plotly, el HTML del encabezado/barras y la tabla se
+# guardan por (cliente, versión del snapshot, tema) en un caché acotado
+# y compartido entre sesiones (piezas_cliente). Ahí mismo se guarda la
+# comparación contra el snapshot de la semana anterior y la tendencia
+# de cada sucursal (historia.py, ya reducida a pocos puntos).
+#
+# Las descargas (PDF, Excel) y el simulador son fragmentos (st.fragment):
+# al hacer clic en "Generar PDF" solo se vuelve a ejecutar esa sección,
+# no las gráficas, barras ni la tabla.
+#
+# Al arrancar o al publicarse un snapshot, calentar() precalcula en un
+# hilo aparte los datos, piezas, Excel y PDF de los clientes más
+# solicitados (accesos.py), para que la primera visita ya no espere.
+#
+# Las sesiones abiertas revisan cada INTERVALO_VIGILANCIA segundos la
+# versión publicada (un os.stat) en un fragmento que no dibuja nada. La
+# página solo se vuelve a ejecutar si cambiaron los números del cliente
+# (huellas_clientes); lo que no cambió el navegador no lo vuelve a pintar.
+#
+# Si la versión tiene particiones por cliente (particiones.py) solo se
+# leen las del cliente que se visita; si no, el snapshot completo.
+#
+# La vista interna muestra además las sucursales atípicas de toda la
+# versión (anomalias.py), calculadas una vez al publicar. Con "cambio
+# rápido" los datos de todos los clientes se envían una vez a una página
+# (navegador.py) que cambia de cliente sin volver al servidor.
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import logging
+import threading
+from datetime import datetime
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+import accesos
+import anomalias
+import historia
+from comparacion import comparar, fecha_version, huellas_clientes, snapshot_anterior
+from metricas import (AZUL, ROJO, VERDE, CENTAVOS, calcular_metricas, color_semaforo, formato_cambio,
+                      formato_pesos, pesos, tabla_sucursales)
+import memoria
+import navegador
+import particiones
+import ranking
+from modelo import construir_df, sucursales_cliente
+from simulador import faltante_cliente, simular
+from snapshots import leer_snapshot, version_publicada
+
+
+# Piezas de render compartidas entre sesiones: (cliente, versión, tema) -> figuras y HTML
+MAX_RENDERS = 256
+
+# Clientes más solicitados que se precalculan por versión, y temas para sus piezas
+CLIENTES_A_CALENTAR = 20
+TEMAS = ('light', 'dark')
+
+# Cada cuántos segundos una sesión abierta revisa si hay snapshot nuevo
+INTERVALO_VIGILANCIA = 60
+
+# Alto del iframe de navegador.py (con scroll adentro)
+ALTURA_NAVEGADOR = 1600
+
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+_log = logging.getLogger(__name__)
+
+
+@st.cache_resource(max_entries=3, show_spinner=False)
+def cargar_datos(version):
+    """Carga un snapshot una sola vez por proceso; al publicarse otra versión se carga la nueva.
+
+    Caben la versión publicada, la de la semana anterior y una más durante el cambio.
+    """
+    snapshot = leer_snapshot(version)
+    return construir_df(snapshot['columnas']), snapshot['clientes']
+
+
+def clientes(version):
+    """Lista de clientes: del manifiesto de particiones o, si no hay, del snapshot completo."""
+    manifiesto = particiones.manifiesto(version)
+    if manifiesto is not None:
+        return list(manifiesto['clientes'])
+    return cargar_datos(version)[1]
+
+
+def sucursales(version, cliente):
+    """Sucursales del cliente, de solo lectura.
+
+    Con particiones se lee solo la del cliente; si no, es una vista sobre
+    el snapshot completo compartido.
+    """
+    if particiones.manifiesto(version) is not None:
+        return particiones.cargar_cliente(version, cliente)
+    df, _ = cargar_datos(version)
+    return sucursales_cliente(df, cliente)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _historia_guardada(version):
+    guardada = historia.leer(version)
+    if guardada is None:
+        # Las excepciones no se guardan en el caché: se vuelve a buscar en el siguiente rerun
+        raise FileNotFoundError(version)
+    return guardada
+
+
+def tendencias(version):
+    """Historia reducida de todas las sucursales (filas en el orden de cargar_datos), o None.
+
+    Se calcula al publicar (historia.py); aquí solo se lee, nunca se calcula.
+    """
+    try:
+        return _historia_guardada(version)
+    except FileNotFoundError:
+        return None
+
+
+def _tendencia_cliente(version, df_cliente):
+    guardada = tendencias(version)
+    if guardada is None:
+        return None
+    series = guardada['series']
+    if series.shape[1] < 2:
+        return None  # Con un solo día no hay tendencia que mostrar
+    # El índice de las sucursales es su posición en el df completo (construir_df)
+    return series[df_cliente.index.to_numpy()]
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _ranking(version):
+    """Listas ordenadas de cumplimiento por zona y asesor (ranking.py)."""
+    return ranking.cargar(version)
+
+
+def _semana_anterior(cliente, version, df_cliente):
+    """Cambios del cliente contra la semana anterior; None si no hay historia.
+
+    Solo se comparan las sucursales del cliente en las dos versiones.
+    """
+    anterior = snapshot_anterior(version)
+    if anterior is None:
+        return None
+    df_anterior = sucursales(anterior, cliente)
+    return {
+        'fecha': fecha_version(anterior),
+        'metricas': calcular_metricas(df_anterior),
+        'cambios': comparar(df_cliente, df_anterior),
+    }
+
+
+def _tema():
+    """'light' o 'dark' (uno de TEMAS); 'light' si el navegador no lo reporta.
+
+    Así las llaves del caché son las mismas que precalienta calentar().
+    """
+    try:
+        tema = st.context.theme.type
+    except AttributeError:
+        tema = None
+    return tema if tema in TEMAS else 'light'
+
+
+def _html_encabezado(cliente, n_sucursales, metricas):
+    descuento = metricas['descuento']
+    color_desc = VERDE if descuento == 35 else AZUL
+    titulo = f"""
+    <div style="background: linear-gradient(90deg, {ROJO}, #991b1b); padding: 20px; border-radius: 15px;">
+        <h1 style="color: white; margin: 0;">🏍️ MOTODRIVE - Dashboard de Objetivos</h1>
+        <p style="color: rgba(255,255,255,0.8); margin: 5px 0 0 0;">Cliente: <b>{cliente}</b> | {n_sucursales} sucursales</p>
+    </div>
+    """
+    caja_descuento = f"""
+    <div style="background: #1e293b; padding: 20px; border-radius: 15px; text-align: center; border: 2px solid {color_desc};">
+        <p style="color: #94a3b8; margin: 0; font-size: 14px;">Descuento</p>
+        <p style="color: {color_desc}; margin: 0; font-size: 48px; font-weight: 800;">{descuento}%</p>
+    </div>
+    """
+    return titulo, caja_descuento
+
+
+def _html_avance(metricas):
+    barras = []
+    for nombre, pct, obj, res in [("REFACCIONES", metricas['pct_refacc'], metricas['obj_refacc'], metricas['res_refacc']),
+                                   ("BGO", metricas['pct_bgo'], metricas['obj_bgo'], metricas['res_bgo'])]:
+        color = color_semaforo(pct)
+        barras.append(f"""
+    <div style="margin-bottom: 15px;">
+        <div style="display: flex; justify-content: space-between;">
+            <span><b>{nombre}</b></span>
+            <span style="color: #64748b;">{formato_pesos(res)} / {formato_pesos(obj)}</span>
+            <span style="color: {color}; font-weight: 700;">{pct:.0f}%</span>
+        </div>
+        <div style="background: #e2e8f0; border-radius: 10px; height: 25px; overflow: hidden;">
+            <div style="background: {color}; width: {min(pct, 100)}%; height: 100%; border-radius: 10px;"></div>
+        </div>
+    </div>
+    """)
+    return barras
+
+
+def _figura_barras(metricas):
+    obj_refacc, obj_bgo = metricas['obj_refacc'], metricas['obj_bgo']
+    res_refacc, res_bgo = metricas['res_refacc'], metricas['res_bgo']
+
+    fig_barras = go.Figure()
+    fig_barras.add_trace(go.Bar(
+        name='Objetivo',
+        x=['REFACC', 'BGO'],
+        y=[pesos(obj_refacc), pesos(obj_bgo)],
+        marker_color=AZUL,
+        text=[formato_pesos(obj_refacc), formato_pesos(obj_bgo)],
+        textposition='outside'
+    ))
+    fig_barras.add_trace(go.Bar(
+        name='Resultado',
+        x=['REFACC', 'BGO'],
+        y=[pesos(res_refacc), pesos(res_bgo)],
+        marker_color=[color_semaforo(metricas['pct_refacc']), color_semaforo(metricas['pct_bgo'])],
+        text=[formato_pesos(res_refacc), formato_pesos(res_bgo)],
+        textposition='outside'
+    ))
+    fig_barras.update_layout(
+        title="Objetivo vs Resultado",
+        barmode='group',
+        height=400,
+        yaxis=dict(tickformat="$,.0f")
+    )
+    return fig_barras
+
+
+def _figura_dona(metricas):
+    obj_total, res_total = metricas['obj_total'], metricas['res_total']
+
+    fig_dona = go.Figure(data=[go.Pie(
+        labels=['Alcanzado', 'Pendiente'],
+        values=[pesos(res_total), pesos(max(0, obj_total - res_total))],
+        hole=0.6,
+        marker_colors=[VERDE, '#e2e8f0'],
+        textinfo='label+percent'
+    )])
+    fig_dona.update_layout(
+        title="Cumplimiento Global",
+        height=400,
+        annotations=[dict(
+            text=f"{metricas['pct_total']:.0f}%",
+            x=0.5, y=0.5,
+            font_size=36,
+            showarrow=False
+        )]
+    )
+    return fig_dona
+
+
+@st.cache_resource(max_entries=MAX_RENDERS, show_spinner=False)
+def _piezas_cliente(cliente, version, tema, con_historia, _df_cliente, _metricas):
+    """Figuras, HTML y tabla de un cliente, calculados una vez por proceso.
+
+    La llave es (cliente, versión, tema, con_historia): si la historia se
+    escribe después de la primera visita, la tabla se rehace con la
+    tendencia. Los argumentos con "_" no se usan
+    para la llave porque dependen solo de ella. Se guarda el go.Figure ya
+    construido (no su JSON): st.plotly_chart volvería a validar un dict,
+    mientras que de un Figure solo toma to_dict(). Las piezas son de solo
+    lectura.
+    """
+    semana = _semana_anterior(cliente, version, _df_cliente)
+    return {
+        'semana': semana,
+        'ranking': ranking.ranking_cliente(_ranking(version), _df_cliente, _metricas),
+        'encabezado': _html_encabezado(cliente, len(_df_cliente), _metricas),
+        'avance': _html_avance(_metricas),
+        'fig_barras': _figura_barras(_metricas),
+        'fig_dona': _figura_dona(_metricas),
+        'tabla': tabla_sucursales(_df_cliente, semana['cambios'] if semana else None,
+                                  _tendencia_cliente(version, _df_cliente)),
+    }
+
+
+def piezas_cliente(cliente, version, df_cliente, metricas):
+    return _piezas_cliente(cliente, version, _tema(), tendencias(version) is not None, df_cliente, metricas)
+
+
+def encabezado(piezas):
+    titulo, caja_descuento = piezas['encabezado']
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown(titulo, unsafe_allow_html=True)
+    with col2:
+        st.markdown(caja_descuento, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+
+def kpis(metricas, piezas):
+    semana = piezas['semana']
+    cambio = {}
+    if semana:
+        antes = semana['metricas']
+        cambio = {
+            'obj_total': formato_cambio(metricas['obj_total'] - antes['obj_total']),
+            'res_total': formato_cambio(metricas['res_total'] - antes['res_total']),
+            'pct_total': f"{metricas['pct_total'] - antes['pct_total']:+.0f} pts",
+            'pedidos': formato_cambio(metricas['pedidos'] - antes['pedidos']),
+        }
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("🎯 Objetivo", formato_pesos(metricas['obj_total']), cambio.get('obj_total'))
+    c2.metric("💰 Resultado", formato_pesos(metricas['res_total']), cambio.get('res_total'))
+    c3.metric("📊 Cumplimiento", f"{metricas['pct_total']:.0f}%", cambio.get('pct_total'))
+    c4.metric("📦 Pedidos", formato_pesos(metricas['pedidos']), cambio.get('pedidos'))
+    if semana:
+        st.caption(f"Cambio vs semana anterior (datos del {semana['fecha']:%d/%m/%Y})")
+
+    st.markdown("---")
+
+
+def comparativo(piezas):
+    """Lugar del cliente contra los clientes de su zona y de su asesor (sin nombres)."""
+    lugares = piezas['ranking']
+    if not lugares:
+        return
+    st.markdown("### 🏅 Comparativo con clientes similares")
+    titulos = {'zona': "Zona {}", 'asesor': "Asesor {}"}
+    for columna, (grupo, datos) in zip(st.columns(len(lugares)), lugares.items()):
+        posicion, total, top = datos['pct_total']
+        columna.metric(
+            f"{titulos[grupo].format(datos['valor'])} · cumplimiento total",
+            f"Top {top}%" if total > 1 else "Único cliente",
+        )
+        refacc, bgo = datos['pct_refacc'], datos['pct_bgo']
+        columna.caption(f"Lugar {posicion} de {total} · REFACC: top {refacc[2]}% · BGO: top {bgo[2]}%")
+    st.markdown("---")
+
+
+def avance_categorias(piezas):
+    st.markdown("### 📊 Avance por Categoría")
+    for barra in piezas['avance']:
+        st.markdown(barra, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+
+def graficas(piezas):
+    st.markdown("### 📈 Visualizaciones")
+
+    col_g1, col_g2 = st.columns(2)
+    with col_g1:
+        st.plotly_chart(piezas['fig_barras'], width='stretch')
+    with col_g2:
+        st.plotly_chart(piezas['fig_dona'], width='stretch')
+
+    st.markdown("---")
+
+
+def detalle_sucursales(piezas):
+    st.markdown("### 📋 Detalle por Sucursal")
+    st.dataframe(piezas['tabla'], width='stretch', hide_index=True, column_config={
+        'Tendencia': st.column_config.LineChartColumn("Tendencia (Res Total)", y_min=0),
+    })
+
+
+def nota():
+    st.markdown("---")
+    st.info("📌 **Nota:** Para obtener el descuento del 35% es necesario cubrir el 100% del objetivo de cada categoría, incluyendo manejo de Excellon al 100%.")
+
+
+def _tope_slider(objetivo, falta):
+    """Máximo del slider en pesos: cubre lo que falta con holgura, en miles."""
+    tope = max(objetivo, falta * 3 // 2) / CENTAVOS
+    return max(1000, int(-(-tope // 1000) * 1000))
+
+
+@st.fragment
+def simulador(metricas, df_cliente):
+    """¿Qué pasa si compro más? Fragmento: mover un slider solo recalcula esta sección.
+
+    Parte de las métricas ya agregadas del cliente; no vuelve a sumar sucursales.
+    """
+    st.markdown("---")
+    st.markdown("### 🧮 Simulador de Descuento")
+
+    falta = faltante_cliente(metricas)
+    if metricas['descuento'] == 35:
+        st.success("✅ Ya tienes el descuento del 35%")
+    elif not falta['alcanzable']:
+        st.info("Este cliente no tiene objetivo en todas las categorías, el 35% no aplica.")
+    else:
+        detalle = f"REFACC {formato_pesos(falta['refacc'])} · BGO {formato_pesos(falta['bgo'])}"
+        if falta['adicional_total']:
+            detalle += f" · {formato_pesos(falta['adicional_total'])} más en cualquier categoría"
+        st.markdown(f"Para llegar al **35%** te falta comprar **{formato_pesos(falta['compra_minima'])}** ({detalle})")
+
+    modo = st.radio("Simular compras por", ["Categoría", "Sucursal"], horizontal=True)
+    if modo == "Categoría":
+        c1, c2 = st.columns(2)
+        extra_refacc = c1.slider("➕ Compra adicional REFACC ($)", 0,
+                                 _tope_slider(metricas['obj_refacc'], falta['refacc'] + falta['adicional_total']),
+                                 0, step=1000)
+        extra_bgo = c2.slider("➕ Compra adicional BGO ($)", 0,
+                              _tope_slider(metricas['obj_bgo'], falta['bgo']), 0, step=1000)
+    else:
+        compras = st.data_editor(
+            pd.DataFrame({
+                'Sucursal': df_cliente['sucursal'].astype(str).tolist(),
+                'Extra REFACC ($)': 0,
+                'Extra BGO ($)': 0,
+            }),
+            disabled=['Sucursal'], hide_index=True, width='stretch',
+        )
+        extra_refacc = compras['Extra REFACC ($)'].fillna(0).sum()
+        extra_bgo = compras['Extra BGO ($)'].fillna(0).sum()
+
+    sim = simular(metricas, round(extra_refacc * CENTAVOS), round(extra_bgo * CENTAVOS))
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("REFACC", f"{sim['pct_refacc']:.0f}%", f"{sim['pct_refacc'] - metricas['pct_refacc']:+.0f} pts")
+    c2.metric("BGO", f"{sim['pct_bgo']:.0f}%", f"{sim['pct_bgo'] - metricas['pct_bgo']:+.0f} pts")
+    c3.metric("Total", f"{sim['pct_total']:.0f}%", f"{sim['pct_total'] - metricas['pct_total']:+.0f} pts")
+    c4.metric("Descuento", f"{sim['descuento']}%", f"{sim['descuento'] - metricas['descuento']:+d} pts")
+
+
+@st.cache_resource(max_entries=MAX_RENDERS, show_spinner=False)
+def _excel_cliente(cliente, version, _df_cliente, _metricas):
+    from reporte_excel import generar_excel_cliente
+    return generar_excel_cliente(cliente, _df_cliente, _metricas)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _excel_cartera(version):
+    """Libro de toda la cartera, uno por versión y compartido entre sesiones."""
+    from reporte_excel import generar_excel_cartera
+    df, _ = cargar_datos(version)
+    return generar_excel_cartera(df)
+
+
+@st.fragment
+def seccion_excel(cliente, df_cliente, metricas, version, cartera=False):
+    """Descargas en Excel. La cartera completa solo se ofrece en modo interno."""
+    st.markdown("### 📊 Exportar a Excel")
+    fecha = datetime.now().strftime('%Y%m%d')
+
+    st.download_button(
+        label="⬇️ Detalle por sucursal (Excel)",
+        data=_excel_cliente(cliente, version, df_cliente, metricas),
+        file_name=f"Detalle_{cliente.replace(' ', '_')}_{fecha}.xlsx",
+        mime=MIME_XLSX,
+        on_click="ignore",
+    )
+
+    if not cartera:
+        return
+    clave = f"cartera::{version}"
+    if st.button("📦 Preparar cartera completa"):
+        with st.spinner("Generando Excel de la cartera..."):
+            _excel_cartera(version)
+        st.session_state[clave] = True
+    if st.session_state.get(clave):
+        st.download_button(
+            label="⬇️ Descargar cartera completa (Excel)",
+            data=_excel_cartera(version),
+            file_name=f"Cartera_{fecha}.xlsx",
+            mime=MIME_XLSX,
+            on_click="ignore",
+        )
+
+
+@st.cache_resource(max_entries=MAX_RENDERS, show_spinner=False)
+def _pdf_cliente(cliente, version, _df_cliente, _metricas):
+    """PDF de un cliente, uno por versión y compartido entre sesiones (fechado con el snapshot)."""
+    # Import diferido: matplotlib/fpdf solo se cargan si se usa esta sección
+    from reporte_pdf import generar_pdf
+    # Sin snapshot (respaldo datos.py) el PDF usa su fecha por defecto
+    return generar_pdf(cliente, _df_cliente, _metricas, fecha_version(version) if version else None)
+
+
+@st.fragment
+def seccion_pdf(cliente, df_cliente, metricas, version):
+    """Botón de PDF. Es un fragmento: sus clics no vuelven a ejecutar la página."""
+    st.markdown("---")
+    st.markdown("### 📥 Descargar Reporte")
+
+    clave = f"pdf::{cliente}::{version}"
+    if st.button("📄 Generar PDF", type="primary"):
+        with st.spinner("Generando PDF..."):
+            try:
+                _pdf_cliente(cliente, version, df_cliente, metricas)
+                st.session_state[clave] = True
+            except Exception as e:
+                st.error(f"Error al generar PDF: {e}")
+        contabilizar_sesion()
+
+    if st.session_state.get(clave):
+        st.download_button(
+            label="⬇️ Descargar PDF",
+            data=_pdf_cliente(cliente, version, df_cliente, metricas),
+            file_name=f"Reporte_{cliente.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf",
+            mime="application/pdf",
+            on_click="ignore",
+        )
+        st.success("✅ PDF generado correctamente. Haz clic en 'Descargar PDF'")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# DATOS NUEVOS EN SESIONES ABIERTAS
+# ═══════════════════════════════════════════════════════════════════
+
+@st.cache_resource(max_entries=3, show_spinner=False)
+def _huellas(version):
+    df, _ = cargar_datos(version)
+    return huellas_clientes(df)
+
+
+def _huella(version, cliente):
+    manifiesto = particiones.manifiesto(version)
+    if manifiesto is not None:
+        entrada = manifiesto['clientes'].get(cliente)
+        return entrada and entrada['huella']
+    huella = _huellas(version).get(cliente)
+    return None if huella is None else str(huella)
+
+
+def _cambio_cliente(cliente, vista, nueva):
+    """True si los números de `cliente` son distintos entre dos versiones."""
+    return _huella(vista, cliente) != _huella(nueva, cliente)
+
+
+@st.fragment(run_every=INTERVALO_VIGILANCIA)
+def _vigilar(cliente):
+    vista = st.session_state.get('version_vista')
+    nueva = version_publicada()
+    if nueva is None or nueva == vista:
+        return
+    if _cambio_cliente(cliente, vista, nueva):
+        st.session_state['datos_nuevos'] = True
+        st.rerun()
+    # Snapshot nuevo sin cambios para este cliente: no hay nada que refrescar
+    st.session_state['version_vista'] = nueva
+
+
+def vigilar_version(cliente, version):
+    """Refresca la página cuando se publica un snapshot que cambia los números de `cliente`."""
+    st.session_state['version_vista'] = version
+    if st.session_state.pop('datos_nuevos', False):
+        st.toast("🔄 Datos actualizados")
+    _vigilar(cliente)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# PRECALENTAR CACHÉS
+# ═══════════════════════════════════════════════════════════════════
+
+def registrar_visita(cliente):
+    """Cuenta la visita a `cliente` (?cliente=) una vez por sesión."""
+    clave = f"visita::{cliente}"
+    if clave not in st.session_state:
+        st.session_state[clave] = True
+        accesos.registrar(cliente)
+
+
+def _calentar(version, mas_solicitados):
+    disponibles = set(clientes(version))
+    for cliente in mas_solicitados:
+        if cliente not in disponibles:
+            continue
+        df_cliente = sucursales(version, cliente)
+        metricas = calcular_metricas(df_cliente)
+        for tema in TEMAS:
+            _piezas_cliente(cliente, version, tema, tendencias(version) is not None, df_cliente, metricas)
+        _excel_cliente(cliente, version, df_cliente, metricas)
+        _pdf_cliente(cliente, version, df_cliente, metricas)
+
+
+def _calentar_seguro(version, mas_solicitados):
+    try:
+        _calentar(version, mas_solicitados)
+    except Exception:  # Solo es una optimización: un error no debe tumbar nada
+        _log.exception("No se pudo precalentar %s", version)
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def calentar(version):
+    """Arranca, una vez por versión y proceso, el hilo que precalcula los clientes más solicitados."""
+    hilo = threading.Thread(target=_calentar_seguro, args=(version, accesos.mas_solicitados(CLIENTES_A_CALENTAR)),
+                            name=f"calentar-{version}", daemon=True)
+    # Con el contexto de la sesión que lo arranca, st.cache_resource funciona igual que en un rerun
+    add_script_run_ctx(hilo, get_script_run_ctx())
+    hilo.start()
+    return hilo
+
+
+# ═══════════════════════════════════════════════════════════════════
+# MEMORIA (MODO INTERNO)
+# ═══════════════════════════════════════════════════════════════════
+
+def contabilizar_sesion():
+    """Registra los bytes que retiene esta sesión (al final de cada rerun)."""
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        memoria.registrar_sesion(ctx.session_id, st.session_state)
+
+
+@st.cache_resource(max_entries=3, show_spinner=False)
+def _bytes_datos(version):
+    df, _ = cargar_datos(version)
+    return memoria.tamano(df)
+
+
+def _mb(valor):
+    return "—" if valor is None else f"{valor / 1e6:,.1f} MB"
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _anomalias(version):
+    """Sucursales atípicas de la versión (anomalias.py), montos en pesos."""
+    return anomalias.cargar(version)
+
+
+def panel_anomalias(version):
+    """Anomalías de todas las sucursales, solo en la vista interna."""
+    encontradas = _anomalias(version)
+    with st.expander(f"🚨 Anomalías ({len(encontradas)})", expanded=False):
+        if encontradas.empty:
+            st.caption("Sin sucursales atípicas en esta versión.")
+            return
+        st.dataframe(
+            encontradas,
+            hide_index=True,
+            column_config={
+                'puntaje': st.column_config.NumberColumn(format="%.1f"),
+                'resultado': st.column_config.NumberColumn(format="dollar"),
+                'objetivo': st.column_config.NumberColumn(format="dollar"),
+                'pedidos': st.column_config.NumberColumn(format="dollar"),
+            },
+        )
+        st.caption("Puntaje: z robusto (mediana / MAD) contra todas las sucursales; "
+                   "en resultado_bajo, % del objetivo que bajó.")
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _datos_navegador(version):
+    """Totales y sucursales de todos los clientes, comprimidos para navegador.py."""
+    return navegador.comprimir(navegador.datos(cargar_datos(version)[0], version))
+
+
+def selector_cliente(version, clientes):
+    """Selector de cliente de la vista interna; None si está activo el cambio rápido.
+
+    Con el cambio rápido el selectbox del servidor no se dibuja (cambiarlo
+    sería un rerun): el cliente se elige dentro de navegador_clientes,
+    que arranca en el último cliente elegido con el selectbox.
+    """
+    ultimo = st.session_state.get('ultimo_cliente')
+    if st.sidebar.toggle("⚡ Cambio rápido en el navegador",
+                         help="Carga todos los clientes una vez; cambiar de cliente ya no recarga la página"):
+        navegador_clientes(version, ultimo)
+        return None
+    indice = clientes.index(ultimo) if ultimo in clientes else 0
+    cliente = st.sidebar.selectbox("👤 Cliente:", clientes, index=indice)
+    st.session_state['ultimo_cliente'] = cliente
+    return cliente
+
+
+def navegador_clientes(version, inicial=None):
+    """Vista interna que cambia de cliente en el navegador, sin rerun por cliente.
+
+    El iframe se vuelve a crear solo si cambia la versión, el tema o el
+    cliente inicial; mientras tanto los cambios de cliente no tocan al servidor.
+    """
+    st.iframe(navegador.pagina(_datos_navegador(version), _tema(), inicial), height=ALTURA_NAVEGADOR)
+
+
+def panel_memoria(version):
+    """Memoria del proceso y de las sesiones, en la barra lateral."""
+    reporte = memoria.reporte()
+    if particiones.manifiesto(version) is not None:
+        abiertas = particiones.en_memoria()
+        datos = sum(memoria.tamano(df) for df in abiertas)
+        detalle = f" ({len(abiertas)} particiones abiertas)"
+    else:
+        anterior = snapshot_anterior(version)
+        datos = _bytes_datos(version) + (_bytes_datos(anterior) if anterior else 0)
+        detalle = ""
+    with st.sidebar.expander("🧠 Memoria"):
+        st.markdown(
+            f"**Proceso:** {_mb(reporte['proceso_rss'])} (pico {_mb(reporte['proceso_pico'])})  \n"
+            f"**Datos compartidos:** {_mb(datos)}{detalle}  \n"
+            f"**Sesiones activas:** {reporte['sesiones']}  \n"
+            f"**Retenido por sesiones:** {_mb(reporte['sesiones_total'])} "
+            f"(máx. {_mb(reporte['sesion_maxima'])}, prom. {_mb(reporte['sesion_promedio'])})"
+        )
@@ -0,0 +1,112 @@
+# ═══════════════════════════════════════════════════════════════════
+# SIMULADOR DEL DESCUENTO DEL 35%
+# ═══════════════════════════════════════════════════════════════════
+#
+# ¿Cuánto más necesita comprar un cliente de REFACC y BGO para llegar
+# al 35%? Todo se calcula sobre los totales ya agregados del cliente
+# (el dict de calcular_metricas o el groupby de agregados_clientes),
+# sin volver a recorrer las sucursales.
+#
+# Modo batch, todos los clientes en una sola pasada vectorizada:
+#     python simulador.py
+#     python simulador.py -o faltantes.csv
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from metricas import agregados_clientes, califica_descuento, formato_pesos, metricas_desde_totales
+from modelo import cargar_df
+
+
+def simular(metricas, extra_refacc=0, extra_bgo=0):
+    """Métricas del cliente si comprara `extra_*` centavos adicionales.
+
+    Las compras extra cuentan para su categoría y para el total.
+    """
+    totales = {k: v for k, v in metricas.items() if k.startswith(('obj_', 'res_')) or k == 'pedidos'}
+    totales['res_refacc'] += extra_refacc
+    totales['res_bgo'] += extra_bgo
+    totales['res_total'] += extra_refacc + extra_bgo
+    return metricas_desde_totales(totales)
+
+
+def faltantes(obj_refacc, res_refacc, obj_bgo, res_bgo, obj_total, res_total):
+    """Compra mínima (centavos) para el 35%: (refacc, bgo, total adicional).
+
+    Acepta escalares o Series. Primero se cubre cada categoría; si con eso
+    el total aún no llega al objetivo, el resto puede ser de cualquier
+    categoría. La comparación es exacta en enteros (res >= obj).
+    """
+    falta_refacc = np.maximum(obj_refacc - res_refacc, 0)
+    falta_bgo = np.maximum(obj_bgo - res_bgo, 0)
+    falta_total = np.maximum(obj_total - (res_total + falta_refacc + falta_bgo), 0)
+    return falta_refacc, falta_bgo, falta_total
+
+
+def faltante_cliente(metricas):
+    """Dict con lo que le falta a un cliente para el 35%."""
+    falta_refacc, falta_bgo, falta_total = faltantes(
+        metricas['obj_refacc'], metricas['res_refacc'], metricas['obj_bgo'],
+        metricas['res_bgo'], metricas['obj_total'], metricas['res_total'],
+    )
+    return {
+        'refacc': int(falta_refacc),
+        'bgo': int(falta_bgo),
+        'adicional_total': int(falta_total),
+        'compra_minima': int(falta_refacc + falta_bgo + falta_total),
+        # Sin objetivo en alguna categoría el 35% no se puede alcanzar
+        'alcanzable': metricas['obj_refacc'] > 0 and metricas['obj_bgo'] > 0 and metricas['obj_total'] > 0,
+    }
+
+
+def faltantes_todos(agregados):
+    """Compra mínima para el 35% de cada cliente, en una pasada vectorizada.
+
+    `agregados` es el resultado de metricas.agregados_clientes (centavos).
+    """
+    a = agregados
+    falta_refacc, falta_bgo, falta_total = faltantes(
+        a['objRefacc'], a['resRefacc'], a['objBgo'], a['resBgo'], a['objTotal'], a['resTotal'],
+    )
+    resultado = pd.DataFrame({
+        'faltaRefacc': falta_refacc,
+        'faltaBgo': falta_bgo,
+        'faltaAdicional': falta_total,
+    })
+    resultado['compraMinima'] = resultado.sum(axis=1)
+    resultado['tiene35'] = califica_descuento(a['resRefacc'], a['objRefacc'], a['resBgo'], a['objBgo'],
+                                              a['resTotal'], a['objTotal'])
+    resultado['alcanzable'] = (a['objRefacc'] > 0) & (a['objBgo'] > 0) & (a['objTotal'] > 0)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compra mínima de cada cliente para el descuento del 35%")
+    parser.add_argument("-o", "--salida", help="Guardar resultado en CSV (montos en pesos)")
+    parser.add_argument("--top", type=int, default=15, help="Clientes más cercanos a mostrar")
+    args = parser.parse_args()
+
+    df, _ = cargar_df()
+    resultado = faltantes_todos(agregados_clientes(df))
+
+    pendientes = resultado[~resultado['tiene35'] & resultado['alcanzable']].sort_values('compraMinima')
+    print(f"✅ {int(resultado['tiene35'].sum())} clientes ya tienen el 35%")
+    print(f"🎯 {len(pendientes)} clientes pueden alcanzarlo. Los más cercanos:\n")
+    for cliente, fila in pendientes.head(args.top).iterrows():
+        print(f"  {cliente:<45} {formato_pesos(fila['compraMinima']):>14}"
+              f"  (REFACC {formato_pesos(fila['faltaRefacc'])}, BGO {formato_pesos(fila['faltaBgo'])})")
+
+    if args.salida:
+        salida = resultado.copy()
+        for col in ['faltaRefacc', 'faltaBgo', 'faltaAdicional', 'compraMinima']:
+            salida[col] = salida[col] / 100
+        salida.to_csv(args.salida, encoding='utf-8-sig')
+        print(f"\n📝 {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
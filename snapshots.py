@@ -0,0 +1,203 @@
+# ═══════════════════════════════════════════════════════════════════
+# SNAPSHOTS VERSIONADOS DE LOS DATOS
+# ═══════════════════════════════════════════════════════════════════
+#
+# Cada actualización se guarda en snapshots/<version>.json, donde la
+# versión es "AAAAMMDD-HHMMSS-<hash del contenido>". El archivo
+# snapshots/ACTUAL indica qué versión está publicada y se reemplaza
+# de forma atómica (os.replace), así que un dashboard nunca ve un
+# archivo a medio escribir.
+#
+# Los montos (COLUMNAS_DINERO) se guardan como centavos enteros.
+#
+# Los dashboards revisan ACTUAL con un simple os.stat en cada rerun y
+# cargan la nueva versión sin reiniciar el proceso.
+#
+# USO:
+#   python snapshots.py lista              -> muestra las versiones
+#   python snapshots.py rollback           -> vuelve a la versión anterior
+#   python snapshots.py rollback VERSION   -> publica una versión concreta
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# MOTODRIVE_SNAPSHOTS permite usar otra carpeta (benchmarks, pruebas)
+DIRECTORIO = Path(os.environ.get("MOTODRIVE_SNAPSHOTS", Path(__file__).resolve().parent / "snapshots"))
+PUNTERO = DIRECTORIO / "ACTUAL"
+DATOS_PY = Path(__file__).resolve().parent / "datos.py"
+
+# Columnas de montos; en el snapshot van en centavos (int)
+COLUMNAS_DINERO = ['objRefacc', 'objBgo', 'objAcc', 'objTotal',
+                   'resRefacc', 'resBgo', 'resAcc', 'resTotal', 'pedidos']
+UNIDADES = "centavos"
+
+# (st_mtime_ns, st_size) -> versión leída, para no abrir ACTUAL en cada rerun
+_cache_puntero = {}
+
+
+def escribir_atomico(ruta, contenido):
+    """Escribe bytes en `ruta` vía archivo temporal + os.replace."""
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=ruta.parent, prefix=f".{ruta.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(contenido)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, ruta)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def hash_version(version):
+    return version.rsplit("-", 1)[-1]
+
+
+def ruta_snapshot(version):
+    return DIRECTORIO / f"{version}.json"
+
+
+def versiones():
+    """Versiones guardadas, de la más antigua a la más reciente."""
+    if not DIRECTORIO.exists():
+        return []
+    return sorted(p.stem for p in DIRECTORIO.glob("*.json"))
+
+
+def version_publicada():
+    """Versión apuntada por ACTUAL, o None si aún no hay snapshots.
+
+    Solo hace un os.stat por llamada; el archivo se vuelve a leer únicamente
+    cuando cambia su mtime o tamaño.
+    """
+    try:
+        st = os.stat(PUNTERO)
+    except FileNotFoundError:
+        return None
+    clave = (st.st_mtime_ns, st.st_size)
+    version = _cache_puntero.get(clave)
+    if version is None:
+        version = PUNTERO.read_text(encoding="utf-8").strip()
+        _cache_puntero.clear()
+        _cache_puntero[clave] = version
+    return version
+
+
+def publicar(version):
+    """Apunta ACTUAL a una versión existente (reemplazo atómico)."""
+    if not ruta_snapshot(version).exists():
+        raise FileNotFoundError(f"No existe el snapshot '{version}'")
+    escribir_atomico(PUNTERO, f"{version}\n".encode("utf-8"))
+
+
+def publicar_snapshot(columnas, clientes, generado=None):
+    """Guarda un snapshot nuevo y lo publica. Regresa la versión.
+
+    `columnas` es un dict {columna: lista de valores}, con los montos en
+    centavos. Si el contenido es idéntico al publicado no se crea una
+    versión nueva.
+    """
+    generado = generado or datetime.now()
+    contenido = {"columnas": columnas, "clientes": clientes, "unidades": UNIDADES}
+    cuerpo = json.dumps(contenido, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(cuerpo.encode("utf-8")).hexdigest()[:12]
+
+    actual = version_publicada()
+    if actual and hash_version(actual) == digest:
+        return actual
+
+    version = f"{generado:%Y%m%d-%H%M%S}-{digest}"
+    contenido["version"] = version
+    contenido["generado"] = generado.isoformat(timespec="seconds")
+    escribir_atomico(
+        ruta_snapshot(version),
+        json.dumps(contenido, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+    )
+    publicar(version)
+    return version
+
+
+def _leer_datos_py():
+    """Compatibilidad: carga el datos.py generado por versiones anteriores."""
+    espacio = {}
+    exec(compile(DATOS_PY.read_text(encoding="utf-8"), str(DATOS_PY), "exec"), espacio)
+    datos = espacio["DATOS"]
+    columnas = {}
+    for fila in datos:
+        for col, valor in fila.items():
+            columnas.setdefault(col, []).append(valor)
+    return {"version": None, "generado": None, "columnas": columnas, "clientes": espacio["CLIENTES"]}
+
+
+def _a_centavos(contenido):
+    """Snapshots anteriores guardaban pesos con 2 decimales."""
+    if contenido.get("unidades") != UNIDADES:
+        columnas = contenido["columnas"]
+        for col in COLUMNAS_DINERO:
+            if col in columnas:
+                columnas[col] = [round(v * 100) for v in columnas[col]]
+        contenido["unidades"] = UNIDADES
+    return contenido
+
+
+def leer_snapshot(version):
+    """Contenido de un snapshot: dict con version, generado, columnas y clientes.
+
+    Con version=None (todavía no hay snapshots publicados) se usa datos.py.
+    Los montos siempre se regresan en centavos.
+    """
+    if version is None:
+        return _a_centavos(_leer_datos_py())
+    with open(ruta_snapshot(version), encoding="utf-8") as f:
+        return _a_centavos(json.load(f))
+
+
+def rollback(version=None):
+    """Publica `version`, o la anterior a la actual si no se indica."""
+    disponibles = versiones()
+    if version is None:
+        actual = version_publicada()
+        if actual not in disponibles:
+            raise ValueError("No hay una versión publicada para hacer rollback")
+        posicion = disponibles.index(actual)
+        if posicion == 0:
+            raise ValueError(f"'{actual}' es la versión más antigua disponible")
+        version = disponibles[posicion - 1]
+    publicar(version)
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Administrar snapshots de datos del dashboard")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("lista", help="Mostrar versiones guardadas")
+    p_rb = sub.add_parser("rollback", help="Publicar una versión anterior")
+    p_rb.add_argument("version", nargs="?", help="Versión a publicar (por defecto, la anterior)")
+    args = parser.parse_args()
+
+    if args.comando == "lista":
+        actual = version_publicada()
+        for v in versiones():
+            marca = "👉" if v == actual else "  "
+            print(f"{marca} {v}")
+    elif args.comando == "rollback":
+        try:
+            version = rollback(args.version)
+        except (ValueError, FileNotFoundError) as e:
+            print(f"❌ ERROR: {e}")
+            raise SystemExit(1)
+        print(f"✅ Versión publicada: {version}")
+
+
+if __name__ == "__main__":
+    main()
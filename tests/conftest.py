@@ -0,0 +1,26 @@
+# Las pruebas importan los módulos de la raíz y escriben snapshots en una
+# carpeta temporal (MOTODRIVE_SNAPSHOTS se lee al importar snapshots.py).
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+_TMP = tempfile.mkdtemp(prefix="pruebas_motodrive_")
+atexit.register(shutil.rmtree, _TMP, ignore_errors=True)
+os.environ["MOTODRIVE_SNAPSHOTS"] = str(Path(_TMP) / "snapshots")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def directorio():
+    """Carpeta de snapshots vacía para la prueba."""
+    from snapshots import DIRECTORIO
+    shutil.rmtree(DIRECTORIO, ignore_errors=True)
+    DIRECTORIO.mkdir(parents=True)
+    return DIRECTORIO
@@ -0,0 +1,54 @@
+import numpy as np
+
+import anomalias
+from modelo import construir_df, datos_sinteticos
+
+
+def _con_cumplimiento(cumplimiento, semilla=0):
+    """Snapshot sintético con resTotal = objTotal * cumplimiento y pedidos parecidos al resultado."""
+    columnas = datos_sinteticos(len(cumplimiento), semilla)
+    rng = np.random.default_rng(semilla)
+    obj = np.asarray(columnas['objTotal'])
+    res = (obj * np.clip(cumplimiento, 0, None)).astype('int64')
+    columnas['resTotal'] = res.tolist()
+    columnas['pedidos'] = (res * rng.uniform(1.0, 1.6, len(res))).astype('int64').tolist()
+    return construir_df(columnas)
+
+
+def test_distribucion_normal_no_marca_nada():
+    rng = np.random.default_rng(1)
+    df = _con_cumplimiento(rng.normal(0.6, 0.15, 2000))
+    assert len(anomalias.detectar(df)) == 0
+
+
+def test_cumplimiento_ordinario_bajo_no_se_marca():
+    rng = np.random.default_rng(2)
+    df = _con_cumplimiento(rng.beta(2, 3, 2000))
+    marcadas = anomalias.detectar(df)
+    assert len(marcadas) <= 2
+
+
+def test_marca_extremos():
+    rng = np.random.default_rng(3)
+    cumplimiento = rng.normal(0.6, 0.15, 500)
+    cumplimiento[7] = 0.001
+    df = _con_cumplimiento(cumplimiento)
+    marcadas = anomalias.detectar(df)
+    assert marcadas['sucursal'].tolist() == [str(df['sucursal'].iat[7])]
+    assert marcadas['tipo'].tolist() == ['cumplimiento_atipico']
+
+
+def test_grupo_chico_no_marca():
+    cumplimiento = np.full(anomalias.MINIMO_GRUPO - 1, 0.6)
+    cumplimiento[0] = 0.0001
+    assert anomalias.detectar(_con_cumplimiento(cumplimiento)).empty
+
+
+def test_resultado_bajo_contra_anterior():
+    rng = np.random.default_rng(4)
+    df = _con_cumplimiento(rng.normal(0.6, 0.15, 200))
+    anterior = df.copy()
+    anterior.loc[5, 'resTotal'] += 10_000
+    marcadas = anomalias.detectar(df, anterior)
+    assert marcadas['tipo'].tolist() == ['resultado_bajo']
+    assert marcadas['sucursal'].tolist() == [str(df['sucursal'].iat[5])]
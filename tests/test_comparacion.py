@@ -0,0 +1,31 @@
+from comparacion import snapshot_anterior
+
+
+def _version(directorio, fecha, digest):
+    version = f"{fecha}-{digest}"
+    (directorio / f"{version}.json").write_text("{}", encoding="utf-8")
+    return version
+
+
+def test_sin_snapshot_viejo_no_hay_comparacion(directorio):
+    _version(directorio, "20260105-090000", "aaaaaaaaaaaa")
+    actual = _version(directorio, "20260108-090000", "bbbbbbbbbbbb")
+    assert snapshot_anterior(actual) is None
+    assert snapshot_anterior(None) is None
+
+
+def test_el_mas_reciente_de_al_menos_una_semana(directorio):
+    _version(directorio, "20260101-090000", "aaaaaaaaaaaa")
+    hace_siete = _version(directorio, "20260105-090000", "bbbbbbbbbbbb")
+    _version(directorio, "20260105-090001", "cccccccccccc")   # 6 días 23:59:59 antes
+    _version(directorio, "20260110-090000", "dddddddddddd")
+    actual = _version(directorio, "20260112-090000", "eeeeeeeeeeee")
+    assert snapshot_anterior(actual) == hace_siete
+    assert snapshot_anterior(actual, dias=1) == "20260110-090000-dddddddddddd"
+
+
+def test_no_usa_versiones_posteriores(directorio):
+    viejo = _version(directorio, "20260101-090000", "aaaaaaaaaaaa")
+    actual = _version(directorio, "20260112-090000", "bbbbbbbbbbbb")
+    _version(directorio, "20260201-090000", "cccccccccccc")
+    assert snapshot_anterior(actual) == viejo
@@ -0,0 +1,35 @@
+import numpy as np
+
+from metricas import califica_descuento, cumple
+
+
+def test_cumple_en_el_limite_exacto():
+    # $700.00 de $1,000.00 es exactamente 70%; un centavo menos ya no
+    assert cumple(70_000, 100_000, 70)
+    assert not cumple(69_999, 100_000, 70)
+    assert cumple(100_000, 100_000)
+    assert not cumple(99_999, 100_000)
+
+
+def test_cumple_sin_objetivo_es_falso():
+    assert not cumple(0, 0)
+    assert not cumple(50_000, 0, 70)
+
+
+def test_cumple_vectorizado():
+    res = np.array([69_999, 70_000, 100_000, 10])
+    obj = np.array([100_000, 100_000, 100_000, 0])
+    assert cumple(res, obj, 70).tolist() == [False, True, True, False]
+
+
+def test_cumple_donde_flotantes_fallarian():
+    # 0.7 * 10 en flotantes es 7.000000000000001; en centavos 7 >= 7
+    assert cumple(7, 10, 70)
+
+
+def test_descuento_necesita_cada_categoria_al_100():
+    assert califica_descuento(100_000, 100_000, 50_000, 50_000, 150_000, 150_000)
+    # Total al 100% pero BGO un centavo abajo
+    assert not califica_descuento(100_001, 100_000, 49_999, 50_000, 150_000, 150_000)
+    # Refacciones sobradas no compensan un total incompleto
+    assert not califica_descuento(200_000, 100_000, 50_000, 50_000, 149_999, 150_000)
@@ -0,0 +1,45 @@
+import particiones
+from modelo import construir_df, datos_sinteticos
+
+
+def _valores(serie):
+    return serie.astype(object).where(serie.notna(), None).tolist()
+
+
+def test_ida_y_vuelta(directorio):
+    columnas = datos_sinteticos(300)
+    n = len(columnas['clientName'])
+    # Textos de distinto largo (no se truncan al más corto) y vacíos
+    columnas['asesor'] = (['LIDIA', 'AL', None, ''] * n)[:n]
+    version = '20260105-093000-aaaaaaaaaaaa'
+    manifiesto = particiones.escribir(version, columnas)
+
+    df = construir_df(columnas)
+    assert manifiesto['sucursales'] == n
+    assert set(manifiesto['clientes']) == set(df['clientName'].astype(str))
+    for cliente in manifiesto['clientes']:
+        parte = particiones.cargar_cliente(version, cliente)
+        esperado = df[df['clientName'] == cliente]
+        assert parte.index.tolist() == esperado.index.tolist()
+        for col in df.columns:
+            assert _valores(parte[col]) == _valores(esperado[col]), (cliente, col)
+
+
+def test_reescribir_la_misma_version(directorio):
+    version = '20260105-093000-bbbbbbbbbbbb'
+    particiones.escribir(version, datos_sinteticos(20))
+    primero = next(iter(particiones.manifiesto(version)['clientes']))
+    particiones.cargar_cliente(version, primero)
+    particiones.escribir(version, datos_sinteticos(40, semilla=1))
+    # Lo abierto antes de reescribir no se sigue usando
+    assert particiones.manifiesto(version)['sucursales'] == 40
+    assert len(particiones.cargar_cliente(version, primero)) == len(
+        construir_df(datos_sinteticos(40, semilla=1)).query('clientName == @primero'))
+    # No quedan carpetas temporales ni la versión vieja
+    assert [p.name for p in particiones.DIRECTORIO_PARTICIONES.iterdir()] == [version]
+
+
+def test_cliente_desconocido(directorio):
+    version = '20260105-093000-cccccccccccc'
+    particiones.escribir(version, datos_sinteticos(10))
+    assert particiones.cargar_cliente(version, 'NO EXISTE').empty
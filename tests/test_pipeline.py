@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pipeline
+from modelo import datos_sinteticos
+from snapshots import publicar_snapshot
+
+
+def _publicar(filas=60, semilla=0):
+    columnas = datos_sinteticos(filas, semilla)
+    return publicar_snapshot(columnas, sorted(set(columnas['clientName'])), datetime(2026, 1, 5, 9, 30))
+
+
+def _estados(reporte):
+    return {nombre: r['estado'] for nombre, r in reporte['etapas'].items()}
+
+
+def test_se_omite_si_las_entradas_no_cambian(directorio, tmp_path):
+    version = _publicar()
+    salida = tmp_path / "artefactos"
+    assert _estados(pipeline.ejecutar(version, salida, procesos=1, solo=['metricas'])) == {'metricas': 'ok'}
+    assert _estados(pipeline.ejecutar(version, salida, procesos=1, solo=['metricas'])) == {'metricas': 'omitida'}
+    assert _estados(pipeline.ejecutar(version, salida, procesos=1, solo=['metricas'], forzar=True)) == {
+        'metricas': 'ok'}
+
+
+def test_corre_si_falta_una_salida(directorio, tmp_path):
+    version = _publicar()
+    salida = tmp_path / "artefactos"
+    pipeline.ejecutar(version, salida, procesos=1, solo=['metricas'])
+    (salida / "clientes.csv").unlink()
+    assert _estados(pipeline.ejecutar(version, salida, procesos=1, solo=['metricas'])) == {'metricas': 'ok'}
+    assert (salida / "clientes.csv").exists()
+
+
+def test_otra_version_vuelve_a_correr(directorio, tmp_path):
+    salida = tmp_path / "artefactos"
+    pipeline.ejecutar(_publicar(), salida, procesos=1, solo=['metricas'])
+    nueva = _publicar(semilla=1)
+    assert _estados(pipeline.ejecutar(nueva, salida, procesos=1, solo=['metricas'])) == {'metricas': 'ok'}
@@ -0,0 +1,51 @@
+import pandas as pd
+
+import validacion
+
+
+def _hoja(**cambios):
+    """Hoja de 3 sucursales válidas; `cambios` reemplaza columnas."""
+    columnas = {
+        'CLIENT_NUM': ['C1', 'C1', 'C2'], 'clientName': ['ANA', 'ANA', 'LIDIA'],
+        'sucursal': ['CENTRO', 'NORTE', 'SUR'], 'asesor': ['ERICK'] * 3, 'zona': [1, 1, 2],
+        'ESTATUS': ['ACTIVO'] * 3,
+        'objRefacc': [100.0, 200.0, 300.0], 'objBgo': [50.0, 50.0, 50.0], 'objAcc': [0.0, 0.0, 10.0],
+        'objTotal': [150.0, 250.0, 360.0],
+        'resRefacc': [10.5, 20.0, 30.0], 'resBgo': [5.0, 5.0, 5.0], 'resAcc': [0.0, 0.0, 1.0],
+        'resTotal': [15.5, 25.0, 36.0], 'pedidos': [0.0, 0.0, 0.0],
+    }
+    columnas.update(cambios)
+    return pd.DataFrame(columnas)
+
+
+def test_hoja_valida():
+    limpio, cuarentena, avisos = validacion.validar(_hoja())
+    assert len(limpio) == 3 and cuarentena.empty and avisos.empty
+
+
+def test_cuarentena_de_valores_ilegibles():
+    hoja = _hoja(resBgo=[5.0, 'N/D', 5.0], sucursal=['CENTRO', 'CENTRO', ''])
+    limpio, cuarentena, _ = validacion.validar(hoja)
+    assert limpio['sucursal'].tolist() == ['CENTRO']
+    motivos = dict(zip(cuarentena.index, cuarentena['motivo']))
+    assert motivos[1] == 'resBgo no es número; sucursal repetida'
+    assert motivos[2] == 'sin sucursal'
+    # La cuarentena conserva el valor original, no un 0
+    assert cuarentena.loc[1, 'resBgo'] == 'N/D'
+    assert validacion.resumen(cuarentena)['resBgo no es número'] == 1
+
+
+def test_celdas_vacias_cuentan_como_cero():
+    limpio, cuarentena, _ = validacion.validar(_hoja(pedidos=[None, '', 3.0]))
+    assert cuarentena.empty
+    assert limpio['pedidos'].tolist() == [0, 0, 3]
+
+
+def test_totales_que_no_cuadran_se_publican_con_aviso():
+    # Diferencia de $1 exacto: tolerada; de $5: aviso, la fila se publica
+    hoja = _hoja(resTotal=[16.5, 30.0, 36.0])
+    limpio, cuarentena, avisos = validacion.validar(hoja)
+    assert cuarentena.empty
+    assert len(limpio) == 3 and limpio['resTotal'].tolist() == [16.5, 30.0, 36.0]
+    assert avisos['sucursal'].tolist() == ['NORTE']
+    assert avisos['motivo'].tolist() == ['resTotal ≠ resRefacc + resBgo + resAcc']
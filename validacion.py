@@ -0,0 +1,184 @@
+# ═══════════════════════════════════════════════════════════════════
+# VALIDACIÓN Y CUARENTENA DEL EXCEL
+# ═══════════════════════════════════════════════════════════════════
+#
+# Antes de publicar un snapshot:
+#   1. Las columnas se reconocen por su encabezado (con alias), no por
+#      su posición. Si faltan encabezados y la hoja tiene el formato de
+#      siempre (22 columnas) se usa la posición, con un aviso.
+#   2. Cada regla se evalúa sobre todas las filas a la vez (máscaras
+#      vectorizadas). Las filas que no se pueden leer o ubicar (texto en
+#      montos, sin cliente o sucursal, sucursal repetida, objetivo
+#      negativo) se apartan en un reporte de cuarentena en lugar de
+#      convertir sus valores en 0.
+#   3. Los totales que no cuadran con sus categorías (más de $1) son
+#      solo un aviso: la fila se publica con los montos del Excel y
+#      queda en el reporte de avisos.
+#
+# Las celdas de montos vacías siguen contando como 0; un texto que no
+# es número no.
+#
+# ═══════════════════════════════════════════════════════════════════
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from snapshots import COLUMNAS_DINERO, DIRECTORIO, escribir_atomico
+
+DIRECTORIO_CUARENTENA = DIRECTORIO / "cuarentena"
+DIRECTORIO_AVISOS = DIRECTORIO / "avisos"
+
+# Formato histórico de la hoja 'Avance semanal', por posición
+COLUMNAS_POSICION = ['COL0', 'COL1', 'COL2', 'CLIENT_NUM', 'clientName', 'sucursal',
+                     'asesor', 'zona', 'ESTATUS', 'objRefacc', 'objBgo', 'objAcc',
+                     'objTotal', 'resRefacc', 'pctRefacc', 'resBgo', 'pctBgo',
+                     'resAcc', 'pctAcc', 'resTotal', 'pctTotal', 'pedidos']
+
+# Encabezados aceptados (ya normalizados con _normalizar) para cada columna
+ALIAS = {
+    'CLIENT_NUM': ['clientnum', 'nocliente', 'numcliente', 'numerocliente', 'clavecliente'],
+    'clientName': ['clientname', 'cliente', 'nombrecliente', 'razonsocial'],
+    'sucursal': ['sucursal', 'tienda'],
+    'asesor': ['asesor', 'vendedor'],
+    'zona': ['zona'],
+    'ESTATUS': ['estatus', 'status'],
+    'objRefacc': ['objrefacc', 'objetivorefacc', 'objrefacciones', 'objetivorefacciones'],
+    'objBgo': ['objbgo', 'objetivobgo'],
+    'objAcc': ['objacc', 'objetivoacc', 'objaccesorios', 'objetivoaccesorios'],
+    'objTotal': ['objtotal', 'objetivototal'],
+    'resRefacc': ['resrefacc', 'resultadorefacc', 'resrefacciones', 'resultadorefacciones'],
+    'resBgo': ['resbgo', 'resultadobgo'],
+    'resAcc': ['resacc', 'resultadoacc', 'resaccesorios', 'resultadoaccesorios'],
+    'resTotal': ['restotal', 'resultadototal'],
+    'pedidos': ['pedidos'],
+}
+_POR_ALIAS = {alias: columna for columna, alias_columna in ALIAS.items() for alias in alias_columna}
+
+COLUMNAS_NUMERICAS = COLUMNAS_DINERO + ['zona']
+
+# Diferencia máxima (centavos) entre un total y la suma de sus categorías
+TOLERANCIA_TOTAL = 100
+
+
+def _normalizar(encabezado):
+    """'Obj. Refacción' -> 'objrefaccion'; '% BGO' -> 'pctbgo'."""
+    texto = unicodedata.normalize('NFKD', str(encabezado)).encode('ascii', 'ignore').decode()
+    texto = texto.lower().replace('%', 'pct')
+    return re.sub(r'[^a-z0-9]', '', texto)
+
+
+def mapear_encabezados(encabezados):
+    """Nombres internos de las columnas de la hoja: (nombres, avisos).
+
+    Lanza ValueError si faltan columnas y la hoja no tiene el formato por
+    posición.
+    """
+    encabezados = list(encabezados)
+    nombres = []
+    vistos = set()
+    for i, encabezado in enumerate(encabezados):
+        columna = _POR_ALIAS.get(_normalizar(encabezado))
+        if columna is None or columna in vistos:
+            columna = f'COL{i}'
+        vistos.add(columna)
+        nombres.append(columna)
+
+    faltantes = [c for c in ALIAS if c not in vistos]
+    if not faltantes:
+        return nombres, []
+    if len(encabezados) == len(COLUMNAS_POSICION):
+        return list(COLUMNAS_POSICION), [
+            f"Encabezados no reconocidos ({', '.join(faltantes)}); se usó la posición de las columnas"
+        ]
+    raise ValueError(f"Faltan columnas en el Excel: {', '.join(faltantes)}")
+
+
+def _no_numerico(crudo, numerico):
+    """Celdas con texto que no se pudo convertir a número (las vacías no cuentan)."""
+    if crudo.dtype.kind in 'biuf':
+        return np.zeros(len(crudo), dtype=bool)
+    # Solo se revisa el texto de las celdas que no se convirtieron
+    sospechosas = numerico.isna().to_numpy() & crudo.notna().to_numpy()
+    if sospechosas.any():
+        sospechosas[sospechosas] = crudo[sospechosas].astype(str).str.strip().to_numpy() != ''
+    return sospechosas
+
+
+def _vacio(serie):
+    return (serie.isna() | (serie.astype(str).str.strip() == '')).to_numpy()
+
+
+def _con_motivo(df, reglas, filas):
+    """Las `filas` de `df` con sus valores originales y una columna 'motivo'."""
+    reporte = df[filas].copy()
+    motivo = pd.Series('', index=reporte.index, dtype=object)
+    for nombre, mascara in reglas.items():
+        marcadas = mascara[filas]
+        if marcadas.any():
+            motivo[marcadas] += nombre + '; '
+    reporte['motivo'] = motivo.str.rstrip('; ')
+    return reporte
+
+
+def validar(df):
+    """Aplica las reglas a todas las filas: (filas válidas, cuarentena, avisos).
+
+    `df` trae los nombres internos y los valores tal como vienen del Excel.
+    Las filas válidas salen con montos y zona numéricos (vacíos = 0). La
+    cuarentena y los avisos (filas que sí se publican, con totales que no
+    cuadran) conservan los valores originales y una columna 'motivo'.
+    """
+    reglas = {}
+    numericos = {}
+    for col in COLUMNAS_NUMERICAS:
+        numericos[col] = pd.to_numeric(df[col], errors='coerce')
+        reglas[f'{col} no es número'] = _no_numerico(df[col], numericos[col])
+
+    reglas['sin cliente'] = _vacio(df['clientName'])
+    reglas['sin sucursal'] = _vacio(df['sucursal'])
+
+    centavos = {col: np.round(numericos[col].fillna(0).to_numpy() * 100).astype('int64')
+                for col in COLUMNAS_DINERO}
+    reglas['objTotal negativo'] = centavos['objTotal'] < 0
+    reglas['sucursal repetida'] = df.duplicated(['clientName', 'sucursal']).to_numpy()
+
+    malas = np.zeros(len(df), dtype=bool)
+    for mascara in reglas.values():
+        malas |= mascara
+
+    # Totales que no cuadran: aviso, la fila se publica. Solo en filas que sí se publican
+    reglas_aviso = {}
+    for total, partes in [('objTotal', ['objRefacc', 'objBgo', 'objAcc']),
+                          ('resTotal', ['resRefacc', 'resBgo', 'resAcc'])]:
+        diferencia = centavos[partes[0]] + centavos[partes[1]] + centavos[partes[2]] - centavos[total]
+        reglas_aviso[f"{total} ≠ {' + '.join(partes)}"] = ~malas & (np.abs(diferencia) > TOLERANCIA_TOTAL)
+
+    con_aviso = np.zeros(len(df), dtype=bool)
+    for mascara in reglas_aviso.values():
+        con_aviso |= mascara
+
+    limpio = df[~malas].copy()
+    for col in COLUMNAS_NUMERICAS:
+        limpio[col] = numericos[col][~malas].fillna(0)
+    return limpio, _con_motivo(df, reglas, malas), _con_motivo(df, reglas_aviso, con_aviso)
+
+
+def resumen(reporte):
+    """{motivo: número de filas} de una cuarentena o de los avisos, contando cada motivo por separado."""
+    if reporte.empty:
+        return {}
+    return reporte['motivo'].str.split('; ').explode().value_counts().to_dict()
+
+
+def guardar_cuarentena(cuarentena, version, directorio=DIRECTORIO_CUARENTENA):
+    """Escribe cuarentena/<versión>.csv con las filas apartadas. Regresa la ruta.
+
+    Con directorio=DIRECTORIO_AVISOS guarda igual el reporte de avisos.
+    """
+    ruta = directorio / f"{version}.csv"
+    columnas = [c for c in cuarentena.columns if not c.startswith('COL')]
+    escribir_atomico(ruta, cuarentena[columnas].to_csv(index=False).encode("utf-8-sig"))
+    return ruta